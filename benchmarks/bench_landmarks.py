@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Микробенчмарк обработки ключевых точек руки.
+
+Сравнивает векторизованный путь из utils.landmarks с прежней реализацией
+на циклах Python (np.append, deepcopy, itertools.chain, map).
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_landmarks
+"""
+import argparse
+import copy
+import itertools
+import timeit
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+
+from utils.landmarks import (landmarks_to_array, calc_landmark_points,
+                             calc_bounding_rect, pre_process_landmark)
+
+
+def make_hand_landmarks(rng):
+    """Синтетический объект в формате hand_landmarks MediaPipe."""
+    coords = rng.uniform(0.2, 0.8, size=(21, 2)).astype(np.float32)
+    return SimpleNamespace(landmark=[SimpleNamespace(x=float(x), y=float(y)) for x, y in coords])
+
+
+# --- прежняя реализация (для сравнения) ---
+
+def legacy_bounding_rect(image_width, image_height, landmarks):
+    landmark_array = np.empty((0, 2), int)
+    for landmark in landmarks.landmark:
+        landmark_x = min(int(landmark.x * image_width), image_width - 1)
+        landmark_y = min(int(landmark.y * image_height), image_height - 1)
+        landmark_point = [np.array((landmark_x, landmark_y))]
+        landmark_array = np.append(landmark_array, landmark_point, axis=0)
+    x, y, w, h = cv2.boundingRect(landmark_array)
+    return [x, y, x + w, y + h]
+
+
+def legacy_landmark_list(image_width, image_height, landmarks):
+    landmark_point = []
+    for landmark in landmarks.landmark:
+        landmark_x = min(int(landmark.x * image_width), image_width - 1)
+        landmark_y = min(int(landmark.y * image_height), image_height - 1)
+        landmark_point.append([landmark_x, landmark_y])
+    return landmark_point
+
+
+def legacy_pre_process(landmark_list):
+    temp_landmark_list = copy.deepcopy(landmark_list)
+    base_x, base_y = 0, 0
+    for index, landmark_point in enumerate(temp_landmark_list):
+        if index == 0:
+            base_x, base_y = landmark_point[0], landmark_point[1]
+        temp_landmark_list[index][0] = temp_landmark_list[index][0] - base_x
+        temp_landmark_list[index][1] = temp_landmark_list[index][1] - base_y
+    temp_landmark_list = list(itertools.chain.from_iterable(temp_landmark_list))
+    max_value = max(list(map(abs, temp_landmark_list)))
+    return list(map(lambda n: n / max_value, temp_landmark_list))
+
+
+def legacy_path(hand_landmarks, width, height):
+    brect = legacy_bounding_rect(width, height, hand_landmarks)
+    landmark_list = legacy_landmark_list(width, height, hand_landmarks)
+    return brect, landmark_list, legacy_pre_process(landmark_list)
+
+
+def vectorized_path(hand_landmarks, width, height):
+    landmark_points = calc_landmark_points(landmarks_to_array(hand_landmarks), width, height)
+    return (calc_bounding_rect(landmark_points), landmark_points,
+            pre_process_landmark(landmark_points))
+
+
+def check_equivalence(samples, width, height):
+    """Проверка, что оба пути дают одинаковый результат."""
+    for hand_landmarks in samples:
+        old_brect, old_points, old_features = legacy_path(hand_landmarks, width, height)
+        new_brect, new_points, new_features = vectorized_path(hand_landmarks, width, height)
+        assert old_brect == new_brect, (old_brect, new_brect)
+        assert old_points == new_points.tolist()
+        np.testing.assert_allclose(np.array(old_features, dtype=np.float32), new_features, rtol=1e-6)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Микробенчмарк обработки ключевых точек')
+    parser.add_argument('--width', type=int, default=1280)
+    parser.add_argument('--height', type=int, default=720)
+    parser.add_argument('--samples', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    samples = [make_hand_landmarks(rng) for _ in range(args.samples)]
+    check_equivalence(samples, args.width, args.height)
+
+    results = {}
+    for name, func in (('legacy', legacy_path), ('vectorized', vectorized_path)):
+        timer = timeit.Timer(lambda: [func(s, args.width, args.height) for s in samples])
+        best = min(timer.repeat(repeat=args.repeat, number=1))
+        results[name] = best / len(samples) * 1e6
+        print(f"{name:>10}: {results[name]:8.1f} мкс на руку")
+
+    print(f"   ускорение: x{results['legacy'] / results['vectorized']:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Офлайн-бенчмарк распознавания: GestureProcessor.process_image и KeyPointClassifier.
+
+Работает без камеры: кадры берутся из видео, папки с изображениями или
+синтетического генератора, признаки для классификатора - из двоичного набора
+данных (model/keypoint_classifier/keypoint_*.npy) или keypoint.csv.
+
+На синтетических кадрах рук нет, поэтому измеряются только захват, детектор
+ладони и отрисовка; стадии ключевых точек и классификатора попадают в замер
+только на записи с руками (--video или --images).
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_pipeline --synthetic 300 --save-baseline benchmarks/baseline.json
+    python -m benchmarks.bench_pipeline --synthetic 300 --baseline benchmarks/baseline.json
+
+При сравнении с базовой линией код возврата 1 означает регрессию.
+"""
+import argparse
+import itertools
+import json
+import os
+import resource
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from benchmarks.frame_sources import (video_frames, image_folder_frames,
+                                      synthetic_frames, load_keypoints)
+
+DEFAULT_KEYPOINT_CSV = 'model/keypoint_classifier/keypoint.csv'
+DEFAULT_KEYPOINT_DATASET = 'model/keypoint_classifier'
+DEFAULT_MODEL = 'model/keypoint_classifier/keypoint_classifier.tflite'
+
+# метрики, для которых больше - лучше (для остальных - меньше)
+HIGHER_IS_BETTER = ('fps', 'samples_per_s')
+# счетчики и настройки, которые не сравниваются с базовой линией
+NOT_COMPARED = ('count', 'frames', 'samples', 'hands_found', 'inference_scale', 'frame_skip')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Офлайн-бенчмарк распознавания жестов')
+
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--video', help='Видеофайл с кадрами')
+    source.add_argument('--images', help='Папка с изображениями')
+    source.add_argument('--synthetic', type=int, default=200,
+                        help='Число синтетических кадров (по умолчанию: 200)')
+
+    parser.add_argument('--width', type=int, default=640, help='Ширина синтетических кадров')
+    parser.add_argument('--height', type=int, default=480, help='Высота синтетических кадров')
+    parser.add_argument('--limit', type=int, default=None, help='Максимум кадров из видео/папки')
+    parser.add_argument('--warmup', type=int, default=10, help='Кадров на прогрев (не учитываются)')
+    parser.add_argument('--memory-frames', type=int, default=50,
+                        help='Кадров в отдельном проходе с tracemalloc для пика памяти Python (0 - не измерять)')
+    parser.add_argument('--render', choices=('full', 'minimal', 'off'), default='full',
+                        help='Политика отрисовки GestureProcessor')
+    parser.add_argument('--roi', action='store_true', help='Режим ROI в GestureProcessor')
+    parser.add_argument('--max-hands', type=int, default=1, help='Максимальное количество рук')
+    parser.add_argument('--target-fps', type=float, default=0,
+                        help='Адаптивный масштаб и пропуск кадров под целевую частоту (0 - выключено)')
+    parser.add_argument('--classifier-backend', choices=('tflite', 'numpy'), default='numpy',
+                        help='Движок классификатора в GestureProcessor')
+
+    parser.add_argument('--keypoints', default=None,
+                        help='keypoint.csv или папка двоичного набора данных для бенчмарка классификатора '
+                             '(по умолчанию: набор данных, если он есть, иначе keypoint.csv)')
+    parser.add_argument('--skip-pipeline', action='store_true', help='Не измерять process_image')
+    parser.add_argument('--skip-classifier', action='store_true', help='Не измерять классификатор')
+
+    parser.add_argument('--save-baseline', help='Сохранить результаты как базовую линию (JSON)')
+    parser.add_argument('--baseline', help='Сравнить с базовой линией (JSON)')
+    parser.add_argument('--tolerance', type=float, default=0.15,
+                        help='Допустимое ухудшение относительно базовой линии (по умолчанию: 0.15)')
+    parser.add_argument('--output', help='Сохранить результаты в JSON')
+    return parser.parse_args()
+
+
+def max_rss_mb():
+    """Пиковый RSS процесса в МБ (ru_maxrss в КБ на Linux)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+def default_keypoints():
+    """Двоичный набор данных, если он есть, иначе keypoint.csv."""
+    from model.keypoint_classifier.dataset import KeypointDataset
+    if KeypointDataset(DEFAULT_KEYPOINT_DATASET).exists():
+        return DEFAULT_KEYPOINT_DATASET
+    return DEFAULT_KEYPOINT_CSV
+
+
+def frame_source(args):
+    if args.video:
+        return f"video:{args.video}", video_frames(args.video, args.limit)
+    if args.images:
+        return f"images:{args.images}", image_folder_frames(args.images, args.limit)
+    return (f"synthetic:{args.synthetic}x{args.width}x{args.height}",
+            synthetic_frames(args.synthetic + args.warmup, args.width, args.height))
+
+
+def bench_pipeline(args):
+    """Пропускная способность и задержки GestureProcessor.process_image."""
+    from gesture_processor import GestureProcessor
+
+    processor = GestureProcessor(classifier_backend=args.classifier_backend,
+                                 max_num_hands=args.max_hands)
+    processor.set_render_policy(args.render)
+    processor.set_roi_mode(args.roi)
+    processor.set_target_fps(args.target_fps)
+
+    source_name, frames = frame_source(args)
+    hands_found = 0
+    processed = 0
+    start = None
+    for index, frame in enumerate(frames):
+        if index == args.warmup:
+            # замеры только после прогрева
+            processor.latency.reset()
+            processor.latency.set_enabled(True)
+            start = time.perf_counter()
+        _, data = processor.process_image(frame)
+        if start is not None:
+            processed += 1
+            # кадры с любой найденной рукой, включая отсеянные порогом уверенности
+            hands_found += bool(data.get("hands"))
+    elapsed = time.perf_counter() - start if start is not None else 0.0
+
+    if processed == 0:
+        raise RuntimeError("Недостаточно кадров: все ушли на прогрев")
+
+    stages = processor.latency.summary()
+    adaptive = None
+    if processor.adaptive is not None:
+        adaptive = {"inference_scale": processor.adaptive.scale, "frame_skip": processor.adaptive.skip}
+    processor.latency.set_enabled(False)
+    peak_python = measure_python_memory(processor, args)
+
+    result = {
+        "source": source_name,
+        "frames": processed,
+        "hands_found": hands_found,
+        "fps": processed / elapsed,
+        "stages": stages,
+        "peak_python_mb": peak_python / (1024.0 * 1024.0),
+        "max_rss_mb": max_rss_mb(),
+    }
+    if adaptive is not None:
+        result["adaptive"] = adaptive
+    return result
+
+
+def measure_python_memory(processor, args):
+    """
+    Пик памяти Python за отдельный проход по кадрам (байты).
+
+    tracemalloc перехватывает каждое выделение памяти и замедляет код, поэтому
+    он включается только после прохода, по которому измерены к/с и задержки.
+    """
+    if args.memory_frames <= 0:
+        return 0
+    _, frames = frame_source(args)
+    tracemalloc.start()
+    try:
+        for frame in itertools.islice(frames, args.memory_frames):
+            processor.process_image(frame)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def bench_classifier(backend, features, repeat=3):
+    """Задержка одиночного вызова и пропускная способность classify_batch."""
+    from model import KeyPointClassifier
+
+    classifier = KeyPointClassifier(model_path=DEFAULT_MODEL, backend=backend)
+    single = features[:min(len(features), 1000)]
+
+    best_single = best_batch = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for sample in single:
+            classifier(sample)
+        best_single = min(best_single, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        classifier.classify_batch(features)
+        best_batch = min(best_batch, time.perf_counter() - start)
+
+    return {
+        "samples": int(len(features)),
+        "single_us": best_single / len(single) * 1e6,
+        "batch_us_per_sample": best_batch / len(features) * 1e6,
+        "samples_per_s": len(features) / best_batch,
+    }
+
+
+def flatten_metrics(results, prefix=""):
+    """Плоский словарь числовых метрик: {"pipeline.stages.draw.p95": 1.2, ...}."""
+    metrics = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            metrics.update(flatten_metrics(value, name + "."))
+        elif isinstance(value, (int, float)) and not name.endswith(NOT_COMPARED):
+            metrics[name] = float(value)
+    return metrics
+
+
+def compare_with_baseline(results, baseline, tolerance):
+    """Список регрессий относительно базовой линии."""
+    current = flatten_metrics(results)
+    regressions = []
+    for name, base_value in flatten_metrics(baseline).items():
+        if name not in current or base_value == 0:
+            continue
+        value = current[name]
+        if name.endswith(HIGHER_IS_BETTER):
+            change = (base_value - value) / base_value
+        else:
+            change = (value - base_value) / base_value
+        if change > tolerance:
+            regressions.append((name, base_value, value, change))
+    return regressions
+
+
+def print_results(results):
+    pipeline = results.get("pipeline")
+    if pipeline:
+        print(f"Конвейер ({pipeline['source']}): {pipeline['frames']} кадров, "
+              f"{pipeline['fps']:.1f} к/с, кадров с руками: {pipeline['hands_found']}")
+        if pipeline['hands_found'] == 0:
+            print("  рук не найдено: стадии ключевых точек и классификатора не измерены "
+                  "(нужна запись с руками: --video или --images)")
+        print(f"  память: пик Python {pipeline['peak_python_mb']:.1f} МБ, "
+              f"max RSS {pipeline['max_rss_mb']:.0f} МБ")
+        if "adaptive" in pipeline:
+            print(f"  адаптивный режим: масштаб {pipeline['adaptive']['inference_scale']}, "
+                  f"пропуск {pipeline['adaptive']['frame_skip']}")
+        for stage, stats in pipeline["stages"].items():
+            print(f"  {stage:<15} p50={stats['p50']:7.2f}  p95={stats['p95']:7.2f}  p99={stats['p99']:7.2f} мс")
+    for backend, stats in results.get("classifier", {}).items():
+        print(f"Классификатор [{backend}]: {stats['single_us']:.1f} мкс/вызов, "
+              f"пакет {stats['batch_us_per_sample']:.2f} мкс/образец ({stats['samples']} образцов)")
+
+
+def main():
+    args = parse_args()
+    results = {}
+
+    if not args.skip_pipeline:
+        results["pipeline"] = bench_pipeline(args)
+
+    if not args.skip_classifier:
+        keypoints = args.keypoints or default_keypoints()
+        if os.path.exists(keypoints):
+            features, _ = load_keypoints(keypoints)
+        else:
+            print(f"{keypoints} не найден, классификатор измеряется на случайных признаках")
+            features = np.random.default_rng(0).uniform(-1, 1, size=(5000, 42)).astype(np.float32)
+        results["classifier"] = {}
+        for backend in ('numpy', 'tflite'):
+            try:
+                results["classifier"][backend] = bench_classifier(backend, features)
+            except ImportError as e:
+                print(f"Классификатор [{backend}] пропущен: {e}")
+
+    print_results(results)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=4, ensure_ascii=False)
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=4, ensure_ascii=False)
+        print(f"Базовая линия сохранена в {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_with_baseline(results, baseline, args.tolerance)
+        if regressions:
+            print(f"Регрессии (допуск {args.tolerance:.0%}):")
+            for name, base_value, value, change in regressions:
+                print(f"  {name}: {base_value:.3f} -> {value:.3f} (+{change:.0%})")
+            return 1
+        print("Регрессий относительно базовой линии нет")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
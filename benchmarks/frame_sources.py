@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Источники кадров для офлайн-бенчмарков (без камеры)."""
+import os
+
+import cv2
+import numpy as np
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp')
+
+
+def video_frames(path, limit=None):
+    """Кадры BGR из видеофайла."""
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise IOError(f"Не удалось открыть видео: {path}")
+    count = 0
+    try:
+        while limit is None or count < limit:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            count += 1
+            yield frame
+    finally:
+        cap.release()
+
+
+def image_folder_frames(path, limit=None):
+    """Кадры BGR из папки с изображениями (в порядке имен файлов)."""
+    names = sorted(name for name in os.listdir(path) if name.lower().endswith(IMAGE_EXTENSIONS))
+    if not names:
+        raise IOError(f"В папке нет изображений: {path}")
+    for name in names[:limit]:
+        frame = cv2.imread(os.path.join(path, name))
+        if frame is not None:
+            yield frame
+
+
+def synthetic_frames(count, width=640, height=480, seed=0):
+    """
+    Синтетические кадры BGR: шум и движущееся "пятно" телесного цвета.
+
+    Руки на таких кадрах MediaPipe не находит, поэтому они измеряют путь
+    без обнаружения (детектор ладони на каждом кадре) - худший случай по CPU.
+    """
+    rng = np.random.default_rng(seed)
+    background = rng.integers(0, 60, size=(height, width, 3), dtype=np.uint8)
+    frame = np.empty_like(background)
+    radius = max(10, min(width, height) // 8)
+    for index in range(count):
+        np.copyto(frame, background)
+        phase = index / max(count, 1) * 2 * np.pi
+        center = (int(width / 2 + width / 4 * np.cos(phase)),
+                  int(height / 2 + height / 4 * np.sin(phase)))
+        cv2.circle(frame, center, radius, (120, 160, 210), -1)
+        yield frame
+
+
+def load_keypoint_csv(path):
+    """Признаки (N, 42) float32 и метки (N,) int32 из keypoint.csv."""
+    data = np.loadtxt(path, delimiter=',', dtype=np.float32, ndmin=2)
+    return data[:, 1:], data[:, 0].astype(np.int32)
+
+
+def load_keypoints(path):
+    """Признаки и метки из keypoint.csv или папки двоичного набора данных (mmap, без разбора)."""
+    if path.endswith('.csv'):
+        return load_keypoint_csv(path)
+    from model.keypoint_classifier.dataset import KeypointDataset
+    return KeypointDataset(path).load()
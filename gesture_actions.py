@@ -2,6 +2,11 @@ import json
 import os
 import logging
 import time
+import functools
+import threading
+from collections import namedtuple
+
+from utils.rate_limit import TokenBucket
 
 # Настройка логирования
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -66,6 +71,195 @@ if not PYAUTOGUI_AVAILABLE:
     
     pyautogui = PyAutoGUIStub()
 
+# описания действий для интерфейса и логов (порядок - как в списке выбора действия)
+ACTION_DESCRIPTIONS = {
+    # базовые действия
+    "none": "Нет действия",
+
+    # действия мышки
+    "click": "Мышь: левый клик",
+    "right_click": "Мышь: правый клик",
+    "double_click": "Мышь: двойной клик",
+    "scroll_up": "Мышь: прокрутка вверх",
+    "scroll_down": "Мышь: прокрутка вниз",
+
+    # буфер
+    "copy": "Комбинация клавиш: копировать (Ctrl+C)",
+    "paste": "Комбинация клавиш: вставить (Ctrl+V)",
+    "cut": "Комбинация клавиш: вырезать (Ctrl+X)",
+
+    # общие команды редактирования
+    "select_all": "Комбинация клавиш: выделить всё (Ctrl+A)",
+    "undo": "Комбинация клавиш: отменить (Ctrl+Z)",
+    "redo": "Комбинация клавиш: повторить (Ctrl+Y)",
+    "save": "Комбинация клавиш: сохранить (Ctrl+S)",
+
+    # запуска
+    "run_code": "Комбинация клавиш: запустить код (F5)",
+
+    # навигация
+    "go_to_definition": "Комбинация клавиш: перейти к определению (F12)",
+    "find": "Комбинация клавиш: найти (Ctrl+F)",
+    "find_in_files": "Комбинация клавиш: найти в файлах (Ctrl+Shift+F)",
+    "quick_open": "Комбинация клавиш: быстрое открытие файла (Ctrl+P)",
+    "command_palette": "Комбинация клавиш: палитра команд (Ctrl+Shift+P)",
+
+    # файлы
+    "new_file": "Комбинация клавиш: новый файл (Ctrl+N)",
+    "open_file": "Комбинация клавиш: открыть файл (Ctrl+O)",
+    "close_file": "Комбинация клавиш: закрыть файл (Ctrl+W)",
+    "close_window": "Комбинация клавиш: закрыть окно (Alt+F4)",
+    "switch_tab_next": "Комбинация клавиш: следующая вкладка (Ctrl+Tab)",
+    "switch_tab_prev": "Комбинация клавиш: предыдущая вкладка (Ctrl+Shift+Tab)",
+
+    # доп фишки
+    "screenshot": "Системное: сделать скриншот",
+    "custom_hotkey": "Пользовательская комбинация клавиш",
+}
+
+# последовательности клавиш для стандартных комбинаций
+HOTKEY_ACTIONS = {
+    "copy": ("ctrl", "c"),
+    "paste": ("ctrl", "v"),
+    "cut": ("ctrl", "x"),
+    "select_all": ("ctrl", "a"),
+    "undo": ("ctrl", "z"),
+    "redo": ("ctrl", "y"),
+    "save": ("ctrl", "s"),
+    "run_code": ("f5",),
+    "go_to_definition": ("f12",),
+    "find": ("ctrl", "f"),
+    "find_in_files": ("ctrl", "shift", "f"),
+    "quick_open": ("ctrl", "p"),
+    "command_palette": ("ctrl", "shift", "p"),
+    "new_file": ("ctrl", "n"),
+    "open_file": ("ctrl", "o"),
+    "close_file": ("ctrl", "w"),
+    "close_window": ("alt", "f4"),
+    "switch_tab_next": ("ctrl", "tab"),
+    "switch_tab_prev": ("ctrl", "shift", "tab"),
+}
+
+# классы действий для ограничения частоты (остальные действия - класс "hotkey")
+ACTION_CLASSES = {
+    "none": "none",
+    "click": "mouse",
+    "right_click": "mouse",
+    "double_click": "mouse",
+    "scroll_up": "scroll",
+    "scroll_down": "scroll",
+    "close_file": "destructive",
+    "close_window": "destructive",
+    "screenshot": "system",
+}
+DEFAULT_ACTION_CLASS = "hotkey"
+
+# ограничения частоты по классам действий: rate - действий в секунду, burst - размер пачки,
+# repeat - повторять действие, пока жест удерживается. Переопределяются ключом
+# RATE_LIMITS_KEY в файле конфигурации, для отдельного жеста - его полем "rate_limit".
+# Действия без ограничения используют общую задержку action_cooldown (отдельно для каждого жеста).
+DEFAULT_RATE_LIMITS = {
+    "scroll": {"rate": 8.0, "burst": 2, "repeat": True},
+    "destructive": {"rate": 0.2, "burst": 1},
+}
+RATE_LIMITS_KEY = "_rate_limits"
+
+
+def _valid_rate_limit(rate_limit, owner):
+    """
+    Проверка записи ограничения частоты из конфигурации.
+
+    Некорректная запись (нет rate, rate <= 0, burst < 1) не должна ронять
+    загрузку: она записывается в журнал, и вместо нее используется ограничение
+    по умолчанию. Returns: bool - можно ли построить по записи TokenBucket.
+    """
+    try:
+        TokenBucket(rate_limit["rate"], rate_limit.get("burst", 1))
+    except (KeyError, TypeError, ValueError, AttributeError) as e:
+        logger.error(f"Некорректное ограничение частоты {owner}: {rate_limit!r} ({e}), "
+                     f"используется ограничение по умолчанию")
+        return False
+    return True
+
+
+# подготовленное действие жеста
+CompiledAction = namedtuple("CompiledAction", ["action", "description", "action_class", "rate_limit", "repeat"])
+
+# реестр типов действий: тип -> фабрика(params), возвращающая функцию без аргументов
+_ACTION_FACTORIES = {}
+
+
+def register_action(action_type, description=None, action_class=None):
+    """
+    Декоратор регистрации типа действия (в том числе из плагинов).
+
+    Фабрика вызывается один раз при загрузке конфигурации с параметрами действия
+    и возвращает функцию без аргументов, которая выполняет действие,
+    или None, если параметры некорректны.
+
+    action_class задает класс действия для ограничения частоты (см. DEFAULT_RATE_LIMITS).
+
+    Пример:
+        @register_action("volume_up", "Системное: громкость выше", action_class="scroll")
+        def volume_up(params):
+            return functools.partial(pyautogui.press, "volumeup")
+    """
+    def decorator(factory):
+        _ACTION_FACTORIES[action_type] = factory
+        if description is not None:
+            ACTION_DESCRIPTIONS[action_type] = description
+        if action_class is not None:
+            ACTION_CLASSES[action_type] = action_class
+        return factory
+    return decorator
+
+
+def describe_action(action_type, params=None):
+    """Понятное описание действия для интерфейса и логов"""
+    if action_type == "custom_hotkey":
+        if params and params.get("hotkey"):
+            return f"Комбинация клавиш: {'+'.join(params['hotkey'])}"
+        return "Комбинация клавиш"
+    return ACTION_DESCRIPTIONS.get(action_type, f"Неизвестное действие: {action_type}")
+
+
+def _key_sequence(keys):
+    """Функция нажатия клавиши или комбинации клавиш"""
+    if len(keys) == 1:
+        return functools.partial(pyautogui.press, keys[0])
+    return functools.partial(pyautogui.hotkey, *keys)
+
+
+def _noop():
+    pass
+
+
+def _take_screenshot():
+    screenshot = pyautogui.screenshot()
+    screenshot_path = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                   f"screenshot_{time.strftime('%Y%m%d_%H%M%S')}.png")
+    screenshot.save(screenshot_path)
+    logger.info(f"Скриншот сохранен в: {screenshot_path}")
+
+
+register_action("none")(lambda params: _noop)
+register_action("click")(lambda params: pyautogui.click)
+register_action("right_click")(lambda params: pyautogui.rightClick)
+register_action("double_click")(lambda params: pyautogui.doubleClick)
+register_action("scroll_up")(lambda params: functools.partial(pyautogui.scroll, 100))
+register_action("scroll_down")(lambda params: functools.partial(pyautogui.scroll, -100))
+register_action("screenshot")(lambda params: _take_screenshot)
+
+for _action_type, _keys in HOTKEY_ACTIONS.items():
+    register_action(_action_type)(lambda params, keys=_keys: _key_sequence(keys))
+
+
+@register_action("custom_hotkey")
+def _custom_hotkey(params):
+    keys = tuple(params.get("hotkey") or ())
+    return _key_sequence(keys) if keys else None
+
+
 class GestureActions:
     def __init__(self, config_file='gesture_actions_config.json'):
         """
@@ -76,11 +270,18 @@ class GestureActions:
         """
         self.config_file = config_file
         self.actions_mapping = {} # словарь для хранения действий для жестов
-        self.load_config() # загрузка конфигурации из файла
+        self.compiled_actions = {} # жест -> CompiledAction
         
-        # добавление глобального контроля частоты выполнения действий
-        self.action_cooldown = 1.0  # задержка между действиями в секундах (по умолчанию 1 секунда)
-        self.last_action_time = 0  # время последнего выполнения любого действия
+        # ограничения частоты: по классам действий (из конфигурации) и ведра токенов
+        self.custom_rate_limits = {}
+        self.rate_limits = dict(DEFAULT_RATE_LIMITS)
+        self._gesture_buckets = {}
+        self._class_buckets = {}
+        
+        # задержка между действиями одного жеста, если для него нет своего ограничения
+        self.action_cooldown = 1.0  # в секундах (по умолчанию 1 секунда)
+        
+        self.load_config() # загрузка конфигурации из файла
         
     def load_config(self):
         """Загрузка конфигурации из файла"""
@@ -88,6 +289,7 @@ class GestureActions:
             if os.path.exists(self.config_file):
                 with open(self.config_file, 'r', encoding='utf-8') as f:
                     self.actions_mapping = json.load(f)
+                self.custom_rate_limits = self.actions_mapping.pop(RATE_LIMITS_KEY, {})
                 logger.info(f"Конфигурация загружена из {self.config_file}")
             else:
                 self.actions_mapping = {
@@ -104,15 +306,76 @@ class GestureActions:
         except Exception as e:
             logger.error(f"Ошибка при загрузке конфигурации: {e}")
             self.actions_mapping = {}
+            self.custom_rate_limits = {}
+        self.rate_limits = self._merge_rate_limits(self.custom_rate_limits)
+        self.compile_actions()
+
+    @staticmethod
+    def _merge_rate_limits(custom_rate_limits):
+        """Ограничения классов: значения по умолчанию, переопределенные корректными записями конфигурации"""
+        rate_limits = dict(DEFAULT_RATE_LIMITS)
+        if not isinstance(custom_rate_limits, dict):
+            logger.error(f"Некорректный раздел {RATE_LIMITS_KEY} в конфигурации, используются значения по умолчанию")
+            return rate_limits
+        for action_class, rate_limit in custom_rate_limits.items():
+            if _valid_rate_limit(rate_limit, f"класса '{action_class}'"):
+                rate_limits[action_class] = rate_limit
+        return rate_limits
             
     def save_config(self):
         """Сохранение конфигурации в файл"""
         try:
+            config = dict(self.actions_mapping)
+            if self.custom_rate_limits:
+                config[RATE_LIMITS_KEY] = self.custom_rate_limits
             with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self.actions_mapping, f, indent=4, ensure_ascii=False)
+                json.dump(config, f, indent=4, ensure_ascii=False)
             logger.info(f"Конфигурация сохранена в {self.config_file}")
         except Exception as e:
             logger.error(f"Ошибка при сохранении конфигурации: {e}")
+
+    def compile_action(self, action_config):
+        """
+        Разрешение записи конфигурации в готовую функцию, описание и ограничение частоты.
+
+        Returns:
+            CompiledAction: action - функция без аргументов или None для неизвестного действия
+        """
+        action_type = action_config.get("action")
+        params = action_config.get("params") or {}
+        description = describe_action(action_type, params)
+        action_class = ACTION_CLASSES.get(action_type, DEFAULT_ACTION_CLASS)
+
+        # ограничение жеста: свое, класса действия или общая задержка
+        rate_limit = action_config.get("rate_limit")
+        if rate_limit is not None and not _valid_rate_limit(rate_limit, f"действия '{description}'"):
+            rate_limit = None
+        rate_limit = (rate_limit or self.rate_limits.get(action_class)
+                      or {"rate": 1.0 / self.action_cooldown, "burst": 1})
+
+        action = None
+        factory = _ACTION_FACTORIES.get(action_type)
+        if factory is not None:
+            try:
+                action = factory(params)
+            except Exception as e:
+                logger.error(f"Ошибка при подготовке действия '{description}': {e}")
+        return CompiledAction(action, description, action_class, rate_limit,
+                              bool(rate_limit.get("repeat", False)))
+
+    def compile_actions(self):
+        """Подготовка функций и ограничителей частоты всех действий из конфигурации"""
+        compiled_actions = {gesture_name: self.compile_action(action_config)
+                            for gesture_name, action_config in self.actions_mapping.items()}
+        self._class_buckets = {action_class: self._make_bucket(rate_limit)
+                               for action_class, rate_limit in self.rate_limits.items()}
+        self._gesture_buckets = {gesture_name: self._make_bucket(compiled.rate_limit)
+                                 for gesture_name, compiled in compiled_actions.items()}
+        self.compiled_actions = compiled_actions
+
+    @staticmethod
+    def _make_bucket(rate_limit):
+        return TokenBucket(rate_limit["rate"], rate_limit.get("burst", 1))
     
     def add_gesture_action(self, gesture_name, action_type, params={}):
         """
@@ -123,57 +386,32 @@ class GestureActions:
             action_type (str): Тип действия (none, move_mouse, click, hotkey, text, etc.)
             params (dict): Параметры действия
         """
-        self.actions_mapping[gesture_name] = {
-            "action": action_type,
-            "params": params
-        }
+        # собственное ограничение частоты жеста сохраняется при смене действия
+        previous = self.actions_mapping.get(gesture_name, {})
+        action_config = {"action": action_type, "params": params}
+        if "rate_limit" in previous:
+            action_config["rate_limit"] = previous["rate_limit"]
+        self.actions_mapping[gesture_name] = action_config
+        compiled = self.compile_action(action_config)
+        self._gesture_buckets[gesture_name] = self._make_bucket(compiled.rate_limit)
+        self.compiled_actions[gesture_name] = compiled
         self.save_config()
         
     def get_available_actions(self):
         """Получение списка доступных действий"""
-        return [
-            # базовые действия
-            {"id": "none", "name": "Нет действия"},
-            
-            # Действия мышки
-            {"id": "click", "name": "Мышь: левый клик"},
-            {"id": "right_click", "name": "Мышь: правый клик"},
-            {"id": "double_click", "name": "Мышь: двойной клик"},
-            {"id": "scroll_up", "name": "Мышь: прокрутка вверх"},
-            {"id": "scroll_down", "name": "Мышь: прокрутка вниз"},
-            
-            # Буфер 
-            {"id": "copy", "name": "Комбинация клавиш: копировать (Ctrl+C)"},
-            {"id": "paste", "name": "Комбинация клавиш: вставить (Ctrl+V)"},
-            {"id": "cut", "name": "Комбинация клавиш: вырезать (Ctrl+X)"},
-            
-            # общие команды редактирования
-            {"id": "select_all", "name": "Комбинация клавиш: выделить всё (Ctrl+A)"},
-            {"id": "undo", "name": "Комбинация клавиш: отменить (Ctrl+Z)"},
-            {"id": "redo", "name": "Комбинация клавиш: повторить (Ctrl+Y)"},
-            {"id": "save", "name": "Комбинация клавиш: сохранить (Ctrl+S)"},
-            
-            # запуска
-            {"id": "run_code", "name": "Комбинация клавиш: запустить код (F5)"},
-            
-            # навигация
-            {"id": "go_to_definition", "name": "Комбинация клавиш: перейти к определению (F12)"},
-            {"id": "find", "name": "Комбинация клавиш: найти (Ctrl+F)"},
-            {"id": "find_in_files", "name": "Комбинация клавиш: найти в файлах (Ctrl+Shift+F)"},
-            {"id": "quick_open", "name": "Комбинация клавиш: быстрое открытие файла (Ctrl+P)"},
-            {"id": "command_palette", "name": "Комбинация клавиш: палитра команд (Ctrl+Shift+P)"},
-            
-            # файлы
-            {"id": "new_file", "name": "Комбинация клавиш: новый файл (Ctrl+N)"},
-            {"id": "open_file", "name": "Комбинация клавиш: открыть файл (Ctrl+O)"},
-            {"id": "close_file", "name": "Комбинация клавиш: закрыть файл (Ctrl+W)"},
-            {"id": "close_window", "name": "Комбинация клавиш: закрыть окно (Alt+F4)"},
-            {"id": "switch_tab_next", "name": "Комбинация клавиш: следующая вкладка (Ctrl+Tab)"},
-            {"id": "switch_tab_prev", "name": "Комбинация клавиш: предыдущая вкладка (Ctrl+Shift+Tab)"},
-            
-            # доп фишки
-            {"id": "screenshot", "name": "Системное: сделать скриншот"}
-        ]
+        return [{"id": action_type, "name": description}
+                for action_type, description in ACTION_DESCRIPTIONS.items()
+                if action_type != "custom_hotkey"]
+
+    def get_action_description(self, gesture_name):
+        """Описание действия, назначенного жесту, или None, если жест не настроен"""
+        compiled = self.compiled_actions.get(gesture_name)
+        return compiled.description if compiled is not None else None
+
+    def is_repeating(self, gesture_name):
+        """Повторяется ли действие жеста, пока жест удерживается (например, прокрутка)"""
+        compiled = self.compiled_actions.get(gesture_name)
+        return compiled is not None and compiled.repeat
         
     def get_gesture_actions_info(self):
         """
@@ -183,46 +421,15 @@ class GestureActions:
             list: Список словарей с информацией о жестах и действиях
         """
         info_list = []
-        action_descriptions = {
-            "none": "Нет действия",
-            "click": "Мышь: левый клик",
-            "right_click": "Мышь: правый клик",
-            "double_click": "Мышь: двойной клик", 
-            "scroll_up": "Мышь: прокрутка вверх",
-            "scroll_down": "Мышь: прокрутка вниз",
-            "save": "Комбинация клавиш: сохранить файл (Ctrl+S)",
-            "copy": "Комбинация клавиш: копировать (Ctrl+C)",
-            "paste": "Комбинация клавиш: вставить (Ctrl+V)",
-            "cut": "Комбинация клавиш: вырезать (Ctrl+X)",
-            "select_all": "Комбинация клавиш: выделить всё (Ctrl+A)",
-            "undo": "Комбинация клавиш: отменить (Ctrl+Z)",
-            "redo": "Комбинация клавиш: повторить (Ctrl+Y)",
-            "run_code": "Комбинация клавиш: запустить код (F5)",
-            "go_to_definition": "Комбинация клавиш: перейти к определению (F12)",
-            "find": "Комбинация клавиш: найти (Ctrl+F)",
-            "find_in_files": "Комбинация клавиш: найти в файлах (Ctrl+Shift+F)",
-            "quick_open": "Комбинация клавиш: быстрое открытие файла (Ctrl+P)",
-            "command_palette": "Комбинация клавиш: палитра команд (Ctrl+Shift+P)",
-            "new_file": "Комбинация клавиш: новый файл (Ctrl+N)",
-            "open_file": "Комбинация клавиш: открыть файл (Ctrl+O)",
-            "close_file": "Комбинация клавиш: закрыть файл (Ctrl+W)",
-            "close_window": "Комбинация клавиш: закрыть окно (Alt+F4)",
-            "switch_tab_next": "Комбинация клавиш: следующая вкладка (Ctrl+Tab)",
-            "switch_tab_prev": "Комбинация клавиш: предыдущая вкладка (Ctrl+Shift+Tab)",
-            "screenshot": "Системное: сделать скриншот",
-            "custom_hotkey": "Пользовательская комбинация клавиш"
-        }
-        
         for gesture_name, action_config in self.actions_mapping.items():
             action_type = action_config["action"]
             params = action_config["params"]
             
-            description = action_descriptions.get(action_type, "Неизвестное действие")
+            description = ACTION_DESCRIPTIONS.get(action_type, "Неизвестное действие")
             details = ""
             
             if action_type == "custom_hotkey" and "hotkey" in params:
-                hotkey_str = "+".join(params["hotkey"])
-                details = f"Комбинация клавиш: {hotkey_str}"
+                details = describe_action(action_type, params)
             
             info_list.append({
                 "gesture": gesture_name,
@@ -236,8 +443,8 @@ class GestureActions:
     def set_action_cooldown(self, seconds):
         """Установка задержки между выполнением действий"""
         self.action_cooldown = max(0.1, float(seconds))
-        logger.info(f"Установлена глобальная задержка между действиями: {self.action_cooldown} сек")
-        self.last_action_time = 0
+        logger.info(f"Установлена задержка между действиями жеста: {self.action_cooldown} сек")
+        self.compile_actions()
         
     def execute_action(self, gesture_name, x_pos=None, y_pos=None):
         """
@@ -255,191 +462,123 @@ class GestureActions:
             logger.warning(f"Попытка выполнения действия для жеста '{gesture_name}', но pyautogui недоступен")
             return False
             
-        if gesture_name not in self.actions_mapping:
+        compiled = self.compiled_actions.get(gesture_name)
+        if compiled is None:
             logger.warning(f"Жест '{gesture_name}' не найден в конфигурации")
             return False
 
-        # проверка задержки
-        current_time = time.time()
-        if current_time - self.last_action_time < self.action_cooldown:
-            logger.info(f"Жест {gesture_name} пропущен: не прошло {self.action_cooldown} сек с последнего действия")
+        action, action_description = compiled.action, compiled.description
+        if action is None:
+            logger.warning(f"Неизвестный тип действия: {action_description}")
             return False
             
-        # обновление времени последнего действия
-        self.last_action_time = current_time
-        
-        action_config = self.actions_mapping[gesture_name]
-        action_type = action_config["action"]
-        params = action_config["params"]
-
-        # получение описания действия
-        action_descriptions = {
-            "none": "Нет действия",
-            "click": "Мышь: левый клик",
-            "right_click": "Мышь: правый клик",
-            "double_click": "Мышь: двойной клик", 
-            "scroll_up": "Мышь: прокрутка вверх",
-            "scroll_down": "Мышь: прокрутка вниз",
-            "save": "Комбинация клавиш: сохранить файл (Ctrl+S)",
-            "copy": "Комбинация клавиш: копировать (Ctrl+C)",
-            "paste": "Комбинация клавиш: вставить (Ctrl+V)",
-            "cut": "Комбинация клавиш: вырезать (Ctrl+X)",
-            "select_all": "Комбинация клавиш: выделить всё (Ctrl+A)",
-            "undo": "Комбинация клавиш: отменить (Ctrl+Z)",
-            "redo": "Комбинация клавиш: повторить (Ctrl+Y)",
-            "run_code": "Комбинация клавиш: запустить код (F5)",
-            "go_to_definition": "Комбинация клавиш: перейти к определению (F12)",
-            "find": "Комбинация клавиш: найти (Ctrl+F)",
-            "find_in_files": "Комбинация клавиш: найти в файлах (Ctrl+Shift+F)",
-            "quick_open": "Комбинация клавиш: быстрое открытие файла (Ctrl+P)",
-            "command_palette": "Комбинация клавиш: палитра команд (Ctrl+Shift+P)",
-            "new_file": "Комбинация клавиш: новый файл (Ctrl+N)",
-            "open_file": "Комбинация клавиш: открыть файл (Ctrl+O)",
-            "close_file": "Комбинация клавиш: закрыть файл (Ctrl+W)",
-            "close_window": "Комбинация клавиш: закрыть окно (Alt+F4)",
-            "switch_tab_next": "Комбинация клавиш: следующая вкладка (Ctrl+Tab)",
-            "switch_tab_prev": "Комбинация клавиш: предыдущая вкладка (Ctrl+Shift+Tab)",
-            "screenshot": "Системное: сделать скриншот",
-            "custom_hotkey": "Пользовательская комбинация клавиш"
-        }
-        action_description = action_descriptions.get(action_type, f"Неизвестное действие: {action_type}")
-        
+        # ограничение частоты: ведро жеста и общее ведро класса действия
+        now = time.monotonic()
+        gesture_bucket = self._gesture_buckets[gesture_name]
+        class_bucket = self._class_buckets.get(compiled.action_class)
+        if not gesture_bucket.available(now) or (class_bucket is not None and not class_bucket.available(now)):
+            logger.debug(f"Жест {gesture_name} пропущен: превышена частота действий")
+            return False
+        gesture_bucket.consume(now)
+        if class_bucket is not None:
+            class_bucket.consume(now)
+
         try:
-            # получение размеров экрана для справки
-            screen_width, screen_height = pyautogui.size()
-            
-            if action_type == "none":
-                logger.info(f"Выполнено действие: {action_description}")
-                return True
-                
-            # базовые действия мыши
-            elif action_type == "click":
-                pyautogui.click()
-                logger.info(f"Выполнено действие: {action_description}")
-                    
-            elif action_type == "right_click":
-                pyautogui.rightClick()
-                logger.info(f"Выполнено действие: {action_description}")
-                    
-            elif action_type == "double_click":
-                pyautogui.doubleClick()
-                logger.info(f"Выполнено действие: {action_description}")
-                    
-            elif action_type == "scroll_up":
-                pyautogui.scroll(100)
-                logger.info(f"Выполнено действие: {action_description}")
-                
-            elif action_type == "scroll_down":
-                pyautogui.scroll(-100)
-                logger.info(f"Выполнено действие: {action_description}")
-                
-            # буфер обмена
-            elif action_type == "copy":
-                pyautogui.hotkey('ctrl', 'c')
-                logger.info(f"Выполнено действие: {action_description}")
-                
-            elif action_type == "paste":
-                pyautogui.hotkey('ctrl', 'v')
-                logger.info(f"Выполнено действие: {action_description}")
-                
-            elif action_type == "cut":
-                pyautogui.hotkey('ctrl', 'x')
-                logger.info(f"Выполнено действие: {action_description}")
-                
-            # общие команды редактирования
-            elif action_type == "select_all":
-                pyautogui.hotkey('ctrl', 'a')
-                logger.info(f"Выполнено действие: {action_description}")
-                
-            elif action_type == "undo":
-                pyautogui.hotkey('ctrl', 'z')
-                logger.info(f"Выполнено действие: {action_description}")
-                
-            elif action_type == "redo":
-                pyautogui.hotkey('ctrl', 'y')
-                logger.info(f"Выполнено действие: {action_description}")
-                
-            elif action_type == "save":
-                pyautogui.hotkey('ctrl', 's')
-                logger.info(f"Выполнено действие: {action_description}")
-                
-            # запуска
-            elif action_type == "run_code":
-                pyautogui.press('f5')
-                logger.info(f"Выполнено действие: {action_description}")
-                
-            # навигация
-            elif action_type == "go_to_definition":
-                pyautogui.press('f12')
-                logger.info(f"Выполнено действие: {action_description}")
-                
-            elif action_type == "find":
-                pyautogui.hotkey('ctrl', 'f')
-                logger.info(f"Выполнено действие: {action_description}")
-                
-            elif action_type == "find_in_files":
-                pyautogui.hotkey('ctrl', 'shift', 'f')
-                logger.info(f"Выполнено действие: {action_description}")
-                
-            elif action_type == "quick_open":
-                pyautogui.hotkey('ctrl', 'p')
-                logger.info(f"Выполнено действие: {action_description}")
-                
-            elif action_type == "command_palette":
-                pyautogui.hotkey('ctrl', 'shift', 'p')
-                logger.info(f"Выполнено действие: {action_description}")
-                
-            # файлы
-            elif action_type == "new_file":
-                pyautogui.hotkey('ctrl', 'n')
-                logger.info(f"Выполнено действие: {action_description}")
-                
-            elif action_type == "open_file":
-                pyautogui.hotkey('ctrl', 'o')
-                logger.info(f"Выполнено действие: {action_description}")
-                
-            elif action_type == "close_file":
-                pyautogui.hotkey('ctrl', 'w')
-                logger.info(f"Выполнено действие: {action_description}")
-                
-            elif action_type == "close_window":
-                pyautogui.hotkey('alt', 'f4')
-                logger.info(f"Выполнено действие: {action_description}")
-                
-            elif action_type == "switch_tab_next":
-                pyautogui.hotkey('ctrl', 'tab')
-                logger.info(f"Выполнено действие: {action_description}")
-                
-            elif action_type == "switch_tab_prev":
-                pyautogui.hotkey('ctrl', 'shift', 'tab')
-                logger.info(f"Выполнено действие: {action_description}")
-                
-            # доп фишки
-            elif action_type == "screenshot":
-                screenshot = pyautogui.screenshot()
-                screenshot_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 
-                                         f"screenshot_{time.strftime('%Y%m%d_%H%M%S')}.png")
-                screenshot.save(screenshot_path)
-                logger.info(f"Выполнено действие: {action_description}. Сохранено в: {screenshot_path}")
-                
-            elif action_type == "custom_hotkey" and "hotkey" in params:
-                pyautogui.hotkey(*params["hotkey"])
-                hotkey_str = "+".join(params["hotkey"])
-                logger.info(f"Выполнено действие: Комбинация клавиш: {hotkey_str}")
-                
-            else:
-                logger.warning(f"Неизвестный тип действия: {action_description}")
-                return False
-                
+            action()
+            logger.info(f"Выполнено действие: {action_description}")
             return True
-            
         except Exception as e:
             logger.error(f"Ошибка при выполнении действия '{action_description}' для жеста '{gesture_name}': {e}")
             return False
 
 
+class ActionExecutor:
+    """
+    Выполнение действий в фоновом потоке, чтобы медленные вызовы pyautogui
+    (скриншот, двойной клик, комбинации клавиш) не задерживали распознавание.
+
+    Очередь ограничена maxsize заявками: при переполнении отбрасывается самая старая.
+    Заявка для жеста, который уже ждет в очереди, объединяется с ней (остается
+    одна заявка с последними координатами). После выполнения вызывается
+    on_complete(gesture_name, success, elapsed_ms) - из фонового потока,
+    поэтому в GUI его нужно передавать через сигнал Qt.
+    """
+
+    def __init__(self, actions, maxsize=4, on_complete=None, latency=None):
+        self.actions = actions
+        self.maxsize = maxsize
+        self.on_complete = on_complete
+        self.latency = latency
+
+        self.coalesced = 0  # заявок, объединенных с уже ожидающими
+        self.dropped = 0  # заявок, вытесненных при переполнении очереди
+
+        self._pending = {}  # жест -> (x_pos, y_pos), в порядке поступления
+        self._condition = threading.Condition()
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="ActionExecutor", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=1.0):
+        """Остановка потока; невыполненные заявки отбрасываются"""
+        with self._condition:
+            self._running = False
+            self._pending.clear()
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def submit(self, gesture_name, x_pos=None, y_pos=None):
+        """
+        Постановка действия жеста в очередь (не блокирует).
+
+        Returns:
+            bool: True - добавлена новая заявка, False - объединена с ожидающей
+        """
+        with self._condition:
+            if gesture_name in self._pending:
+                self._pending[gesture_name] = (x_pos, y_pos)
+                self.coalesced += 1
+                return False
+            if len(self._pending) >= self.maxsize:
+                del self._pending[next(iter(self._pending))]
+                self.dropped += 1
+            self._pending[gesture_name] = (x_pos, y_pos)
+            self._condition.notify()
+        return True
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._running and not self._pending:
+                    self._condition.wait()
+                if not self._running:
+                    return
+                gesture_name = next(iter(self._pending))
+                x_pos, y_pos = self._pending.pop(gesture_name)
+
+            start = time.perf_counter()
+            success = self.actions.execute_action(gesture_name, x_pos, y_pos)
+            elapsed_ms = (time.perf_counter() - start) * 1000.0
+
+            if success and self.latency is not None:
+                self.latency.record("execute_action", elapsed_ms)
+            if self.on_complete is not None:
+                try:
+                    self.on_complete(gesture_name, success, elapsed_ms)
+                except Exception as e:
+                    logger.error(f"Ошибка в обработчике завершения действия для жеста '{gesture_name}': {e}")
+
+
 if __name__ == "__main__":
     # тестирование класса
     actions = GestureActions()
     print("Доступные действия:", actions.get_available_actions())
-    print("Текущая конфигурация:", actions.actions_mapping) 
\ No newline at end of file
+    print("Текущая конфигурация:", actions.actions_mapping) 
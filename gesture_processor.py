@@ -1,41 +1,90 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
-import copy
+import time
+import logging
 import cv2
 import numpy as np
-import mediapipe as mp
-from collections import Counter
-import itertools
-import csv 
 # Импорт классификаторов
-from model import KeyPointClassifier
-from utils import CvFpsCalc
+from model import KeyPointClassifier, GestureRegistry, ModelManager, BACKEND_TFLITE, UNKNOWN_CLASS
+from utils import AdaptiveController, CvFpsCalc, GestureFilter, LatencyTracker
+from utils.recording import RecordingSession
+from model.keypoint_classifier.dataset import DEFAULT_DIRECTORY as KEYPOINT_DATASET, ensure_dataset
+from utils.landmarks import (landmarks_to_array, calc_landmark_points,
+                             calc_bounding_rect, pre_process_landmarks, calc_roi, roi_to_image)
+
+# Политики отрисовки результатов на кадре
+RENDER_FULL = 'full'        # рамка, ключевые точки, подписи и FPS
+RENDER_MINIMAL = 'minimal'  # только рамка и подпись жеста
+RENDER_OFF = 'off'          # без отрисовки
+RENDER_POLICIES = (RENDER_FULL, RENDER_MINIMAL, RENDER_OFF)
+
+# минимальная вероятность жеста по умолчанию: ниже жест считается неизвестным
+DEFAULT_CONFIDENCE_THRESHOLD = 0.6
+
+# обучающие примеры для классификатора (двоичный набор; CSV - формат обмена)
+KEYPOINT_CSV = 'model/keypoint_classifier/keypoint.csv'
+
+# модель классификатора
+CLASSIFIER_MODEL = 'model/keypoint_classifier/keypoint_classifier.tflite'
+
+logger = logging.getLogger('GestureProcessor')
 
 class GestureProcessor:
-    def __init__(self):
-        """Инициализация обработчика распознавания жестов."""
+    # число буферов RGB: один заполняется, еще два могут ждать отрисовки в конвейере
+    RGB_BUFFERS = 3
+    
+    # режим ROI: запас вокруг руки (доля размера) и максимальная сторона области для MediaPipe
+    ROI_MARGIN = 0.3
+    ROI_MAX_SIDE = 256
+    
+    def __init__(self, classifier_backend=BACKEND_TFLITE,
+                 confidence_threshold=DEFAULT_CONFIDENCE_THRESHOLD, class_thresholds=None,
+                 max_num_hands=1, watch_model=False, registry=None):
+        """
+        Инициализация обработчика распознавания жестов.
+        
+        Args:
+            classifier_backend: 'tflite' или 'numpy' (классификатор без TensorFlow)
+            confidence_threshold: минимальная вероятность жеста (ниже - неизвестный жест)
+            class_thresholds: пороги для отдельных жестов {название жеста: порог}
+            max_num_hands: максимальное количество рук
+            watch_model: перезагружать модель и метки при изменении файлов (watch_model_files)
+            registry: общий GestureRegistry с названиями жестов (по умолчанию - собственный)
+        """
         
         # Настройки MediaPipe
         self.use_static_image_mode = False # False - видео, True - статика  
         self.min_detection_confidence = 0.7 # минимальная вероятность обнаружения руки первично поменьше брать для темноты
         self.min_tracking_confidence = 0.5 # минимальная вероятность отслеживания руки будет перебрасываться на отслеживание если меьнше 0.5
+        self.max_num_hands = max_num_hands # максимальное количество рук
         
-        # Инициализация MediaPipe рук
+        # Инициализация MediaPipe рук (импорт здесь: mediapipe загружается долго,
+        # а модуль импортируется уже при построении GUI)
+        import mediapipe as mp
         self.mp_hands = mp.solutions.hands
-        self.hands = self.mp_hands.Hands(
-            static_image_mode=self.use_static_image_mode,
-            max_num_hands=1, # максимальное количество рук
-            min_detection_confidence=self.min_detection_confidence,
-            min_tracking_confidence=self.min_tracking_confidence,
-        )
+        self.hands = self._create_hands()
         self.mp_drawing = mp.solutions.drawing_utils # солюшен для рисования рук
         
         # Инициализация классификаторов
-        self.keypoint_classifier = KeyPointClassifier()
+        self.classifier_backend = classifier_backend
+        self.keypoint_classifier = KeyPointClassifier(model_path=CLASSIFIER_MODEL, backend=classifier_backend)
+        
+        # Метки классов: общий список жестов, изменения подхватываются между кадрами
+        self.registry = registry if registry is not None else GestureRegistry()
+        self.keypoint_classifier_labels = self.registry.labels
         
-        # Загрузка меток классов
-        self.keypoint_classifier_labels = self._load_classifier_labels(
-            'model/keypoint_classifier/keypoint_classifier_label.csv')
+        # горячая перезагрузка модели (None - выключена)
+        self.model_manager = None
+        
+        # пороги уверенности классификатора
+        self.confidence_threshold = confidence_threshold
+        self.class_thresholds = dict(class_thresholds or {})
+        self._apply_confidence_thresholds()
+        
+        # временной фильтр: действия запускаются по устойчивому жесту, а не по одному кадру
+        self.gesture_filter = GestureFilter()
+        # основная рука прошлого кадра: (handedness, центр brect) или None
+        self._primary_hand = None
         
         # Режим работы
         self.mode = 0  # 0: Нормальный режим, 1: Запись жестов
@@ -43,11 +92,51 @@ class GestureProcessor:
         # Номер текущего жеста (для записи)
         self.number = -1
         
+        # сессия записи обучающих примеров (открывается в режиме записи)
+        self.recording = None
+        
+        # политика отрисовки результатов на кадре
+        self.render_policy = RENDER_FULL
+        
         # Калькулятор FPS
         self.cvFpsCalc = CvFpsCalc(buffer_len=10)
         
-    def update_settings(self, static_mode=None, min_detection_conf=None, min_tracking_conf=None):
-        """Обновление настроек MediaPipe."""
+        # замеры задержек по стадиям (по умолчанию выключены)
+        self.latency = LatencyTracker()
+        
+        # режим ROI: после обнаружения руки в MediaPipe передается только область вокруг нее
+        self.roi_mode = False
+        self.roi_margin = self.ROI_MARGIN
+        self.roi_max_side = self.ROI_MAX_SIDE
+        self._roi = None  # [x1, y1, x2, y2] в координатах кадра или None
+        
+        # адаптивный масштаб входа и пропуск кадров под целевую частоту (None - выключено)
+        self.adaptive = None
+        self._last_result = None  # результат последнего распознанного кадра
+        self._scaled_buffer = None
+        
+        # переиспользуемые буферы RGB (выделяются под размер первого кадра)
+        self._rgb_buffers = None
+        self._rgb_index = 0
+        
+        if watch_model:
+            self.watch_model_files()
+        
+    def _create_hands(self):
+        """Создание объекта MediaPipe Hands с текущими настройками."""
+        return self.mp_hands.Hands(
+            static_image_mode=self.use_static_image_mode,
+            max_num_hands=self.max_num_hands,
+            min_detection_confidence=self.min_detection_confidence,
+            min_tracking_confidence=self.min_tracking_confidence,
+        )
+        
+    def update_settings(self, static_mode=None, min_detection_conf=None, min_tracking_conf=None,
+                        min_classifier_conf=None, max_num_hands=None):
+        """Обновление настроек MediaPipe и порога уверенности классификатора."""
+        if min_classifier_conf is not None and min_classifier_conf != self.confidence_threshold:
+            self.set_confidence_threshold(min_classifier_conf)
+            
         restart_required = False
         
         if static_mode is not None and static_mode != self.use_static_image_mode:
@@ -62,49 +151,282 @@ class GestureProcessor:
             self.min_tracking_confidence = min_tracking_conf
             restart_required = True
             
+        if max_num_hands is not None and max_num_hands != self.max_num_hands:
+            self.max_num_hands = max_num_hands
+            restart_required = True
+            
         if restart_required:
+            self._roi = None
             #пересоздание объекта рук с новыми настройками
-            self.hands = self.mp_hands.Hands(
-                static_image_mode=self.use_static_image_mode,
-                max_num_hands=1,
-                min_detection_confidence=self.min_detection_confidence,
-                min_tracking_confidence=self.min_tracking_confidence,
-            )
+            self.hands = self._create_hands()
+            
+    def set_confidence_threshold(self, threshold, class_thresholds=None):
+        """
+        Установка порога уверенности классификатора.
+        
+        Args:
+            threshold: порог по умолчанию
+            class_thresholds: пороги для отдельных жестов {название жеста: порог}
+                              (None - оставить прежние)
+        """
+        self.confidence_threshold = threshold
+        if class_thresholds is not None:
+            self.class_thresholds = dict(class_thresholds)
+        self._apply_confidence_thresholds()
+        
+    def _apply_confidence_thresholds(self):
+        """Передача порогов классификатору (названия жестов -> индексы)."""
+        labels = self.keypoint_classifier_labels
+        class_thresholds = {labels.index(label): threshold
+                            for label, threshold in self.class_thresholds.items() if label in labels}
+        self.keypoint_classifier.set_confidence_thresholds(self.confidence_threshold, class_thresholds)
             
+    def set_roi_mode(self, enabled, margin=None, max_side=None):
+        """
+        Включение режима ROI.
+        
+        Когда рука найдена, следующий кадр обрабатывается только в квадратной области
+        вокруг нее (с запасом margin), уменьшенной до max_side пикселей по большей стороне.
+        Если в области рука не найдена, кадр обрабатывается целиком.
+        """
+        self.roi_mode = enabled
+        if margin is not None:
+            self.roi_margin = margin
+        if max_side is not None:
+            self.roi_max_side = max_side
+        self._roi = None
+        
+    def set_target_fps(self, target_fps):
+        """
+        Адаптивный режим: масштаб входа MediaPipe и пропуск кадров подбираются
+        по измеренному времени обработки так, чтобы держать target_fps.
+        Отображаемый кадр остается в исходном разрешении. 0 или None - выключить.
+        """
+        if not target_fps:
+            self.adaptive = None
+        elif self.adaptive is None:
+            self.adaptive = AdaptiveController(target_fps)
+        else:
+            self.adaptive.set_target_fps(target_fps)
+        
     def set_mode(self, mode=0):
         """Установка режима работы."""
         self.mode = mode
         
+    def set_render_policy(self, policy=RENDER_FULL):
+        """Установка политики отрисовки: 'full', 'minimal' или 'off'."""
+        if policy not in RENDER_POLICIES:
+            raise ValueError(f"Неизвестная политика отрисовки: {policy}")
+        self.render_policy = policy
+        
     def set_number(self, number=-1):
         """Установка номера для записи данных."""
         self.number = number
+        
+    def start_recording(self, path=KEYPOINT_DATASET, every_nth=1):
+        """
+        Открытие сессии записи до stop_recording.
+        
+        Args:
+            path: папка двоичного набора данных или CSV-файл (*.csv)
+        """
+        self.stop_recording()
+        target = path if path.endswith('.csv') else ensure_dataset(path, KEYPOINT_CSV)
+        self.recording = RecordingSession(target, every_nth=every_nth).start()
+        return self.recording
+        
+    def stop_recording(self):
+        """Закрытие сессии записи. Returns: int - число записанных кадров."""
+        session, self.recording = self.recording, None
+        if session is None:
+            return 0
+        session.close()
+        return session.recorded
+        
+    def hold_recording(self):
+        """Начало непрерывной записи текущего жеста (каждый N-й кадр с рукой)."""
+        if not self._can_record():
+            return False
+        if self.recording is None:
+            self.start_recording()
+        self.recording.hold(self.number)
+        return True
+        
+    def release_recording(self):
+        """Окончание непрерывной записи. Returns: int - кадров записано за удержание."""
+        if self.recording is None:
+            return 0
+        return self.recording.release()
             
+    def watch_model_files(self, poll_interval=1.0):
+        """
+        Включение горячей перезагрузки: новая модель собирается в фоне
+        и подменяется между кадрами в process_image.
+        """
+        self.stop_watching_model()
+        self.model_manager = ModelManager(CLASSIFIER_MODEL, self.registry, backend=self.classifier_backend,
+                                          poll_interval=poll_interval).start()
+        
+    def stop_watching_model(self):
+        """Выключение горячей перезагрузки."""
+        manager, self.model_manager = self.model_manager, None
+        if manager is not None:
+            manager.stop()
+            
+    def set_classifier(self, classifier=None, labels=None):
+        """
+        Замена классификатора и/или меток (вызывается между кадрами).
+        
+        Новая модель, число классов которой не совпадает с числом меток, отклоняется:
+        остается прежняя. Метки принимаются всегда (новый жест добавляется до
+        переобучения); номера классов без метки выводятся числом (см. _label).
+        
+        Returns: bool - заменена ли модель.
+        """
+        if labels is not None:
+            self.keypoint_classifier_labels = labels
+        labels = self.keypoint_classifier_labels
+        if classifier is not None and classifier.num_classes != len(labels):
+            logger.warning(f"Новая модель отклонена: классов {classifier.num_classes}, "
+                           f"жестов в списке {len(labels)}; используется прежняя модель")
+            classifier = None
+        if classifier is not None:
+            self.keypoint_classifier = classifier
+            # номера классов могли измениться: прежние голоса и результаты недействительны
+            self.gesture_filter.reset()
+            self._last_result = None
+        self._apply_confidence_thresholds()
+        return classifier is not None
+        
+    def _label(self, class_id):
+        """Название жеста по номеру класса; номер без метки (модель и список жестов разошлись) - числом."""
+        labels = self.keypoint_classifier_labels
+        return labels[class_id] if 0 <= class_id < len(labels) else str(class_id)
+        
+    def close(self):
+        """Освобождение ресурсов: фоновая перезагрузка модели и сессия записи."""
+        self.stop_watching_model()
+        self.stop_recording()
+        
     def process_image(self, image):
         """
         Обработка изображения и распознавание жестов.
         
+        Исходное изображение не изменяется. Оно один раз конвертируется в RGB
+        во внутренний буфер, который используется и MediaPipe, и для отрисовки.
+        
         Args:
             image: Изображение в формате BGR
             
         Returns:
-            tuple: (обработанное изображение, словарь с данными распознавания)
+            tuple: (обработанное изображение в формате RGB, словарь с данными распознавания).
+                   Изображение остается валидным в течение RGB_BUFFERS - 1 следующих вызовов.
+                   Результаты по всем рукам - в списке hands (hand_sign, handedness,
+                   probabilities, brect и др.); данные основной руки дублируются на
+                   верхнем уровне (hand_sign и др.). Также словарь содержит события
+                   временного фильтра gesture_events - [(событие, жест)] - и stable_sign,
+                   если есть устойчивый жест.
         """
-        # копирование изображения для отрисовки
-        debug_image = copy.deepcopy(image)
+        latency = self.latency
+        frame_start = time.perf_counter()
+        
+        # новая модель, собранная в фоне, и новый список жестов подменяются до распознавания кадра
+        manager = self.model_manager
+        update = manager.take() if manager is not None else None
+        labels = self.registry.labels
+        reloaded = False
+        if update is not None or labels is not self.keypoint_classifier_labels:
+            reloaded = self.set_classifier(update, labels)
         
         # вычисление FPS
         fps = self.cvFpsCalc.get()
         
-        # конвертация изображения в RGB для MediaPipe
-        image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        # конвертация изображения в RGB для MediaPipe (без выделения памяти)
+        with latency.span("cvtColor"):
+            image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=self._next_rgb_buffer(image))
+        debug_image = image_rgb
+        
+        render_policy = self.render_policy
+        
+        # адаптивный режим может пропустить распознавание: тогда на новом кадре
+        # показывается прошлый результат (без событий фильтра)
+        adaptive = self.adaptive
+        recognized = adaptive is None or self._last_result is None or adaptive.should_process()
+        if recognized:
+            result_data, hands_to_draw, roi = self._recognize(image_rgb, fps)
+            self._last_result = (result_data, hands_to_draw, roi)
+        else:
+            last_data, hands_to_draw, roi = self._last_result
+            result_data = {key: value for key, value in last_data.items()
+                           if key not in ("gesture_events", "model_reloaded")}
+            result_data["fps"] = fps
+            result_data["skipped"] = True
+        
+        if reloaded:
+            result_data["model_reloaded"] = True
+        
+        if adaptive is not None:
+            result_data["inference_scale"] = adaptive.scale
+            result_data["frame_skip"] = adaptive.skip
+        
+        if render_policy != RENDER_OFF:
+            with latency.span("draw"):
+                # отрисовка результатов на изображении
+                for brect, landmark_points, handedness_label, hand_sign in hands_to_draw:
+                    debug_image = self._draw_bounding_rect(debug_image, brect)
+                    if render_policy == RENDER_FULL:
+                        debug_image = self._draw_landmarks(debug_image, landmark_points)
+                    debug_image = self._draw_info_text(debug_image, brect, handedness_label, hand_sign)
+                
+                # область, в которой искалась рука
+                if render_policy == RENDER_FULL and roi is not None:
+                    cv2.rectangle(debug_image, (roi[0], roi[1]), (roi[2] - 1, roi[3] - 1), (128, 128, 128), 1)
+                
+                # отрисовка информации (FPS, режим, номер)
+                if render_policy == RENDER_FULL:
+                    debug_image = self._draw_info(debug_image, fps, self.mode, self.number)
+        
+        frame_ms = (time.perf_counter() - frame_start) * 1000.0
+        latency.record("process_image", frame_ms)
+        if recognized and adaptive is not None:
+            adaptive.update(frame_ms)
+        
+        return debug_image, result_data
+        
+    def _recognize(self, image_rgb, fps):
+        """
+        Распознавание рук и жестов на кадре RGB.
+        
+        Returns:
+            tuple: (словарь с данными распознавания, данные для отрисовки рук,
+                    область ROI, в которой найдена рука, или None)
+        """
+        latency = self.latency
         
         # Запрет записи в изображение для увеличения производительности
         image_rgb.flags.writeable = False
         
-        # Обработка изображения с MediaPipe
-        results = self.hands.process(image_rgb)
-        
-        # Разрешение записи в изображение
+        # Обработка изображения с MediaPipe: сначала в области вокруг руки (режим ROI)
+        # (только при отслеживании одной руки: вторая рука вне области не была бы найдена)
+        roi = self._roi if self.roi_mode and self.max_num_hands == 1 else None
+        if roi is not None:
+            with latency.span("roi_crop"):
+                roi_image = self._crop_roi(image_rgb, roi)
+            with latency.span("hands.process"):
+                results = self.hands.process(roi_image)
+            if results.multi_hand_landmarks is None:
+                # рука ушла из области: повтор по всему кадру
+                roi = None
+        if roi is None:
+            # координаты MediaPipe нормализованы, поэтому уменьшенный кадр их не меняет
+            inference_image = image_rgb
+            if self.adaptive is not None and self.adaptive.scale < 1.0:
+                with latency.span("downscale"):
+                    inference_image = self._downscale(image_rgb, self.adaptive.scale)
+            with latency.span("hands.process"):
+                results = self.hands.process(inference_image)
+        
+        # Разрешение записи в изображение: дальше на нем рисуется результат
         image_rgb.flags.writeable = True
         
         # подготовка словаря с данными распознавания
@@ -114,110 +436,140 @@ class GestureProcessor:
             "number": self.number
         }
         
-        # если обнаружены руки
+        render_policy = self.render_policy
+        
+        # данные для отрисовки найденных рук
+        hands_to_draw = []
+        
+        # результаты по каждой найденной руке
+        hands = []
+        
+        image_height, image_width = image_rgb.shape[0], image_rgb.shape[1]
+        
+        # если обнаружены руки: все руки обрабатываются одним пакетом
         if results.multi_hand_landmarks is not None:
-            for hand_landmarks, handedness in zip(results.multi_hand_landmarks, results.multi_handedness):
-                # расчет ограничивающего прямоугольника
-                brect = self._calc_bounding_rect(debug_image, hand_landmarks)
+            with latency.span("landmarks"):
+                # все вычисления идут от одного массива (N, 21, 2)
+                landmark_arrays = np.stack([landmarks_to_array(hand_landmarks)
+                                            for hand_landmarks in results.multi_hand_landmarks])
+                if roi is not None:
+                    landmark_arrays = roi_to_image(landmark_arrays, roi, image_width, image_height)
                 
                 # вычисление координат ключевых точек
-                landmark_list = self._calc_landmark_list(debug_image, hand_landmarks)
+                landmark_points = calc_landmark_points(landmark_arrays, image_width, image_height)
                 
                 # преобразование координат в относительные
-                pre_processed_landmark_list = self._pre_process_landmark(landmark_list)
-                
-                # распознавание жеста руки
-                hand_sign_id = self.keypoint_classifier(pre_processed_landmark_list)
-                
-                # сохранение результатов в словарь
-                result_data["hand_sign_id"] = hand_sign_id
-                result_data["hand_sign"] = self.keypoint_classifier_labels[hand_sign_id]
-                result_data["handedness"] = handedness.classification[0].label[0]  # 'R' или 'L'
-                result_data["landmark_list"] = pre_processed_landmark_list  # Сохраняем точки для записи
-                
-                # отрисовка результатов на изображении
-                debug_image = self._draw_bounding_rect(debug_image, brect)
-                debug_image = self._draw_landmarks(debug_image, landmark_list)
-                debug_image = self._draw_info_text(
-                    debug_image,
-                    brect,
-                    handedness.classification[0].label[0],
-                    self.keypoint_classifier_labels[hand_sign_id]
-                )
-        
-        # отрисовка информации (FPS, режим, номер)
-        debug_image = self._draw_info(debug_image, fps, self.mode, self.number)
-        
-        return debug_image, result_data
-        
-    def _load_classifier_labels(self, path):
-        """Загрузка меток классов из CSV-файла."""
-        import csv
-        
-        with open(path, 'r', encoding='utf-8-sig') as f:
-            labels = csv.reader(f)
-            labels = [row[0] for row in labels]
-            
-        return labels
-        
-    def _calc_bounding_rect(self, image, landmarks):
-        """Расчет ограничивающего прямоугольника вокруг руки."""
-        image_width, image_height = image.shape[1], image.shape[0]
-        
-        landmark_array = np.empty((0, 2), int)
-        
-        for landmark in landmarks.landmark:
-            landmark_x = min(int(landmark.x * image_width), image_width - 1)
-            landmark_y = min(int(landmark.y * image_height), image_height - 1)
-            
-            landmark_point = [np.array((landmark_x, landmark_y))]
-            landmark_array = np.append(landmark_array, landmark_point, axis=0)
-            
-        x, y, w, h = cv2.boundingRect(landmark_array)
-        
-        return [x, y, x + w, y + h]
-        
-    def _calc_landmark_list(self, image, landmarks):
-        """Расчет координат ключевых точек руки."""
-        image_width, image_height = image.shape[1], image.shape[0]
-        
-        landmark_point = []
-        
-        # перебор всех 21 точки руки
-        for landmark in landmarks.landmark:
-            landmark_x = min(int(landmark.x * image_width), image_width - 1)
-            landmark_y = min(int(landmark.y * image_height), image_height - 1)
+                pre_processed_landmarks = pre_process_landmarks(landmark_points)
             
-            landmark_point.append([landmark_x, landmark_y])
+            # распознавание жестов всех рук за один вызов классификатора
+            with latency.span("classifier"):
+                class_ids, probabilities = self.keypoint_classifier.classify_batch(pre_processed_landmarks)
             
-        return landmark_point
-        
-    def _pre_process_landmark(self, landmark_list):
-        """Предобработка координат ключевых точек для классификатора."""
-        temp_landmark_list = copy.deepcopy(landmark_list)
-        
-        # преобразование в относительные координаты
-        base_x, base_y = 0, 0
-        for index, landmark_point in enumerate(temp_landmark_list):
-            if index == 0:
-                base_x, base_y = landmark_point[0], landmark_point[1]
+            for index, handedness in enumerate(results.multi_handedness):
+                hand_sign_id = int(class_ids[index])
+                hand = {
+                    "hand_sign_id": hand_sign_id,
+                    "probabilities": probabilities[index],
+                    "handedness": handedness.classification[0].label[0],  # 'R' или 'L'
+                    "landmark_list": pre_processed_landmarks[index],  # точки для записи
+                    "brect": calc_bounding_rect(landmark_points[index]),
+                }
                 
-            temp_landmark_list[index][0] = temp_landmark_list[index][0] - base_x
-            temp_landmark_list[index][1] = temp_landmark_list[index][1] - base_y
-            
-        # преобразование в одномерный список itertools(типо все допмассивы в один)
-        temp_landmark_list = list(
-            itertools.chain.from_iterable(temp_landmark_list))
-            
-        # Нормализация
-        max_value = max(list(map(abs, temp_landmark_list)))
-        
-        def normalize_(n):
-            return n / max_value
-            
-        temp_landmark_list = list(map(normalize_, temp_landmark_list))
+                # неуверенный результат: жест не подписывается и не передается дальше
+                if hand_sign_id != UNKNOWN_CLASS:
+                    hand["hand_sign"] = self._label(hand_sign_id)
+                hands.append(hand)
+                
+                if render_policy != RENDER_OFF:
+                    hands_to_draw.append((hand["brect"], landmark_points[index], hand["handedness"],
+                                          hand.get("hand_sign", "")))
+        
+        result_data["hands"] = hands
+        
+        # основная рука управляет действиями; ее данные дублируются на верхнем уровне словаря
+        primary = self._select_primary(hands)
+        frame_class_id, frame_probabilities = None, None
+        if primary is not None:
+            for key in ("hand_sign_id", "probabilities", "handedness", "landmark_list", "hand_sign"):
+                if key in primary:
+                    result_data[key] = primary[key]
+            if "hand_sign" in primary:
+                frame_class_id, frame_probabilities = primary["hand_sign_id"], primary["probabilities"]
+        
+        # непрерывная запись: основная рука текущего кадра
+        recording = self.recording
+        if recording is not None:
+            if primary is not None and self.mode == 1:
+                recording.offer(primary["landmark_list"])
+            result_data["recorded_frames"] = recording.recorded
+        
+        # область для следующего кадра
+        if self.roi_mode:
+            self._roi = None
+            if len(hands) == 1:
+                self._roi = calc_roi(hands[0]["brect"], image_width, image_height, self.roi_margin)
+            if roi is not None:
+                result_data["roi"] = roi
+        
+        # сглаживание во времени: события onset/hold/release устойчивого жеста
+        events = self.gesture_filter.update(frame_class_id, frame_probabilities)
+        if events:
+            result_data["gesture_events"] = [(event, self._label(class_id)) for event, class_id in events]
+        if self.gesture_filter.active is not None:
+            result_data["stable_sign"] = self._label(self.gesture_filter.active)
+        
+        return result_data, hands_to_draw, roi
+        
+    def _select_primary(self, hands):
+        """
+        Выбор основной руки, устойчивый между кадрами.
         
-        return temp_landmark_list
+        MediaPipe не сохраняет порядок рук, поэтому при двух руках основной
+        остается рука той же стороны (handedness), что и на прошлом кадре, а среди
+        них - ближайшая к ее прошлому положению. Без прошлой руки выбирается
+        первая с распознанным жестом.
+        """
+        if not hands:
+            self._primary_hand = None
+            return None
+        
+        previous = self._primary_hand
+        if previous is None:
+            primary = next((hand for hand in hands if "hand_sign" in hand), hands[0])
+        else:
+            handedness, (center_x, center_y) = previous
+            candidates = [hand for hand in hands if hand["handedness"] == handedness] or hands
+            primary = min(candidates, key=lambda hand: (
+                (hand["brect"][0] + hand["brect"][2]) / 2.0 - center_x) ** 2 + (
+                (hand["brect"][1] + hand["brect"][3]) / 2.0 - center_y) ** 2)
+        
+        brect = primary["brect"]
+        self._primary_hand = (primary["handedness"], ((brect[0] + brect[2]) / 2.0, (brect[1] + brect[3]) / 2.0))
+        return primary
+        
+    def _next_rgb_buffer(self, image):
+        """Следующий буфер RGB из кольца (перевыделяется при смене размера кадра)."""
+        if self._rgb_buffers is None or self._rgb_buffers[0].shape != image.shape:
+            self._rgb_buffers = [np.empty_like(image) for _ in range(self.RGB_BUFFERS)]
+        self._rgb_index = (self._rgb_index + 1) % self.RGB_BUFFERS
+        return self._rgb_buffers[self._rgb_index]
+        
+    def _downscale(self, image, scale):
+        """Уменьшенная копия кадра для MediaPipe (буфер переиспользуется)."""
+        size = (max(1, round(image.shape[1] * scale)), max(1, round(image.shape[0] * scale)))
+        if self._scaled_buffer is None or self._scaled_buffer.shape[1::-1] != size:
+            self._scaled_buffer = np.empty((size[1], size[0], image.shape[2]), dtype=image.dtype)
+        return cv2.resize(image, size, dst=self._scaled_buffer, interpolation=cv2.INTER_LINEAR)
+        
+    def _crop_roi(self, image, roi):
+        """Вырезка области интереса с уменьшением до roi_max_side по большей стороне."""
+        x1, y1, x2, y2 = roi
+        crop = image[y1:y2, x1:x2]
+        scale = self.roi_max_side / max(x2 - x1, y2 - y1)
+        if scale < 1.0:
+            size = (max(1, round((x2 - x1) * scale)), max(1, round((y2 - y1) * scale)))
+            return cv2.resize(crop, size, interpolation=cv2.INTER_LINEAR)
+        return np.ascontiguousarray(crop)
         
     def _draw_landmarks(self, image, landmark_points):
         """Отрисовка ключевых точек руки."""
@@ -231,7 +583,10 @@ class GestureProcessor:
             (5, 9), (9, 13), (13, 17), (0, 17)  # Ладонь
         ]
         
-        # Рисуем точки
+        # cv2 ожидает точки в виде последовательностей int
+        landmark_points = landmark_points.tolist()
+        
+        # Рисуем точки (цвета в RGB)
         for index, point in enumerate(landmark_points):
             # Центр запястья
             if index == 0:
@@ -239,15 +594,15 @@ class GestureProcessor:
                 cv2.circle(image, point, 10, (0, 255, 0), 2)
             # Суставы пальцев
             elif index in (1, 5, 9, 13, 17):
-                cv2.circle(image, point, 5, (255, 0, 0), -1)
-                cv2.circle(image, point, 10, (255, 0, 0), 2)
+                cv2.circle(image, point, 5, (0, 0, 255), -1)
+                cv2.circle(image, point, 10, (0, 0, 255), 2)
             # Кончики пальцев
             elif index in (4, 8, 12, 16, 20):
-                cv2.circle(image, point, 8, (0, 0, 255), -1)
-                cv2.circle(image, point, 12, (0, 0, 255), 2)
+                cv2.circle(image, point, 8, (255, 0, 0), -1)
+                cv2.circle(image, point, 12, (255, 0, 0), 2)
             # Остальные точки
             else:
-                cv2.circle(image, point, 5, (0, 255, 255), -1)
+                cv2.circle(image, point, 5, (255, 255, 0), -1)
                 
         # линии
         for connection in connections:
@@ -289,28 +644,32 @@ class GestureProcessor:
                            cv2.LINE_AA)
         return image
 
-    def record_frame(self, landmark_list):
-        """Запись кадра в CSV файл."""
+    def _can_record(self):
+        """Проверка режима и номера жеста перед записью."""
         if self.mode != 1:
-            print(f"Неверный режим: {self.mode}, ожидается 1")
+            logger.warning(f"Неверный режим: {self.mode}, ожидается 1")
             return False
             
         if self.number < 0 or self.number >= len(self.keypoint_classifier_labels):
-            print(f"Неверный номер жеста: {self.number}, ожидается 0-{len(self.keypoint_classifier_labels)-1}")
+            logger.warning(f"Неверный номер жеста: {self.number}, "
+                           f"ожидается 0-{len(self.keypoint_classifier_labels)-1}")
+            return False
+        return True
+        
+    def record_frame(self, landmark_list):
+        """Запись одного кадра в сессию записи (на диск попадает пакетом в фоне)."""
+        if not self._can_record():
             return False
             
         if landmark_list is None:
-            print("Список точек пуст")
+            logger.warning("Список точек пуст")
             return False
             
         try:
-            csv_path = 'model/keypoint_classifier/keypoint.csv'
-            with open(csv_path, 'a', newline="") as f:
-                writer = csv.writer(f)
-                writer.writerow([self.number, *landmark_list])
-            print(f"Успешно записан кадр для жеста {self.number}")
+            if self.recording is None:
+                self.start_recording()
+            self.recording.write(self.number, landmark_list)
             return True
         except Exception as e:
-            print(f"Ошибка при записи в CSV: {e}")
+            logger.error(f"Ошибка при записи кадра: {e}")
             return False
-
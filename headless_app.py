@@ -0,0 +1,198 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Распознавание жестов без графического интерфейса (без PyQt).
+
+Цикл: захват кадра -> GestureProcessor.process_image -> ActionExecutor (действия в фоновом потоке).
+"""
+import sys
+import time
+import argparse
+import logging
+
+import cv2
+
+from gesture_processor import (GestureProcessor, DEFAULT_CONFIDENCE_THRESHOLD,
+                               RENDER_FULL, RENDER_OFF, RENDER_POLICIES)
+from model import BACKEND_NUMPY, BACKEND_TFLITE
+from utils import FrameGrabber, GESTURE_HOLD, GESTURE_ONSET
+
+logger = logging.getLogger('Headless')
+
+
+def parse_args():
+    """Разбор аргументов командной строки."""
+    parser = argparse.ArgumentParser(description='Hand Gesture Recognition без GUI')
+
+    parser.add_argument('--camera', type=int, default=0,
+                      help='ID камеры для захвата (по умолчанию: 0)')
+
+    parser.add_argument('--width', type=int, default=640,
+                      help='Ширина изображения с камеры (по умолчанию: 640)')
+
+    parser.add_argument('--height', type=int, default=480,
+                      help='Высота изображения с камеры (по умолчанию: 480)')
+
+    parser.add_argument('--classifier-backend', choices=[BACKEND_TFLITE, BACKEND_NUMPY],
+                      default=BACKEND_NUMPY,
+                      help='Движок классификатора жестов (по умолчанию: numpy, без TensorFlow)')
+
+    parser.add_argument('--min-confidence', type=float, default=DEFAULT_CONFIDENCE_THRESHOLD,
+                      help='Минимальная уверенность жеста, ниже жест считается неизвестным '
+                           f'(по умолчанию: {DEFAULT_CONFIDENCE_THRESHOLD})')
+
+    parser.add_argument('--max-hands', type=int, default=1,
+                      help='Максимальное количество рук (по умолчанию: 1)')
+
+    parser.add_argument('--roi', action='store_true',
+                      help='Искать руку в области вокруг прошлого положения (быстрее на высоком разрешении)')
+
+    parser.add_argument('--target-fps', type=float, default=0,
+                      help='Адаптивный масштаб входа и пропуск кадров под целевую частоту (0 - выключено)')
+
+    parser.add_argument('--render', choices=RENDER_POLICIES, default=RENDER_OFF,
+                      help='Отрисовка результатов на кадре: full, minimal или off (по умолчанию: off)')
+
+    parser.add_argument('--preview', action='store_true',
+                      help='Показывать кадр в окне OpenCV (при --render off включает full)')
+
+    parser.add_argument('--dry-run', action='store_true',
+                      help='Только распознавать жесты, не выполняя действий')
+
+    parser.add_argument('--cooldown', type=float, default=3.0,
+                      help='Задержка между действиями в секундах (по умолчанию: 3.0)')
+
+    parser.add_argument('--max-fps', type=float, default=0,
+                      help='Ограничение частоты обработки кадров для экономии CPU (0 - без ограничения)')
+
+    parser.add_argument('--stats-interval', type=float, default=10.0,
+                      help='Период вывода статистики в секундах (0 - не выводить)')
+
+    parser.add_argument('--latency', action='store_true',
+                      help='Замерять задержки по стадиям и выводить их вместе со статистикой')
+
+    parser.add_argument('--watch-model', action='store_true',
+                      help='Перезагружать модель и метки при изменении файлов (после дообучения)')
+
+    return parser.parse_args()
+
+
+def log_stats(processor, grabber, frames, elapsed):
+    """Вывод статистики работы."""
+    logger.info(f"Кадров: {frames}, {frames / elapsed:.1f} к/с, "
+                f"пропущено при захвате: {grabber.dropped_frames}")
+    for stage, stats in processor.latency.summary().items():
+        logger.info(f"  {stage}: p50={stats['p50']:.1f} p95={stats['p95']:.1f} p99={stats['p99']:.1f} мс")
+
+
+def run(args, processor, cap, executor):
+    """Цикл распознавания до ESC или Ctrl+C."""
+    grabber = FrameGrabber(cap, processor.latency)
+    grabber.start()
+    logger.info(f"Распознавание запущено (камера {args.camera}), Ctrl+C для выхода")
+
+    min_frame_time = 1.0 / args.max_fps if args.max_fps > 0 else 0.0
+    flip_buffer = None
+    frames = 0
+    start_time = last_stats_time = time.perf_counter()
+
+    try:
+        while True:
+            frame_start = time.perf_counter()
+
+            frame = grabber.read(timeout=1.0)
+            if frame is None:
+                continue
+
+            # отражение изображения по горизонтали (зеркально), как в GUI
+            if flip_buffer is None or flip_buffer.shape != frame.shape:
+                flip_buffer = frame.copy()
+            frame = cv2.flip(frame, 1, dst=flip_buffer)
+            debug_image, data = processor.process_image(frame)
+            frames += 1
+            if data.get("model_reloaded"):
+                logger.info("Модель классификатора перезагружена")
+
+            # действие запускается, когда жест стал устойчивым (временной фильтр);
+            # повторяющиеся действия - и пока жест удерживается
+            for event, gesture_name in data.get("gesture_events", ()):
+                if event == GESTURE_ONSET:
+                    logger.info(f"Жест распознан: {gesture_name}")
+                    if executor is not None:
+                        executor.submit(gesture_name)
+                elif (event == GESTURE_HOLD and executor is not None
+                      and executor.actions.is_repeating(gesture_name)):
+                    executor.submit(gesture_name)
+
+            if args.preview:
+                cv2.imshow('Hand Gesture Recognition', cv2.cvtColor(debug_image, cv2.COLOR_RGB2BGR))
+                if cv2.waitKey(1) == 27:  # ESC
+                    break
+
+            now = time.perf_counter()
+            if args.stats_interval > 0 and now - last_stats_time >= args.stats_interval:
+                log_stats(processor, grabber, frames, now - start_time)
+                last_stats_time = now
+
+            # ограничение частоты обработки
+            sleep_time = min_frame_time - (now - frame_start)
+            if sleep_time > 0:
+                time.sleep(sleep_time)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        grabber.stop()
+        if args.preview:
+            cv2.destroyAllWindows()
+        log_stats(processor, grabber, frames, max(time.perf_counter() - start_time, 1e-6))
+
+    return 0
+
+
+def main():
+    """Основная функция безголового режима."""
+    args = parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    processor = GestureProcessor(classifier_backend=args.classifier_backend,
+                                 confidence_threshold=args.min_confidence,
+                                 max_num_hands=args.max_hands,
+                                 watch_model=args.watch_model)
+    executor = None
+    cap = None
+    # наблюдатель модели и сессия записи закрываются на любом пути выхода
+    try:
+        render_policy = args.render
+        if args.preview and render_policy == RENDER_OFF:
+            render_policy = RENDER_FULL
+        processor.set_render_policy(render_policy)
+        processor.set_roi_mode(args.roi)
+        processor.set_target_fps(args.target_fps)
+        processor.latency.set_enabled(args.latency)
+
+        if not args.dry_run:
+            # pyautogui (X-сервер) нужен только при выполнении действий
+            from gesture_actions import ActionExecutor, GestureActions
+            actions = GestureActions()
+            actions.set_action_cooldown(args.cooldown)
+            executor = ActionExecutor(actions, latency=processor.latency)
+            executor.start()
+
+        cap = cv2.VideoCapture(args.camera)
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, args.width)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, args.height)
+        if not cap.isOpened():
+            logger.error(f"Не удалось открыть камеру {args.camera}")
+            return 1
+
+        return run(args, processor, cap, executor)
+    finally:
+        if cap is not None:
+            cap.release()
+        if executor is not None:
+            executor.stop()
+        processor.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1 +1,3 @@
-from model.keypoint_classifier.keypoint_classifier import KeyPointClassifier
\ No newline at end of file
+from model.keypoint_classifier.keypoint_classifier import KeyPointClassifier, BACKEND_NUMPY, BACKEND_TFLITE, UNKNOWN_CLASS
+from model.keypoint_classifier.model_manager import ModelManager
+from model.keypoint_classifier.gesture_registry import GestureRegistry
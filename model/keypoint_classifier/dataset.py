@@ -0,0 +1,239 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Двоичное хранилище обучающих примеров классификатора ключевых точек.
+
+Признаки хранятся в keypoint_features.npy (N, 42) float32, метки - в
+keypoint_labels.npy (N,) int32. Заголовок .npy имеет фиксированный размер,
+поэтому файлы дописываются на месте (данные, затем число строк в заголовке),
+а читаются через np.load(mmap_mode='r') без разбора текста даже на миллионах строк.
+keypoint.csv остается форматом обмена: поддерживаются импорт и экспорт.
+
+Запуск из корня репозитория:
+    python -m model.keypoint_classifier.dataset import model/keypoint_classifier/keypoint.csv
+    python -m model.keypoint_classifier.dataset info
+    python -m model.keypoint_classifier.dataset dedup
+    python -m model.keypoint_classifier.dataset export keypoint.csv
+"""
+import argparse
+import ast
+import itertools
+import os
+import struct
+import sys
+
+import numpy as np
+
+DEFAULT_DIRECTORY = 'model/keypoint_classifier'
+DEFAULT_CSV = 'model/keypoint_classifier/keypoint.csv'
+FEATURES_FILE = 'keypoint_features.npy'
+LABELS_FILE = 'keypoint_labels.npy'
+NUM_FEATURES = 21 * 2
+
+# заголовок .npy версии 1.0 фиксированной длины (кратной 64, как у numpy)
+_MAGIC = b'\x93NUMPY\x01\x00'
+HEADER_SIZE = 128
+# строк CSV, разбираемых за один раз при импорте
+CSV_CHUNK_ROWS = 65536
+
+
+def _header(dtype, shape):
+    header = "{'descr': %r, 'fortran_order': False, 'shape': %r, }" % (np.dtype(dtype).str, tuple(shape))
+    header = header.ljust(HEADER_SIZE - len(_MAGIC) - 2 - 1) + '\n'
+    if len(header) + len(_MAGIC) + 2 != HEADER_SIZE:
+        raise ValueError(f"Форма {shape} не помещается в заголовок .npy")
+    return _MAGIC + struct.pack('<H', len(header)) + header.encode('latin1')
+
+
+def _read_rows(path):
+    """Число строк из заголовка .npy (0, если файла нет)."""
+    if not os.path.exists(path):
+        return 0
+    with open(path, 'rb') as f:
+        preamble = f.read(len(_MAGIC) + 2)
+        if len(preamble) < len(_MAGIC) + 2 or preamble[:len(_MAGIC)] != _MAGIC:
+            raise ValueError(f"{path}: не файл .npy версии 1.0")
+        header_len, = struct.unpack('<H', preamble[len(_MAGIC):])
+        header = ast.literal_eval(f.read(header_len).decode('latin1'))
+    return header['shape'][0]
+
+
+class KeypointDataset(object):
+    """
+    Признаки и метки обучающих примеров в двух дописываемых файлах .npy.
+
+    Число строк хранится в заголовках: сначала дописываются данные, затем
+    обновляется заголовок, поэтому оборванная запись не портит уже сохраненные
+    строки (хвост перезаписывается при следующем append).
+    """
+
+    def __init__(self, directory=DEFAULT_DIRECTORY, num_features=NUM_FEATURES):
+        self.directory = directory
+        self.num_features = num_features
+        self.features_path = os.path.join(directory, FEATURES_FILE)
+        self.labels_path = os.path.join(directory, LABELS_FILE)
+
+    def exists(self):
+        return os.path.exists(self.features_path) and os.path.exists(self.labels_path)
+
+    def __len__(self):
+        # при оборванной записи заголовки могут разойтись: верно меньшее значение
+        return min(_read_rows(self.features_path), _read_rows(self.labels_path))
+
+    def load(self, mmap=True):
+        """
+        Признаки (N, 42) float32 и метки (N,) int32.
+
+        При mmap=True массивы только для чтения отображаются на файлы без копирования.
+        """
+        if not self.exists():
+            return (np.empty((0, self.num_features), dtype=np.float32),
+                    np.empty((0,), dtype=np.int32))
+        mmap_mode = 'r' if mmap else None
+        features = np.load(self.features_path, mmap_mode=mmap_mode)
+        labels = np.load(self.labels_path, mmap_mode=mmap_mode)
+        rows = min(len(features), len(labels))
+        return features[:rows], labels[:rows]
+
+    def append(self, labels, features):
+        """Дописывание примеров. Returns: int - строк в наборе после записи."""
+        features = np.ascontiguousarray(features, dtype=np.float32).reshape(-1, self.num_features)
+        labels = np.ascontiguousarray(labels, dtype=np.int32).reshape(-1)
+        if len(labels) != len(features):
+            raise ValueError(f"Число меток ({len(labels)}) не совпадает с числом примеров ({len(features)})")
+
+        os.makedirs(self.directory, exist_ok=True)
+        rows = len(self) if self.exists() else 0
+        total = rows + len(labels)
+        self._append_array(self.features_path, features, rows, (total, self.num_features))
+        self._append_array(self.labels_path, labels, rows, (total,))
+        return total
+
+    def _append_array(self, path, array, rows, shape):
+        row_bytes = array.itemsize * int(np.prod(array.shape[1:], dtype=np.int64))
+        mode = 'r+b' if os.path.exists(path) else 'w+b'
+        with open(path, mode) as f:
+            if mode == 'w+b':
+                f.write(_header(array.dtype, (0,) + array.shape[1:]))
+            # данные после rows-й строки (хвост оборванной записи) перезаписываются
+            f.seek(HEADER_SIZE + rows * row_bytes)
+            f.write(array.tobytes())
+            f.truncate()
+            f.flush()
+            os.fsync(f.fileno())
+            f.seek(0)
+            f.write(_header(array.dtype, shape))
+
+    def write(self, labels, features):
+        """Замена всего набора (через временные файлы и os.replace)."""
+        temp = KeypointDataset(self.directory, self.num_features)
+        temp.features_path = self.features_path + '.tmp'
+        temp.labels_path = self.labels_path + '.tmp'
+        for path in (temp.features_path, temp.labels_path):
+            if os.path.exists(path):
+                os.remove(path)
+        temp.append(labels, features)
+        os.replace(temp.features_path, self.features_path)
+        os.replace(temp.labels_path, self.labels_path)
+
+    def import_csv(self, csv_path=DEFAULT_CSV, replace=False):
+        """
+        Импорт keypoint.csv (метка, 42 признака) частями по CSV_CHUNK_ROWS строк.
+
+        Returns: int - импортировано строк.
+        """
+        if replace:
+            self.write(np.empty((0,), dtype=np.int32), np.empty((0, self.num_features), dtype=np.float32))
+        imported = 0
+        with open(csv_path, 'r', encoding='utf-8') as f:
+            while True:
+                lines = list(itertools.islice(f, CSV_CHUNK_ROWS))
+                if not lines:
+                    break
+                data = np.loadtxt(lines, delimiter=',', dtype=np.float32, ndmin=2)
+                if len(data) == 0:
+                    continue
+                self.append(data[:, 0].astype(np.int32), data[:, 1:])
+                imported += len(data)
+        return imported
+
+    def export_csv(self, csv_path):
+        """Экспорт в формат keypoint.csv. Returns: int - строк записано."""
+        features, labels = self.load()
+        with open(csv_path, 'w', newline='') as f:
+            for start in range(0, len(labels), CSV_CHUNK_ROWS):
+                chunk = slice(start, start + CSV_CHUNK_ROWS)
+                rows = np.column_stack([labels[chunk].astype(np.float32), features[chunk]])
+                np.savetxt(f, rows, delimiter=',', fmt=['%d'] + ['%.9g'] * self.num_features)
+        return len(labels)
+
+    def duplicates(self):
+        """Маска повторов: True для строк, уже встречавшихся раньше (метка и признаки)."""
+        features, labels = self.load()
+        rows = np.column_stack([labels.view(np.float32), features])
+        rows = np.ascontiguousarray(rows).view(np.dtype((np.void, rows.dtype.itemsize * rows.shape[1])))
+        _, first = np.unique(rows.ravel(), return_index=True)
+        mask = np.ones(len(labels), dtype=bool)
+        mask[first] = False
+        return mask
+
+    def deduplicate(self):
+        """Удаление повторяющихся строк (порядок сохраняется). Returns: int - удалено строк."""
+        mask = self.duplicates()
+        removed = int(mask.sum())
+        if removed:
+            features, labels = self.load()
+            keep = ~mask
+            self.write(np.array(labels[keep]), np.array(features[keep]))
+        return removed
+
+    def class_counts(self):
+        """Число примеров по номерам жестов: {номер: количество}."""
+        _, labels = self.load()
+        ids, counts = np.unique(labels, return_counts=True)
+        return dict(zip(ids.tolist(), counts.tolist()))
+
+
+def ensure_dataset(directory=DEFAULT_DIRECTORY, csv_path=DEFAULT_CSV):
+    """Набор данных; при первом использовании в него импортируется существующий keypoint.csv."""
+    dataset = KeypointDataset(directory)
+    if not dataset.exists() and os.path.exists(csv_path):
+        dataset.import_csv(csv_path)
+    return dataset
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Двоичный набор данных ключевых точек')
+    parser.add_argument('--directory', default=DEFAULT_DIRECTORY, help='Папка с файлами .npy')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    import_parser = commands.add_parser('import', help='Импорт из keypoint.csv')
+    import_parser.add_argument('csv', nargs='?', default=DEFAULT_CSV)
+    import_parser.add_argument('--replace', action='store_true', help='Заменить набор, а не дописать')
+
+    export_parser = commands.add_parser('export', help='Экспорт в CSV')
+    export_parser.add_argument('csv')
+
+    commands.add_parser('dedup', help='Удалить повторяющиеся строки')
+    commands.add_parser('info', help='Число примеров по жестам')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    dataset = KeypointDataset(args.directory)
+
+    if args.command == 'import':
+        print(f"Импортировано строк: {dataset.import_csv(args.csv, replace=args.replace)}")
+    elif args.command == 'export':
+        print(f"Экспортировано строк: {dataset.export_csv(args.csv)}")
+    elif args.command == 'dedup':
+        print(f"Удалено повторов: {dataset.deduplicate()}")
+    print(f"Всего примеров: {len(dataset) if dataset.exists() else 0}")
+    for class_id, count in dataset.class_counts().items():
+        print(f"  {class_id}: {count}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
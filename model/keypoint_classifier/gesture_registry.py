@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import logging
+import os
+import tempfile
+import threading
+
+logger = logging.getLogger('GestureRegistry')
+
+LABELS_PATH = 'model/keypoint_classifier/keypoint_classifier_label.csv'
+
+
+class GestureRegistry(object):
+    """
+    Общий список названий жестов (файл меток классификатора), хранимый в памяти.
+
+    Файл читается один раз (и перечитывается только по reload/reload_if_changed),
+    изменения записываются атомарно (временный файл + os.replace). Подписчики
+    получают новый список при каждом его изменении; обратный вызов выполняется
+    в потоке, вызвавшем изменение, поэтому GUI должен передавать его через сигнал.
+    """
+
+    def __init__(self, path=LABELS_PATH):
+        self.path = path
+        self._labels = ()
+        self._stamp = None
+        self._listeners = []
+        self._lock = threading.Lock()
+        self.reload()
+
+    @property
+    def labels(self):
+        """Названия жестов (индекс - номер класса); неизменяемый снимок."""
+        return self._labels
+
+    def __len__(self):
+        return len(self._labels)
+
+    def __getitem__(self, index):
+        return self._labels[index]
+
+    def __contains__(self, name):
+        return name in self._labels
+
+    def index(self, name):
+        return self._labels.index(name)
+
+    def subscribe(self, callback):
+        """Подписка на изменения: callback(labels)."""
+        with self._lock:
+            self._listeners.append(callback)
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+    def _file_stamp(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def reload(self):
+        """Чтение файла меток. Returns: bool - изменился ли список."""
+        stamp = self._file_stamp()
+        labels = ()
+        if stamp is not None:
+            with open(self.path, 'r', encoding='utf-8-sig') as f:
+                labels = tuple(line.strip() for line in f if line.strip())
+        with self._lock:
+            self._stamp = stamp
+            changed = labels != self._labels
+            self._labels = labels
+        if changed:
+            self._notify(labels)
+        return changed
+
+    def reload_if_changed(self):
+        """Перечитывание файла, только если он изменился на диске (например, другим процессом)."""
+        if self._file_stamp() == self._stamp:
+            return False
+        return self.reload()
+
+    def add(self, name):
+        """
+        Добавление жеста в конец списка.
+
+        Returns: int - номер нового жеста.
+        Raises: ValueError - пустое название или жест уже существует.
+        """
+        name = name.strip()
+        if not name:
+            raise ValueError("Пустое название жеста")
+        with self._lock:
+            if name in self._labels:
+                raise ValueError(f"Жест с названием '{name}' уже существует!")
+            labels = self._labels + (name,)
+            self._write(labels)
+            self._labels = labels
+        self._notify(labels)
+        logger.info(f"Добавлен жест {len(labels) - 1}: {name}")
+        return len(labels) - 1
+
+    def _write(self, labels):
+        """Атомарная запись файла меток: читатели видят либо старый, либо новый файл целиком."""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, temp_path = tempfile.mkstemp(prefix='.labels-', suffix='.tmp', dir=directory)
+        try:
+            # права доступа прежнего файла (mkstemp создает файл только для владельца)
+            if os.path.exists(self.path):
+                os.chmod(temp_path, os.stat(self.path).st_mode & 0o777)
+            with os.fdopen(fd, 'w', encoding='utf-8-sig') as f:
+                for label in labels:
+                    f.write(label + '\n')
+            os.replace(temp_path, self.path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+        self._stamp = self._file_stamp()
+
+    def _notify(self, labels):
+        with self._lock:
+            listeners = list(self._listeners)
+        for callback in listeners:
+            try:
+                callback(labels)
+            except Exception as e:
+                logger.error(f"Ошибка обработчика изменения жестов: {e}")
@@ -1,7 +1,12 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 import numpy as np
-import tensorflow as tf
+
+BACKEND_TFLITE = 'tflite'
+BACKEND_NUMPY = 'numpy'
+
+# индекс "неизвестного" жеста: уверенность ниже порога класса
+UNKNOWN_CLASS = -1
 
 
 class KeyPointClassifier(object):
@@ -9,28 +14,135 @@ class KeyPointClassifier(object):
         self,
         model_path='model/keypoint_classifier/keypoint_classifier.tflite',
         num_threads=1,
+        backend=BACKEND_TFLITE,
+        confidence_threshold=0.0,
+        class_thresholds=None,
     ):
+        """
+        Args:
+            model_path: путь к модели (.tflite; для backend='numpy' также .keras или .npz)
+            num_threads: число потоков интерпретатора TFLite
+            backend: 'tflite' - tf.lite.Interpreter, 'numpy' - инференс на NumPy без TensorFlow
+            confidence_threshold: минимальная вероятность жеста, ниже - UNKNOWN_CLASS
+            class_thresholds: пороги для отдельных классов {индекс класса: порог}
+        """
+        self.backend = backend
+        self.interpreter = None
+        self.mlp = None
+
+        if backend == BACKEND_NUMPY:
+            from model.keypoint_classifier.numpy_backend import NumpyMLP
+            self.mlp = NumpyMLP.from_file(model_path)
+            self.num_classes = self.mlp.layers[-1][0].shape[1]
+            self.set_confidence_thresholds(confidence_threshold, class_thresholds)
+            return
+        if backend != BACKEND_TFLITE:
+            raise ValueError(f"Неизвестный backend классификатора: {backend}")
+
+        import tensorflow as tf
         self.interpreter = tf.lite.Interpreter(model_path=model_path,
                                                num_threads=num_threads)
 
         self.interpreter.allocate_tensors()
         self.input_details = self.interpreter.get_input_details()
         self.output_details = self.interpreter.get_output_details()
+        self.batch_size = self.input_details[0]['shape'][0]
+        self.num_classes = int(self.output_details[0]['shape'][-1])
+        self.set_confidence_thresholds(confidence_threshold, class_thresholds)
+
+    def set_confidence_thresholds(self, confidence_threshold=0.0, class_thresholds=None):
+        """
+        Установка порогов уверенности.
+
+        Args:
+            confidence_threshold: порог по умолчанию для всех классов
+            class_thresholds: пороги для отдельных классов {индекс класса: порог}
+        """
+        thresholds = np.full(self.num_classes, confidence_threshold, dtype=np.float32)
+        for class_id, threshold in (class_thresholds or {}).items():
+            if 0 <= class_id < self.num_classes:
+                thresholds[class_id] = threshold
+        self.thresholds = thresholds
 
     def __call__(
         self,
         landmark_list,
     ):
+        class_ids, _ = self.classify_batch(
+            np.asarray(landmark_list, dtype=np.float32).reshape(1, -1))
+
+        return class_ids[0]
+
+    def predict_proba(
+        self,
+        landmark_list,
+    ):
+        """Вероятности классов для одного вектора ключевых точек."""
+        _, probabilities = self.classify_batch(
+            np.asarray(landmark_list, dtype=np.float32).reshape(1, -1))
+
+        return probabilities[0]
+
+    @staticmethod
+    def top_k(probabilities, k=3):
+        """
+        Наиболее вероятные классы.
+
+        Returns:
+            list: [(индекс класса, вероятность)] по убыванию вероятности
+        """
+        k = min(k, len(probabilities))
+        indices = np.argpartition(probabilities, -k)[-k:]
+        indices = indices[np.argsort(probabilities[indices])[::-1]]
+        return [(int(index), float(probabilities[index])) for index in indices]
+
+    def classify_batch(
+        self,
+        landmark_batch,
+    ):
+        """
+        Классификация нескольких векторов ключевых точек за один вызов.
+
+        Args:
+            landmark_batch: массив формы (N, 42)
+
+        Returns:
+            tuple: (индексы классов формы (N,), вероятности формы (N, число классов)).
+                   Если вероятность лучшего класса ниже его порога, индекс - UNKNOWN_CLASS.
+        """
+        landmark_batch = np.ascontiguousarray(landmark_batch, dtype=np.float32)
+
+        if self.mlp is not None:
+            probabilities = self.mlp.predict(landmark_batch)
+            return self._gate(probabilities), probabilities
+
+        self._resize_input(landmark_batch.shape[0])
+
         input_details_tensor_index = self.input_details[0]['index']
-        self.interpreter.set_tensor(
-            input_details_tensor_index,
-            np.array([landmark_list], dtype=np.float32))
+        self.interpreter.set_tensor(input_details_tensor_index, landmark_batch)
         self.interpreter.invoke()
 
         output_details_tensor_index = self.output_details[0]['index']
 
-        result = self.interpreter.get_tensor(output_details_tensor_index)
+        probabilities = self.interpreter.get_tensor(output_details_tensor_index)
+
+        return self._gate(probabilities), probabilities
+
+    def _gate(self, probabilities):
+        """argmax с заменой неуверенных результатов на UNKNOWN_CLASS."""
+        class_ids = np.argmax(probabilities, axis=1)
+        confidence = probabilities[np.arange(len(class_ids)), class_ids]
+        return np.where(confidence >= self.thresholds[class_ids], class_ids, UNKNOWN_CLASS)
 
-        result_index = np.argmax(np.squeeze(result))
+    def _resize_input(self, batch_size):
+        """Изменение размера входного тензора (только при смене размера пакета)."""
+        if batch_size == self.batch_size:
+            return
 
-        return result_index
+        self.interpreter.resize_tensor_input(
+            self.input_details[0]['index'],
+            [batch_size, self.input_details[0]['shape'][1]])
+        self.interpreter.allocate_tensors()
+        self.input_details = self.interpreter.get_input_details()
+        self.output_details = self.interpreter.get_output_details()
+        self.batch_size = batch_size
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import logging
+import os
+import threading
+
+from model.keypoint_classifier.keypoint_classifier import KeyPointClassifier, BACKEND_TFLITE
+
+logger = logging.getLogger('ModelManager')
+
+
+class ModelManager(object):
+    """
+    Горячая перезагрузка классификатора и меток.
+
+    Фоновый поток опрашивает время изменения файла модели; после изменения
+    (и паузы в один период опроса, чтобы файл дописался) новый классификатор
+    собирается в этом же потоке. Потребитель забирает готовую модель методом
+    take() между кадрами, поэтому распознавание не ждет загрузки. Метки
+    перечитываются общим GestureRegistry, который сам уведомляет подписчиков.
+    """
+
+    def __init__(self, model_path, registry=None, backend=BACKEND_TFLITE, num_threads=1, poll_interval=1.0):
+        self.model_path = model_path
+        self.registry = registry
+        self.backend = backend
+        self.num_threads = num_threads
+        self.poll_interval = poll_interval
+
+        self.reloads = 0
+        self.error = None  # ошибка последней загрузки
+
+        # модель на момент создания считается уже загруженной потребителем
+        self._loaded_stamp = self._stamp()
+        self._candidate_stamp = None
+        self._pending = None
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop_event = threading.Event()
+
+    def _stamp(self):
+        """Время изменения и размер файла модели (None, если файла нет)."""
+        try:
+            stat = os.stat(self.model_path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def start(self):
+        """Запуск фонового опроса файлов"""
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="model-manager", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=1.0):
+        """Остановка фонового опроса"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop_event.wait(self.poll_interval):
+            if self.registry is not None:
+                try:
+                    self.registry.reload_if_changed()
+                except OSError as e:
+                    logger.error(f"Не удалось перечитать метки {self.registry.path}: {e}")
+            self.check()
+
+    def check(self):
+        """
+        Однократная проверка файла модели и, если он изменился и больше не меняется, загрузка.
+
+        Returns: bool - собрана ли новая модель.
+        """
+        stamp = self._stamp()
+        if stamp == self._loaded_stamp or stamp is None:
+            self._candidate_stamp = None
+            return False
+        if stamp != self._candidate_stamp:
+            # файл мог быть записан не полностью: ждем следующего опроса
+            self._candidate_stamp = stamp
+            return False
+
+        self._loaded_stamp = stamp
+        self._candidate_stamp = None
+        try:
+            classifier = KeyPointClassifier(model_path=self.model_path, num_threads=self.num_threads,
+                                            backend=self.backend)
+        except Exception as e:
+            # прежняя модель остается; повтор - после следующего изменения файла
+            self.error = e
+            logger.error(f"Не удалось загрузить модель {self.model_path}: {e}")
+            return False
+
+        self.error = None
+        with self._lock:
+            self._pending = classifier
+        self.reloads += 1
+        logger.info(f"Модель перезагружена: {self.model_path} ({classifier.num_classes} классов)")
+        return True
+
+    def take(self):
+        """Готовый новый классификатор или None. Не блокирует."""
+        if self._pending is None:
+            return None
+        with self._lock:
+            pending, self._pending = self._pending, None
+        return pending
@@ -0,0 +1,272 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Инференс полносвязной сети классификатора ключевых точек на чистом NumPy.
+
+Веса загружаются из .tflite (собственный разбор flatbuffer без TensorFlow),
+.keras (нужен h5py) или экспортированного .npz.
+"""
+import json
+import os
+import struct
+import sys
+import zipfile
+
+import numpy as np
+
+
+def _relu(x):
+    np.maximum(x, 0, out=x)
+    return x
+
+
+def _softmax(x):
+    x -= x.max(axis=1, keepdims=True)
+    np.exp(x, out=x)
+    x /= x.sum(axis=1, keepdims=True)
+    return x
+
+
+def _linear(x):
+    return x
+
+
+ACTIVATIONS = {
+    'relu': _relu,
+    'softmax': _softmax,
+    'linear': _linear,
+}
+
+
+class NumpyMLP(object):
+    def __init__(self, layers):
+        """
+        Args:
+            layers: список (kernel формы (in, out), bias формы (out,), имя активации)
+        """
+        self.layers = []
+        for kernel, bias, activation in layers:
+            if activation not in ACTIVATIONS:
+                raise ValueError(f"Неподдерживаемая активация: {activation}")
+            self.layers.append((
+                np.ascontiguousarray(kernel, dtype=np.float32),
+                np.ascontiguousarray(bias, dtype=np.float32),
+                activation,
+            ))
+        self._activations = [ACTIVATIONS[activation] for _, _, activation in self.layers]
+
+    @property
+    def input_size(self):
+        return self.layers[0][0].shape[0]
+
+    @property
+    def num_classes(self):
+        return self.layers[-1][0].shape[1]
+
+    def predict(self, landmark_batch):
+        """Вероятности классов для массива формы (N, 42)."""
+        x = np.asarray(landmark_batch, dtype=np.float32)
+        for (kernel, bias, _), activation in zip(self.layers, self._activations):
+            x = x @ kernel
+            x += bias
+            x = activation(x)
+        return x
+
+    @classmethod
+    def from_file(cls, path):
+        """Загрузка весов по расширению файла (.npz, .keras, .tflite)."""
+        ext = os.path.splitext(path)[1].lower()
+        if ext == '.npz':
+            return cls(load_npz(path))
+        if ext == '.keras':
+            return cls(load_keras(path))
+        if ext == '.tflite':
+            return cls(load_tflite(path))
+        raise ValueError(f"Неизвестный формат модели: {path}")
+
+    def save_npz(self, path):
+        """Экспорт весов в .npz."""
+        arrays = {}
+        for index, (kernel, bias, _) in enumerate(self.layers):
+            arrays[f'kernel_{index}'] = kernel
+            arrays[f'bias_{index}'] = bias
+        arrays['activations'] = np.array([activation for _, _, activation in self.layers])
+        np.savez(path, **arrays)
+
+
+def load_npz(path):
+    """Загрузка слоев из .npz, сохраненного NumpyMLP.save_npz."""
+    with np.load(path) as data:
+        activations = [str(activation) for activation in data['activations']]
+        return [
+            (data[f'kernel_{index}'], data[f'bias_{index}'], activation)
+            for index, activation in enumerate(activations)
+        ]
+
+
+def load_keras(path):
+    """Загрузка слоев Dense из .keras (формат Keras 3: config.json + model.weights.h5)."""
+    try:
+        import h5py
+    except ImportError as e:
+        raise ImportError(f"Для загрузки .keras без TensorFlow нужен h5py: {e}")
+    import io
+
+    with zipfile.ZipFile(path) as archive:
+        config = json.loads(archive.read('config.json'))
+        weights = io.BytesIO(archive.read('model.weights.h5'))
+
+    layers = []
+    with h5py.File(weights, 'r') as f:
+        for layer in config['config']['layers']:
+            if layer['class_name'] != 'Dense':
+                # Input и Dropout на инференс не влияют
+                continue
+            layer_config = layer['config']
+            variables = f['layers'][layer_config['name']]['vars']
+            kernel = variables['0'][()]
+            bias = variables['1'][()] if layer_config.get('use_bias', True) \
+                else np.zeros(kernel.shape[1], dtype=np.float32)
+            layers.append((kernel, bias, layer_config.get('activation', 'linear')))
+    return layers
+
+
+# --- минимальный разбор TFLite flatbuffer ---
+
+_TFLITE_FULLY_CONNECTED = 9
+_TFLITE_RELU = 19
+_TFLITE_SOFTMAX = 25
+
+_TFLITE_TENSOR_TYPES = {
+    0: np.float32,
+    9: np.int8,
+}
+
+_TFLITE_FUSED_ACTIVATIONS = {
+    0: 'linear',
+    1: 'relu',
+}
+
+
+class _FlatTable(object):
+    """Таблица flatbuffer: доступ к полям по номеру в схеме."""
+
+    def __init__(self, buf, pos):
+        self.buf = buf
+        self.pos = pos
+        vtable = pos - struct.unpack_from('<i', buf, pos)[0]
+        vtable_size = struct.unpack_from('<H', buf, vtable)[0]
+        self._field_count = (vtable_size - 4) // 2
+        self._vtable = vtable
+
+    def _offset(self, field):
+        if field >= self._field_count:
+            return 0
+        return struct.unpack_from('<H', self.buf, self._vtable + 4 + 2 * field)[0]
+
+    def scalar(self, field, fmt, default=0):
+        offset = self._offset(field)
+        if not offset:
+            return default
+        return struct.unpack_from('<' + fmt, self.buf, self.pos + offset)[0]
+
+    def _indirect(self, field):
+        offset = self._offset(field)
+        if not offset:
+            return None
+        pos = self.pos + offset
+        return pos + struct.unpack_from('<I', self.buf, pos)[0]
+
+    def table(self, field):
+        pos = self._indirect(field)
+        return None if pos is None else _FlatTable(self.buf, pos)
+
+    def vector(self, field, dtype):
+        pos = self._indirect(field)
+        if pos is None:
+            return np.empty(0, dtype=dtype)
+        length = struct.unpack_from('<I', self.buf, pos)[0]
+        return np.frombuffer(self.buf, dtype=dtype, count=length, offset=pos + 4)
+
+    def tables(self, field):
+        pos = self._indirect(field)
+        if pos is None:
+            return []
+        length = struct.unpack_from('<I', self.buf, pos)[0]
+        result = []
+        for index in range(length):
+            element = pos + 4 + 4 * index
+            result.append(_FlatTable(self.buf, element + struct.unpack_from('<I', self.buf, element)[0]))
+        return result
+
+
+def _tflite_constant(model_buffers, tensor):
+    """Значение константного тензора (веса или смещения) в float32."""
+    dtype = _TFLITE_TENSOR_TYPES.get(tensor.scalar(1, 'b'))
+    if dtype is None:
+        raise ValueError(f"Неподдерживаемый тип тензора TFLite: {tensor.scalar(1, 'b')}")
+
+    shape = tuple(tensor.vector(0, np.int32))
+    data = model_buffers[tensor.scalar(2, 'I')].vector(0, np.uint8)
+    value = np.frombuffer(data.tobytes(), dtype=dtype).reshape(shape)
+
+    if dtype == np.int8:
+        # деквантизация весов (Optimize.DEFAULT), масштаб по выходным каналам
+        quantization = tensor.table(4)
+        scale = quantization.vector(2, np.float32)
+        zero_point = quantization.vector(3, np.int64)
+        axis = quantization.scalar(6, 'i')
+        broadcast = [1] * value.ndim
+        broadcast[axis] = -1
+        value = (value.astype(np.float32) - zero_point.reshape(broadcast)) * scale.reshape(broadcast)
+
+    return value.astype(np.float32)
+
+
+def load_tflite(path):
+    """Загрузка слоев FULLY_CONNECTED (+ SOFTMAX) из .tflite без TensorFlow."""
+    with open(path, 'rb') as f:
+        buf = f.read()
+
+    model = _FlatTable(buf, struct.unpack_from('<I', buf, 0)[0])
+    opcodes = [
+        max(code.scalar(0, 'b'), code.scalar(3, 'i'))
+        for code in model.tables(1)
+    ]
+    buffers = model.tables(4)
+    subgraph = model.tables(2)[0]
+    tensors = subgraph.tables(0)
+
+    layers = []
+    for operator in subgraph.tables(3):
+        opcode = opcodes[operator.scalar(0, 'I')]
+        inputs = operator.vector(1, np.int32)
+
+        if opcode == _TFLITE_FULLY_CONNECTED:
+            kernel = _tflite_constant(buffers, tensors[inputs[1]]).T
+            if len(inputs) > 2 and inputs[2] >= 0:
+                bias = _tflite_constant(buffers, tensors[inputs[2]])
+            else:
+                bias = np.zeros(kernel.shape[1], dtype=np.float32)
+            options = operator.table(4)
+            fused = options.scalar(0, 'b') if options is not None else 0
+            if fused not in _TFLITE_FUSED_ACTIVATIONS:
+                raise ValueError(f"Неподдерживаемая активация TFLite: {fused}")
+            layers.append((kernel, bias, _TFLITE_FUSED_ACTIVATIONS[fused]))
+        elif opcode in (_TFLITE_SOFTMAX, _TFLITE_RELU) and layers and layers[-1][2] == 'linear':
+            kernel, bias, _ = layers[-1]
+            activation = 'softmax' if opcode == _TFLITE_SOFTMAX else 'relu'
+            layers[-1] = (kernel, bias, activation)
+        else:
+            raise ValueError(f"Неподдерживаемая операция TFLite: {opcode}")
+
+    return layers
+
+
+if __name__ == "__main__":
+    # экспорт весов: python -m model.keypoint_classifier.numpy_backend <model.tflite|.keras> <out.npz>
+    if len(sys.argv) != 3:
+        print("Использование: numpy_backend.py <model.tflite|model.keras> <out.npz>")
+        sys.exit(1)
+    NumpyMLP.from_file(sys.argv[1]).save_npz(sys.argv[2])
+    print(f"Веса сохранены в {sys.argv[2]}")
@@ -0,0 +1,252 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Обучение классификатора ключевых точек (замена ноутбука keypoint_classification_EN.ipynb).
+
+Читает двоичный набор данных (или keypoint.csv), обучает полносвязную сеть
+42 -> 20 -> 10 -> N и экспортирует .keras, .tflite и .npz (для backend='numpy').
+С --warm-start обучение начинается с весов текущей модели: при добавлении
+примеров или нового жеста (новый выход инициализируется заново) хватает
+нескольких десятков эпох вместо полного обучения.
+
+Запуск из корня репозитория:
+    python -m model.keypoint_classifier.train
+    python -m model.keypoint_classifier.train --warm-start
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+from model.keypoint_classifier.dataset import DEFAULT_DIRECTORY, KeypointDataset, NUM_FEATURES
+from model.keypoint_classifier.gesture_registry import LABELS_PATH, GestureRegistry
+
+MODEL_DIR = 'model/keypoint_classifier'
+KERAS_PATH = os.path.join(MODEL_DIR, 'keypoint_classifier.keras')
+TFLITE_PATH = os.path.join(MODEL_DIR, 'keypoint_classifier.tflite')
+NPZ_PATH = os.path.join(MODEL_DIR, 'keypoint_classifier.npz')
+
+RANDOM_SEED = 42
+TRAIN_SIZE = 0.75
+HIDDEN_UNITS = (20, 10)
+DROPOUT = (0.2, 0.4)
+
+# полное обучение и дообучение с текущих весов: (эпох максимум, терпение ранней остановки)
+FULL_SCHEDULE = (1000, 20)
+WARM_SCHEDULE = (200, 10)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Обучение классификатора жестов по ключевым точкам')
+
+    parser.add_argument('--dataset', default=DEFAULT_DIRECTORY,
+                        help='Папка двоичного набора данных (по умолчанию: %(default)s)')
+    parser.add_argument('--csv', help='Обучать на keypoint.csv вместо двоичного набора данных')
+    parser.add_argument('--labels', default=LABELS_PATH, help='Файл меток жестов')
+
+    parser.add_argument('--warm-start', action='store_true',
+                        help='Начать с весов текущей модели (быстрое дообучение)')
+    parser.add_argument('--init-model', default=KERAS_PATH,
+                        help='Модель для --warm-start (.keras, .tflite или .npz)')
+
+    parser.add_argument('--epochs', type=int, default=None, help='Максимум эпох')
+    parser.add_argument('--patience', type=int, default=None, help='Терпение ранней остановки')
+    parser.add_argument('--batch-size', type=int, default=128)
+    parser.add_argument('--seed', type=int, default=RANDOM_SEED)
+
+    parser.add_argument('--keras', default=KERAS_PATH, help='Куда сохранить .keras')
+    parser.add_argument('--tflite', default=TFLITE_PATH, help='Куда сохранить .tflite')
+    parser.add_argument('--npz', default=NPZ_PATH, help='Куда сохранить .npz для backend=numpy')
+    parser.add_argument('--no-tflite', action='store_true', help='Не конвертировать в .tflite')
+    return parser.parse_args()
+
+
+def load_training_data(dataset_dir=DEFAULT_DIRECTORY, csv_path=None):
+    """Признаки (N, 42) float32 и метки (N,) int32."""
+    if csv_path:
+        data = np.loadtxt(csv_path, delimiter=',', dtype=np.float32, ndmin=2)
+        return data[:, 1:], data[:, 0].astype(np.int32)
+    features, labels = KeypointDataset(dataset_dir).load()
+    # обучению нужны массивы в памяти: mmap читается один раз
+    return np.array(features), np.array(labels)
+
+
+def train_test_split(features, labels, train_size=TRAIN_SIZE, seed=RANDOM_SEED):
+    """Случайное разбиение с сохранением долей классов."""
+    rng = np.random.default_rng(seed)
+    train_index, test_index = [], []
+    for class_id in np.unique(labels):
+        index = rng.permutation(np.flatnonzero(labels == class_id))
+        # хотя бы один пример класса всегда попадает в обучение
+        split = max(1, int(round(len(index) * train_size)))
+        train_index.append(index[:split])
+        test_index.append(index[split:])
+    train_index = rng.permutation(np.concatenate(train_index))
+    test_index = np.concatenate(test_index)
+    return features[train_index], features[test_index], labels[train_index], labels[test_index]
+
+
+def build_model(num_classes):
+    """Сеть 42 -> 20 -> 10 -> num_classes, как в ноутбуке."""
+    import tensorflow as tf
+
+    return tf.keras.models.Sequential([
+        tf.keras.layers.Input((NUM_FEATURES, )),
+        tf.keras.layers.Dropout(DROPOUT[0]),
+        tf.keras.layers.Dense(HIDDEN_UNITS[0], activation='relu'),
+        tf.keras.layers.Dropout(DROPOUT[1]),
+        tf.keras.layers.Dense(HIDDEN_UNITS[1], activation='relu'),
+        tf.keras.layers.Dense(num_classes, activation='softmax')
+    ])
+
+
+def dense_layers(model):
+    import tensorflow as tf
+    return [layer for layer in model.layers if isinstance(layer, tf.keras.layers.Dense)]
+
+
+def warm_start(model, init_path):
+    """
+    Перенос весов текущей модели.
+
+    Скрытые слои копируются целиком, выходной - по общим классам; выходы новых
+    жестов остаются со случайной инициализацией. Returns: bool - перенесены ли веса.
+    """
+    from model.keypoint_classifier.numpy_backend import NumpyMLP
+
+    previous = NumpyMLP.from_file(init_path).layers
+    layers = dense_layers(model)
+    if len(previous) != len(layers) or any(
+            kernel.shape != layer.kernel.shape
+            for (kernel, _, _), layer in zip(previous[:-1], layers[:-1])):
+        print(f"Архитектура {init_path} не совпадает, обучение с нуля")
+        return False
+
+    for (kernel, bias, _), layer in zip(previous[:-1], layers[:-1]):
+        layer.set_weights([kernel, bias])
+
+    old_kernel, old_bias, _ = previous[-1]
+    kernel, bias = layers[-1].get_weights()
+    common = min(old_kernel.shape[1], kernel.shape[1])
+    kernel[:, :common] = old_kernel[:, :common]
+    bias[:common] = old_bias[:common]
+    layers[-1].set_weights([kernel, bias])
+    return True
+
+
+def _replace(write, path):
+    """Запись во временный файл и атомарная замена (работающее приложение не увидит полузаписанную модель)."""
+    root, ext = os.path.splitext(path)
+    temp_path = f"{root}.tmp{ext}"
+    write(temp_path)
+    os.replace(temp_path, path)
+
+
+def export_model(model, keras_path=KERAS_PATH, tflite_path=TFLITE_PATH, npz_path=NPZ_PATH):
+    """Сохранение .keras, .tflite (с квантованием, как в ноутбуке) и .npz."""
+    import tensorflow as tf
+    from model.keypoint_classifier.numpy_backend import NumpyMLP
+
+    if keras_path:
+        _replace(model.save, keras_path)
+
+    if npz_path:
+        mlp = NumpyMLP([(*layer.get_weights(), layer.get_config()['activation'])
+                        for layer in dense_layers(model)])
+        _replace(mlp.save_npz, npz_path)
+
+    if tflite_path:
+        converter = tf.lite.TFLiteConverter.from_keras_model(model)
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        tflite_model = converter.convert()
+
+        def write_tflite(path):
+            with open(path, 'wb') as f:
+                f.write(tflite_model)
+        _replace(write_tflite, tflite_path)
+
+
+def train(features, labels, num_classes, init_path=None, epochs=None, patience=None,
+          batch_size=128, seed=RANDOM_SEED):
+    """
+    Обучение модели.
+
+    Args:
+        init_path: модель для дообучения (None - обучение с нуля)
+
+    Returns:
+        tuple: (модель Keras, словарь метрик)
+    """
+    import tensorflow as tf
+
+    if len(labels) == 0:
+        raise ValueError("Набор данных пуст")
+    if labels.min() < 0 or labels.max() >= num_classes:
+        raise ValueError(f"Номера жестов в данных вне диапазона 0-{num_classes - 1}")
+
+    tf.keras.utils.set_random_seed(seed)
+    x_train, x_test, y_train, y_test = train_test_split(features, labels, seed=seed)
+
+    model = build_model(num_classes)
+    warm = init_path is not None and os.path.exists(init_path) and warm_start(model, init_path)
+    default_epochs, default_patience = WARM_SCHEDULE if warm else FULL_SCHEDULE
+
+    model.compile(
+        optimizer='adam',
+        loss='sparse_categorical_crossentropy',
+        metrics=['accuracy']
+    )
+
+    # без отложенной выборки (очень мало данных) ранняя остановка идет по обучающей
+    validation = (x_test, y_test) if len(x_test) else None
+    monitor = 'val_loss' if validation else 'loss'
+    es_callback = tf.keras.callbacks.EarlyStopping(
+        monitor=monitor, patience=patience or default_patience, restore_best_weights=True, verbose=1)
+
+    start = time.perf_counter()
+    history = model.fit(
+        x_train,
+        y_train,
+        epochs=epochs or default_epochs,
+        batch_size=batch_size,
+        validation_data=validation,
+        callbacks=[es_callback],
+        verbose=2
+    )
+    metrics = {
+        "warm_start": warm,
+        "samples": int(len(labels)),
+        "epochs": len(history.history['loss']),
+        "train_seconds": time.perf_counter() - start,
+    }
+    if validation:
+        metrics["val_loss"], metrics["val_accuracy"] = model.evaluate(x_test, y_test, batch_size=batch_size,
+                                                                      verbose=0)
+    return model, metrics
+
+
+def main():
+    args = parse_args()
+
+    labels_names = GestureRegistry(args.labels).labels
+    features, labels = load_training_data(args.dataset, args.csv)
+    print(f"Примеров: {len(labels)}, жестов: {len(labels_names)}")
+
+    model, metrics = train(features, labels, len(labels_names),
+                           init_path=args.init_model if args.warm_start else None,
+                           epochs=args.epochs, patience=args.patience,
+                           batch_size=args.batch_size, seed=args.seed)
+
+    export_model(model, args.keras, None if args.no_tflite else args.tflite, args.npz)
+
+    print(f"{'Дообучение' if metrics['warm_start'] else 'Обучение'}: {metrics['epochs']} эпох "
+          f"за {metrics['train_seconds']:.1f} с")
+    if "val_accuracy" in metrics:
+        print(f"Точность на отложенной выборке: {metrics['val_accuracy']:.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
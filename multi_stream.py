@@ -0,0 +1,422 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Распознавание жестов на нескольких камерах (видеопотоках) одного компьютера.
+
+Каждый поток обрабатывается в отдельном процессе со своим GestureProcessor
+(MediaPipe почти все время держит GIL, поэтому потоки внутри одного процесса
+не масштабируются). Кадры захватываются в главном процессе и передаются
+обработчикам через разделяемую память без сериализации; обратно приходят
+только компактные результаты. Результаты и метрики собираются централизованно.
+
+Захват начинается, когда обработчик потока загрузил модели. Камеры читаются
+по принципу "побеждает последний кадр", видеофайлы - последовательно, без
+пропусков, в темпе их частоты кадров (или медленнее, если обработчик не успевает).
+
+Пример:
+    python multi_stream.py --source 0 --source 1 --source video.mp4 --dry-run
+"""
+import os
+import sys
+import json
+import time
+import queue
+import argparse
+import logging
+import threading
+import multiprocessing as mp
+
+import cv2
+
+from model import BACKEND_NUMPY, BACKEND_TFLITE
+from utils import (FrameGrabber, LatencyTracker, SharedFrameRing, VideoFileReader,
+                   GESTURE_HOLD, GESTURE_ONSET)
+
+logger = logging.getLogger('MultiStream')
+
+# слотов разделяемой памяти на поток: один обрабатывается, в другой пишется следующий кадр
+FRAME_SLOTS = 2
+# поток считается закончившимся (конец видео, отключенная камера), если кадров нет столько секунд
+SOURCE_IDLE_TIMEOUT = 3.0
+
+
+def parse_args():
+    """Разбор аргументов командной строки."""
+    parser = argparse.ArgumentParser(description='Hand Gesture Recognition для нескольких камер')
+
+    parser.add_argument('--source', action='append', required=True,
+                      help='ID камеры или путь к видеофайлу (можно указать несколько раз)')
+
+    parser.add_argument('--width', type=int, default=640,
+                      help='Ширина изображения с камеры (по умолчанию: 640)')
+
+    parser.add_argument('--height', type=int, default=480,
+                      help='Высота изображения с камеры (по умолчанию: 480)')
+
+    parser.add_argument('--classifier-backend', choices=[BACKEND_TFLITE, BACKEND_NUMPY],
+                      default=BACKEND_NUMPY,
+                      help='Движок классификатора жестов (по умолчанию: numpy, без TensorFlow)')
+
+    parser.add_argument('--max-hands', type=int, default=1,
+                      help='Максимальное количество рук в каждом потоке (по умолчанию: 1)')
+
+    parser.add_argument('--dry-run', action='store_true',
+                      help='Только распознавать жесты, не выполняя действий')
+
+    parser.add_argument('--duration', type=float, default=0,
+                      help='Время работы в секундах (0 - до Ctrl+C или конца всех видео)')
+
+    parser.add_argument('--stats-interval', type=float, default=10.0,
+                      help='Период вывода статистики в секундах (0 - не выводить)')
+
+    parser.add_argument('--metrics-json',
+                      help='Сохранить итоговые метрики по потокам в JSON')
+
+    return parser.parse_args()
+
+
+def parse_source(source):
+    """ID камеры (число) или путь к видеофайлу."""
+    return int(source) if source.isdigit() else source
+
+
+def is_video_file(source):
+    """Видеофайл (а не камера или сетевой поток)."""
+    return isinstance(source, str) and os.path.isfile(source)
+
+
+def summarize_result(data):
+    """Компактный результат кадра для передачи в главный процесс (без массивов)."""
+    summary = {
+        "hands": [(hand["handedness"], hand.get("hand_sign")) for hand in data.get("hands", ())],
+    }
+    for key in ("hand_sign", "stable_sign", "gesture_events"):
+        if key in data:
+            summary[key] = data[key]
+    return summary
+
+
+def stream_worker(stream_id, ring_spec, work_queue, free_queue, result_queue, processor_options):
+    """
+    Процесс обработки одного потока.
+
+    Получает из work_queue индексы заполненных слотов, обрабатывает кадр прямо
+    в разделяемой памяти, возвращает слот в free_queue, а результат - в result_queue.
+    """
+    # тяжелые импорты только в дочернем процессе
+    from gesture_processor import GestureProcessor, RENDER_OFF
+
+    processor = GestureProcessor(**processor_options)
+    processor.set_render_policy(RENDER_OFF)
+    ring = SharedFrameRing(**ring_spec)
+    result_queue.put((stream_id, "ready", None))
+
+    try:
+        while True:
+            item = work_queue.get()
+            if item is None:
+                break
+            slot, frame_id, captured_at = item
+
+            start = time.monotonic()
+            _, data = processor.process_image(ring[slot])
+            processed_at = time.monotonic()
+            free_queue.put(slot)
+
+            result_queue.put((stream_id, "result", {
+                "frame_id": frame_id,
+                "captured_at": captured_at,
+                "processed_at": processed_at,
+                "worker_ms": (processed_at - start) * 1000.0,
+                "data": summarize_result(data),
+            }))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        ring.close()
+
+
+class StreamHandle(object):
+    """Поток в главном процессе: захват, слоты разделяемой памяти, процесс обработки."""
+
+    def __init__(self, stream_id, source, cap, frame_shape, context, result_queue, processor_options):
+        self.stream_id = stream_id
+        self.source = source
+        self.cap = cap
+        self.ring = SharedFrameRing(frame_shape, slots=FRAME_SLOTS, create=True)
+
+        self.work_queue = context.Queue()
+        self.free_queue = context.Queue()
+        for slot in range(FRAME_SLOTS):
+            self.free_queue.put(slot)
+
+        self.process = context.Process(
+            target=stream_worker, name=f"stream-{stream_id}", daemon=True,
+            args=(stream_id, self.ring.spec(), self.work_queue, self.free_queue,
+                  result_queue, processor_options))
+
+        if is_video_file(source):
+            self.grabber = VideoFileReader(cap)
+        else:
+            self.grabber = FrameGrabber(cap)
+        self._feeder = threading.Thread(target=self._feed, name=f"feeder-{stream_id}", daemon=True)
+        self._stop_event = threading.Event()
+
+        self.sent_frames = 0
+        self.skipped_frames = 0  # кадры другого размера (не помещаются в слот)
+        self._last_grabbed = 0
+        self._last_grabbed_at = None
+
+    @property
+    def capturing(self):
+        return self._last_grabbed_at is not None
+
+    def start(self):
+        """Запуск процесса обработки; захват - после его готовности (start_capture)."""
+        self.process.start()
+
+    def start_capture(self):
+        """Запуск захвата: обработчик загрузил модели и готов принимать кадры."""
+        if self.capturing:
+            return
+        self._last_grabbed_at = time.monotonic()
+        self.grabber.start()
+        self._feeder.start()
+
+    def finished(self):
+        """Видеофайл прочитан до конца."""
+        return getattr(self.grabber, "finished", False)
+
+    def alive(self, now):
+        """Работает ли обработчик и поступают ли кадры из источника."""
+        if not self.capturing:
+            # обработчик еще загружается
+            return self.process.is_alive()
+        if self.grabber.grabbed_frames != self._last_grabbed:
+            self._last_grabbed = self.grabber.grabbed_frames
+            self._last_grabbed_at = now
+        return self.process.is_alive() and now - self._last_grabbed_at < SOURCE_IDLE_TIMEOUT
+
+    def _feed(self):
+        """Передача кадров (с камеры - самых свежих) в свободные слоты разделяемой памяти."""
+        while not self._stop_event.is_set():
+            try:
+                slot = self.free_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+            frame = None
+            while frame is None and not self._stop_event.is_set():
+                frame = self.grabber.read(timeout=0.1)
+                if frame is not None and frame.shape != self.ring.shape:
+                    self.skipped_frames += 1
+                    frame = None
+            if frame is None:
+                break
+
+            captured_at = time.monotonic()
+            # зеркальное отражение сразу при записи в слот, как в GUI
+            cv2.flip(frame, 1, dst=self.ring[slot])
+            self.sent_frames += 1
+            self.work_queue.put((slot, self.sent_frames, captured_at))
+
+    def stop(self, timeout=2.0):
+        self._stop_event.set()
+        if self._feeder.is_alive():
+            self._feeder.join(timeout)
+        self.grabber.stop()
+        self.work_queue.put(None)
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(timeout)
+        self.cap.release()
+        self.ring.close()
+
+
+class StreamStats(object):
+    """Метрики одного потока в главном процессе."""
+
+    def __init__(self):
+        self.latency = LatencyTracker(enabled=True)
+        self.frames = 0
+        self.first_result_at = None
+        self.last_result_at = None
+        self.last_gesture = None
+
+    def add(self, result):
+        now = result["processed_at"]
+        if self.first_result_at is None:
+            self.first_result_at = now
+        self.last_result_at = now
+        self.frames += 1
+        self.latency.record("worker", result["worker_ms"])
+        self.latency.record("end_to_end", (time.monotonic() - result["captured_at"]) * 1000.0)
+        self.last_gesture = result["data"].get("stable_sign")
+
+    def fps(self):
+        if self.frames < 2:
+            return 0.0
+        return (self.frames - 1) / max(self.last_result_at - self.first_result_at, 1e-6)
+
+
+class MultiStreamRunner(object):
+    """Запуск процессов обработки для нескольких потоков и сбор результатов."""
+
+    def __init__(self, sources, width=640, height=480, processor_options=None, on_result=None):
+        self.sources = sources
+        self.width = width
+        self.height = height
+        self.processor_options = processor_options or {}
+        self.on_result = on_result
+
+        # spawn: обработчики не наследуют потоки и состояние OpenCV/MediaPipe родителя
+        self._context = mp.get_context("spawn")
+        self.result_queue = self._context.Queue()
+        self.streams = []
+        self._streams_by_id = {}
+        self.stats = {}
+
+    def start(self):
+        """Открытие источников и запуск процессов. Returns: bool - запущен ли хотя бы один поток."""
+        for stream_id, source in enumerate(self.sources):
+            cap = cv2.VideoCapture(source)
+            cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
+            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+            ret, frame = cap.read() if cap.isOpened() else (False, None)
+            if not ret:
+                logger.error(f"Не удалось открыть источник {source}")
+                cap.release()
+                continue
+            if is_video_file(source):
+                # первый кадр прочитан только ради размера: файл обрабатывается с начала
+                cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+
+            stream = StreamHandle(stream_id, source, cap, frame.shape, self._context,
+                                  self.result_queue, self.processor_options)
+            self.streams.append(stream)
+            self._streams_by_id[stream_id] = stream
+            self.stats[stream_id] = StreamStats()
+
+        for stream in self.streams:
+            stream.start()
+        logger.info(f"Запущено потоков: {len(self.streams)}")
+        return bool(self.streams)
+
+    def poll(self, timeout=0.1):
+        """Обработка поступивших результатов (вызывается из главного цикла)."""
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            try:
+                stream_id, kind, payload = self.result_queue.get(timeout=max(remaining, 0.0))
+            except queue.Empty:
+                return
+            if kind == "ready":
+                logger.info(f"Поток {stream_id} ({self.sources[stream_id]}): обработчик готов, захват запущен")
+                self._streams_by_id[stream_id].start_capture()
+                continue
+            self.stats[stream_id].add(payload)
+            if self.on_result is not None:
+                self.on_result(stream_id, payload["data"])
+
+    def alive(self):
+        """Есть ли потоки, из которых еще идут кадры."""
+        now = time.monotonic()
+        return any([stream.alive(now) and not self._drained(stream) for stream in self.streams])
+
+    def _drained(self, stream):
+        """Видеофайл закончился, и все отправленные кадры обработаны."""
+        return stream.finished() and self.stats[stream.stream_id].frames >= stream.sent_frames
+
+    def metrics(self):
+        """Сводные метрики по потокам."""
+        metrics = {}
+        for stream in self.streams:
+            stats = self.stats[stream.stream_id]
+            metrics[f"{stream.stream_id}:{stream.source}"] = {
+                "frames": stats.frames,
+                "fps": stats.fps(),
+                "grabbed_frames": stream.grabber.grabbed_frames,
+                "dropped_frames": stream.grabber.dropped_frames,
+                "stable_sign": stats.last_gesture,
+                "latency": stats.latency.summary(),
+            }
+        return metrics
+
+    def log_stats(self):
+        total_fps = 0.0
+        for source, stream_metrics in self.metrics().items():
+            total_fps += stream_metrics["fps"]
+            end_to_end = stream_metrics["latency"].get("end_to_end", {})
+            logger.info(f"[{source}] {stream_metrics['fps']:.1f} к/с, кадров: {stream_metrics['frames']}, "
+                        f"пропущено при захвате: {stream_metrics['dropped_frames']}, "
+                        f"задержка p50/p95: {end_to_end.get('p50', 0):.1f}/{end_to_end.get('p95', 0):.1f} мс, "
+                        f"жест: {stream_metrics['stable_sign']}")
+        logger.info(f"Всего: {total_fps:.1f} к/с")
+
+    def stop(self):
+        for stream in self.streams:
+            stream.stop()
+
+
+def main():
+    """Основная функция многопоточного режима."""
+    args = parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    executor = None
+    actions = None
+    if not args.dry_run:
+        # pyautogui (X-сервер) нужен только при выполнении действий
+        from gesture_actions import ActionExecutor, GestureActions
+        actions = GestureActions()
+        executor = ActionExecutor(actions)
+        executor.start()
+
+    def on_result(stream_id, data):
+        for event, gesture_name in data.get("gesture_events", ()):
+            if event == GESTURE_ONSET:
+                logger.info(f"Поток {stream_id}: жест {gesture_name}")
+                if executor is not None:
+                    executor.submit(gesture_name)
+            elif event == GESTURE_HOLD and executor is not None and actions.is_repeating(gesture_name):
+                executor.submit(gesture_name)
+
+    runner = MultiStreamRunner(
+        [parse_source(source) for source in args.source], args.width, args.height,
+        processor_options={"classifier_backend": args.classifier_backend, "max_num_hands": args.max_hands},
+        on_result=on_result)
+    if not runner.start():
+        return 1
+
+    start_time = last_stats_time = time.monotonic()
+    try:
+        while True:
+            runner.poll(timeout=0.2)
+            now = time.monotonic()
+            if args.stats_interval > 0 and now - last_stats_time >= args.stats_interval:
+                runner.log_stats()
+                last_stats_time = now
+            if args.duration > 0 and now - start_time >= args.duration:
+                break
+            if not runner.alive():
+                logger.info("Все источники закончились")
+                break
+    except KeyboardInterrupt:
+        pass
+    finally:
+        runner.poll(timeout=0.0)
+        runner.log_stats()
+        if args.metrics_json:
+            with open(args.metrics_json, 'w', encoding='utf-8') as f:
+                json.dump(runner.metrics(), f, indent=4, ensure_ascii=False)
+        runner.stop()
+        if executor is not None:
+            executor.stop()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,23 +1,32 @@
+import time
+# начало отсчета для отчета о времени запуска (до тяжелых импортов)
+STARTUP_BEGIN = time.perf_counter()
+
 import sys
 import os
 import argparse
+import importlib.util
 from PyQt5.QtWidgets import QApplication, QMessageBox
+from PyQt5.QtCore import QTimer
 
-from qt_gui import MainWindow
+from qt_gui import MainWindow, StartupLoader
 from gesture_processor import GestureProcessor
 from gesture_actions import GestureActions
+from model import BACKEND_NUMPY, BACKEND_TFLITE, GestureRegistry
+from utils import StartupTimer
 
 
-def check_requirements():
-    """Проверка наличия необходимых зависимостей."""
-    try:
-        import mediapipe
-        import numpy as np
-        import tensorflow as tf
-        
-        return True
-    except ImportError as e:
-        return False, str(e)
+def check_requirements(classifier_backend=BACKEND_TFLITE):
+    """Проверка наличия необходимых зависимостей (без их импорта)."""
+    required = ['mediapipe', 'numpy']
+    # TensorFlow нужен только для классификатора на tflite
+    if classifier_backend == BACKEND_TFLITE:
+        required.append('tensorflow')
+    
+    for name in required:
+        if importlib.util.find_spec(name) is None:
+            return False, name
+    return True
 
 
 def parse_args():
@@ -36,6 +45,10 @@ def parse_args():
     parser.add_argument('--height', type=int, default=480,
                       help='Высота изображения с камеры (по умолчанию: 480)')
     
+    parser.add_argument('--classifier-backend', choices=[BACKEND_TFLITE, BACKEND_NUMPY],
+                      default=BACKEND_TFLITE,
+                      help='Движок классификатора жестов: tflite (TensorFlow) или numpy (без TensorFlow)')
+    
     return parser.parse_args()
 
 
@@ -43,9 +56,11 @@ def main():
     """Основная функция приложения."""
     # разбор аргументов командной строки
     args = parse_args()
+    timer = StartupTimer(STARTUP_BEGIN)
+    timer.mark("imports")
     
     # проверка требований
-    requirements_met = check_requirements()
+    requirements_met = check_requirements(args.classifier_backend)
     if requirements_met is not True:
         _, missing_lib = requirements_met
         print(f"Ошибка: отсутствует библиотека {missing_lib}")
@@ -65,25 +80,33 @@ def main():
     if missing_files:
         QMessageBox.critical(None, "Ошибка", 
                           f"Отсутствуют необходимые файлы моделей:\n{', '.join(missing_files)}\n\n"
-                          "Запустите сначала обучение моделей с помощью ноутбука KeyPoint.")
+                          "Запустите сначала обучение: python -m model.keypoint_classifier.train")
         return 1
     
-    # создание основного окна
-    main_window = MainWindow()
+    # общий список жестов для окна и обработчика (файл меток читается один раз)
+    registry = GestureRegistry()
     
-    # инициализация обработчика жестов
-    processor = GestureProcessor()
+    # создание основного окна
+    main_window = MainWindow(registry)
     
-    # увтановка обработчика для видеопотока
-    main_window.video_thread.set_processor(processor)
+    # установка параметров камеры из аргументов командной строки
+    main_window.camera_id = args.camera
+    main_window.camera_width = args.width
+    main_window.camera_height = args.height
     
     # обработчик изменения режима
     def on_mode_change(index):
+        processor = main_window.video_thread.processor
+        if processor is None:
+            return
         processor.set_mode(index)
         main_window.log_event(f"Режим изменен на: {index}")
     
     # Обработчик для клавиш (0-9)
     def on_key_press(key):
+        processor = main_window.video_thread.processor
+        if processor is None:
+            return
         if 48 <= key <= 57:  # 0-9
             number = key - 48
             processor.set_number(number)
@@ -99,18 +122,36 @@ def main():
     
     # подключение обработчиков
     main_window.camera_selector.currentIndexChanged.connect(on_mode_change)
-    
-    # установка параметров камеры из аргументов командной строки
-    main_window.camera_id = args.camera
-    main_window.camera_width = args.width
-    main_window.camera_height = args.height
-    
-    # если выбрана камера отличная от 0, выбираем её в интерфейсе
-    if args.camera != 0 and args.camera < main_window.camera_selector.count():
-        main_window.camera_selector.setCurrentIndex(args.camera)
+    timer.mark("window_created")
+    
+    # модели загружаются и камеры перебираются в фоне, окно показывается сразу
+    # модель перезагружается при изменении файлов (после дообучения) без перезапуска
+    loader = StartupLoader(lambda: GestureProcessor(classifier_backend=args.classifier_backend,
+                                                    watch_model=True, registry=registry),
+                           timer, parent=main_window)
+    loader.progress.connect(main_window.show_startup_progress)
+    loader.processor_ready.connect(main_window.set_processor)
+    loader.cameras_ready.connect(main_window.add_cameras)
+    
+    def on_processor_failed(error):
+        main_window.startup_failed(error)
+        QMessageBox.critical(main_window, "Ошибка", f"Не удалось загрузить модели распознавания:\n{error}")
+    
+    def on_startup_finished():
+        timer.mark("startup_finished")
+        report = timer.report()
+        print(report)
+        main_window.finish_startup(report)
+    
+    loader.processor_failed.connect(on_processor_failed)
+    main_window.models_retry_requested.connect(loader.retry_processor)
+    loader.finished.connect(on_startup_finished)
     
     # показ окна
     main_window.show()
+    # отметка ставится при первой итерации цикла событий, после отрисовки окна
+    QTimer.singleShot(0, lambda: timer.mark("first_paint"))
+    loader.start()
     
     # запуск основного цикла приложения
     return app.exec_()
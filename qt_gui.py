@@ -1,17 +1,20 @@
 import sys
-import os
+import threading
 import cv2
 import numpy as np
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
                            QLabel, QPushButton, QComboBox, QGroupBox, QGridLayout, 
                            QTabWidget, QListWidget, QListWidgetItem, QTableWidget, 
                            QTableWidgetItem, QCheckBox, QSlider, QMessageBox,
-                           QDoubleSpinBox, QStyle, QStyleFactory, QDialog, QHeaderView,
-                           QLineEdit)
+                           QSpinBox, QDoubleSpinBox, QStyle, QStyleFactory, QDialog, QHeaderView,
+                           QLineEdit, QFileDialog, QProgressBar)
 from PyQt5.QtGui import QImage, QPixmap, QColor, QFont, QPalette
-from PyQt5.QtCore import Qt, QTimer, pyqtSignal, QSize, QTime
+from PyQt5.QtCore import Qt, QEvent, QObject, QTimer, pyqtSignal, QSize, QTime
 
-from gesture_actions import GestureActions
+from gesture_actions import ActionExecutor, GestureActions, describe_action
+from gesture_processor import RENDER_FULL, RENDER_MINIMAL, RENDER_OFF
+from model import GestureRegistry
+from utils import DropQueue, FrameGrabber, LatencyTracker, PipelineStage, GESTURE_HOLD, GESTURE_ONSET
 
 # определение цветовой схемы и стилей
 STYLE = """
@@ -103,13 +106,28 @@ QSpinBox, QDoubleSpinBox {
 }
 """
 
-class VideoThread(QTimer):
-    """Класс для обработки видеопотока"""
-    processed_ready = pyqtSignal(np.ndarray, dict)
+class VideoThread(QObject):
+    """
+    Конвейер обработки видеопотока.
+
+    Работает вне потока GUI и состоит из трех стадий, устаревшие кадры между
+    которыми отбрасываются:
+        захват (FrameGrabber) -> распознавание (process_image) -> подготовка QImage и отправка в GUI
+
+    События временного фильтра и перезагрузки модели отправляются отдельным
+    сигналом events_ready прямо из стадии распознавания: в отличие от кадров
+    они не отбрасываются.
+    """
+    processed_ready = pyqtSignal(QImage, dict)
+    # {"gesture_events": [...], "model_reloaded": bool, "index_finger_tip": (x, y)}
+    events_ready = pyqtSignal(dict)
+    # стадия конвейера остановлена из-за повторяющихся ошибок: описание ошибки
+    pipeline_failed = pyqtSignal(str)
     
     def __init__(self, parent=None):
         super().__init__(parent)
         self.cap = None
+        self.grabber = None
         self.camera_id = 0
         self.is_running = False
         self.width = 640
@@ -119,13 +137,38 @@ class VideoThread(QTimer):
         self.use_static_image_mode = False
         self.min_detection_confidence = 0.7
         self.min_tracking_confidence = 0.5
+        # минимальная уверенность классификатора (None - значение обработчика)
+        self.min_classifier_confidence = None
+        # максимальное количество рук (None - значение обработчика)
+        self.max_num_hands = None
+        # режим ROI обработчика
+        self.roi_mode = False
+        # целевая частота адаптивного режима (0 - выключен)
+        self.target_fps = 0
         
         # обработчик жестов (будет установлен позже)
         self.processor = None
-        
-        # Запуск таймера
-        self.timeout.connect(self.update_frame)
-        self.setInterval(30)  # 30 мс - где-то 30 фпс
+        # общие замеры задержек для всех стадий конвейера
+        self.latency = LatencyTracker()
+        # блокировка обработчика: распознавание идет в отдельном потоке
+        self._processor_lock = threading.Lock()
+        
+        # очередь между распознаванием и отрисовкой (хранит только самый свежий результат)
+        self._result_queue = DropQueue(maxsize=1)
+        self._stages = []
+        
+        # кадр отправлен в GUI, но еще не отрисован
+        self._frame_pending = threading.Event()
+        # если окно не видно, в GUI отправляются только данные распознавания
+        self.display_enabled = True
+        self.dropped_frames = 0
+        self.processed_ready.connect(self._frame_delivered)
+        
+        # переиспользуемые буферы кадров (без выделения памяти на каждый кадр)
+        self._flip_buffer = None
+        self._display_buffers = None
+        self._retired_display_buffers = None
+        self._display_index = 0
         
     def start_camera(self, camera_id=0, width=640, height=480):
         """Запуск камеры"""
@@ -144,44 +187,145 @@ class VideoThread(QTimer):
         if not self.cap.isOpened():
             return False
             
+        self.grabber = FrameGrabber(self.cap, self.latency)
+        self._result_queue.clear()
+        self._frame_pending.clear()
+        self.dropped_frames = 0
+        
+        self._stages = [
+            PipelineStage("inference", self._process_frame, output_queue=self._result_queue,
+                          on_error=self._stage_failed),
+            PipelineStage("render", self._emit_frame, self._result_queue, on_error=self._stage_failed),
+        ]
         self.is_running = True
-        super().start()
+        self.grabber.start()
+        for stage in self._stages:
+            stage.start()
         return True
         
     def stop_camera(self):
         """Остановка камеры"""
-        super().stop()
+        self.is_running = False
+        for stage in self._stages:
+            stage.stop()
+        for stage in self._stages:
+            stage.join(timeout=1.0)
+        self._stages = []
+        if self.grabber is not None:
+            self.grabber.stop()
         if self.cap is not None:
             self.cap.release()
             self.cap = None
-        self.is_running = False
         
-    def update_frame(self):
-        """Обновление кадра"""
-        if not self.is_running or self.cap is None:
-            return
+    def _stage_failed(self, stage, error):
+        """Стадия остановилась (вызывается из ее потока): GUI останавливает камеру"""
+        self.pipeline_failed.emit(f"{stage}: {error}")
+        
+    def _process_frame(self):
+        """Стадия распознавания: обработка самого свежего кадра обработчиком жестов"""
+        frame = self.grabber.read(timeout=0.1)
+        if frame is None:
+            return None
             
-        ret, frame = self.cap.read()
-        if not ret:
-            return
+        # отражение изображения по горизонтали (зеркально) в собственный буфер
+        if self._flip_buffer is None or self._flip_buffer.shape != frame.shape:
+            self._flip_buffer = np.empty_like(frame)
+        with self.latency.span("flip"):
+            frame = cv2.flip(frame, 1, dst=self._flip_buffer)
+        
+        with self._processor_lock:
+            if self.processor is None:
+                return None
+            result = self.processor.process_image(frame)
+        self._emit_events(result[1])
+        return result
+        
+    def _emit_events(self, data):
+        """Отправка событий кадра в GUI независимо от того, будет ли кадр отрисован"""
+        events = {key: data[key] for key in ("gesture_events", "model_reloaded", "index_finger_tip")
+                  if key in data}
+        if events.get("gesture_events") or events.get("model_reloaded"):
+            self.events_ready.emit(events)
             
-        # отражение изображения по горизонтали (зеркально)
-        frame = cv2.flip(frame, 1)
+    def _emit_frame(self, result):
+        """Стадия отрисовки: подготовка QImage и отправка в GUI"""
+        # GUI еще не отрисовал предыдущий кадр - отбрасываем текущий
+        if self._frame_pending.is_set():
+            self.dropped_frames += 1
+            return None
+            
+        frame, data = result
+        if self.display_enabled:
+            with self.latency.span("qt_convert"):
+                qt_image = self._to_qimage(frame)
+        else:
+            qt_image = QImage()
+        
+        self._frame_pending.set()
+        self.processed_ready.emit(qt_image, data)
+        return None
+        
+    def _to_qimage(self, frame):
+        """Копирование RGB-кадра в буфер отображения и создание QImage поверх него"""
+        # буфер, отправленный в GUI в прошлый раз, может еще конвертироваться в QPixmap
+        if self._display_buffers is None or self._display_buffers[0].shape != frame.shape:
+            # прежние буферы живут еще один кадр: на них может ссылаться QImage в GUI
+            self._retired_display_buffers = self._display_buffers
+            self._display_buffers = [np.empty_like(frame) for _ in range(2)]
+        self._display_index ^= 1
+        display = self._display_buffers[self._display_index]
+        np.copyto(display, frame)
+        
+        h, w, ch = display.shape
+        bytes_per_line = ch * w
+        # QImage ссылается на буфер отображения без копирования
+        return QImage(display.data, w, h, bytes_per_line, QImage.Format_RGB888)
         
-        # если есть обработчик, обрабатываем кадр и отправляем результат
-        if self.processor is not None:
-            result_frame, result_data = self.processor.process_image(frame)
-            self.processed_ready.emit(result_frame, result_data)
+    def _frame_delivered(self, qt_image, data):
+        """Кадр доставлен в поток GUI"""
+        self._frame_pending.clear()
             
     def set_processor(self, processor):
         """Установка обработчика жестов"""
-        self.processor = processor
+        with self._processor_lock:
+            self.processor = processor
+            self.processor.latency = self.latency
+            self.processor.set_roi_mode(self.roi_mode)
+            self.processor.set_target_fps(self.target_fps)
+            # настройки могли измениться до загрузки обработчика
+            self.processor.update_settings(
+                static_mode=self.use_static_image_mode,
+                min_detection_conf=self.min_detection_confidence,
+                min_tracking_conf=self.min_tracking_confidence,
+                min_classifier_conf=self.min_classifier_confidence,
+                max_num_hands=self.max_num_hands
+            )
+            
+    def set_target_fps(self, target_fps):
+        """Установка целевой частоты адаптивного режима обработчика"""
+        self.target_fps = target_fps
+        with self._processor_lock:
+            if self.processor:
+                self.processor.set_target_fps(target_fps)
+            
+    def set_roi_mode(self, enabled):
+        """Включение режима ROI обработчика"""
+        self.roi_mode = enabled
+        with self._processor_lock:
+            if self.processor:
+                self.processor.set_roi_mode(enabled)
         
     def update_settings(self, 
                      static_mode=None, 
                      min_detection_conf=None, 
-                     min_tracking_conf=None):
-        """Обновление настроек MediaPipe"""
+                     min_tracking_conf=None,
+                     min_classifier_conf=None,
+                     max_num_hands=None):
+        """Обновление настроек MediaPipe и порога уверенности классификатора"""
+        if min_classifier_conf is not None:
+            self.min_classifier_confidence = min_classifier_conf
+        if max_num_hands is not None:
+            self.max_num_hands = max_num_hands
         if static_mode is not None:
             self.use_static_image_mode = static_mode
         if min_detection_conf is not None:
@@ -189,12 +333,117 @@ class VideoThread(QTimer):
         if min_tracking_conf is not None:
             self.min_tracking_confidence = min_tracking_conf
             
-        if self.processor:
-            self.processor.update_settings(
-                static_mode=self.use_static_image_mode,
-                min_detection_conf=self.min_detection_confidence,
-                min_tracking_conf=self.min_tracking_confidence
-            )
+        with self._processor_lock:
+            if self.processor:
+                self.processor.update_settings(
+                    static_mode=self.use_static_image_mode,
+                    min_detection_conf=self.min_detection_confidence,
+                    min_tracking_conf=self.min_tracking_confidence,
+                    min_classifier_conf=self.min_classifier_confidence,
+                    max_num_hands=self.max_num_hands
+                )
+
+
+class StartupLoader(QObject):
+    """
+    Фоновая загрузка тяжелых подсистем при запуске.
+
+    Окно показывается сразу, а обработчик жестов (граф MediaPipe и классификатор)
+    создается и камеры перебираются в отдельных потоках; о ходе загрузки
+    и результатах сообщают сигналы (доставляются в поток GUI).
+    """
+    # этап загрузки, выполнено шагов, всего шагов
+    progress = pyqtSignal(str, int, int)
+    processor_ready = pyqtSignal(object)
+    processor_failed = pyqtSignal(str)
+    # ID найденных камер (кроме камеры по умолчанию)
+    cameras_ready = pyqtSignal(list)
+    # все фоновые задачи завершены
+    finished = pyqtSignal()
+    
+    def __init__(self, processor_factory, timer=None, max_camera_id=4, parent=None):
+        """
+        Args:
+            processor_factory: функция без аргументов, создающая GestureProcessor
+            timer: StartupTimer для отметок этапов (необязательно)
+            max_camera_id: камеры 1..max_camera_id проверяются на доступность
+        """
+        super().__init__(parent)
+        self.processor_factory = processor_factory
+        self.timer = timer
+        self.max_camera_id = max_camera_id
+        self._lock = threading.Lock()
+        self._done_steps = 0
+        self._pending_tasks = 0
+        
+    @property
+    def total_steps(self):
+        # загрузка моделей и проверка каждой камеры
+        return 1 + self.max_camera_id
+        
+    def start(self):
+        """Запуск фоновых задач"""
+        tasks = [("startup-models", self._load_processor), ("startup-cameras", self._enumerate_cameras)]
+        self._pending_tasks = len(tasks)
+        self.progress.emit("Загрузка моделей распознавания...", 0, self.total_steps)
+        for name, target in tasks:
+            threading.Thread(target=self._run_task, args=(target,), name=name, daemon=True).start()
+            
+    def retry_processor(self):
+        """Повторная загрузка обработчика после processor_failed"""
+        with self._lock:
+            self._pending_tasks += 1
+            # шаг загрузки моделей выполняется заново
+            self._done_steps -= 1
+            done = self._done_steps
+        self.progress.emit("Загрузка моделей распознавания...", done, self.total_steps)
+        threading.Thread(target=self._run_task, args=(self._load_processor,),
+                         name="startup-models", daemon=True).start()
+            
+    def _run_task(self, target):
+        try:
+            target()
+        finally:
+            with self._lock:
+                self._pending_tasks -= 1
+                finished = self._pending_tasks == 0
+            if finished:
+                self.finished.emit()
+                
+    def _step(self, message):
+        with self._lock:
+            self._done_steps += 1
+            done = self._done_steps
+        self.progress.emit(message, done, self.total_steps)
+        
+    def _mark(self, stage):
+        if self.timer is not None:
+            self.timer.mark(stage)
+            
+    def _load_processor(self):
+        try:
+            processor = self.processor_factory()
+        except Exception as e:
+            self._step("Ошибка загрузки моделей")
+            self.processor_failed.emit(str(e))
+            return
+        self._mark("models_loaded")
+        self._step("Модели загружены")
+        self.processor_ready.emit(processor)
+        
+    def _enumerate_cameras(self):
+        camera_ids = []
+        for camera_id in range(1, self.max_camera_id + 1):
+            try:
+                cap = cv2.VideoCapture(camera_id)
+                if cap.isOpened():
+                    camera_ids.append(camera_id)
+                cap.release()
+            except Exception:
+                pass
+            self._step(f"Поиск камер ({camera_id}/{self.max_camera_id})")
+        self._mark("cameras_enumerated")
+        self.cameras_ready.emit(camera_ids)
 
 
 class AddGestureDialog(QDialog):
@@ -212,8 +461,7 @@ class AddGestureDialog(QDialog):
         description = QLabel(
             "Введите название нового жеста. После добавления жеста:\n"
             "1. Запишите данные для жеста в режиме записи\n"
-            "2. Запустите ноутбук keypoint_classification_EN.ipynb\n"
-            "3. Выполните Restart & Run All для обучения модели"
+            "2. Дообучите модель: python -m model.keypoint_classifier.train --warm-start"
         )
         description.setWordWrap(True)
         description.setStyleSheet("color: #E6E6E6; padding: 10px; background-color: #3E3E42; border-radius: 5px;")
@@ -244,15 +492,36 @@ class AddGestureDialog(QDialog):
 
 class MainWindow(QMainWindow):
     """Главное окно приложения"""
-    def __init__(self):
+    # сигнал о выполнении действия из потока ActionExecutor (жест, успех, время в мс)
+    action_completed = pyqtSignal(str, bool, float)
+    # сигнал об изменении списка жестов в GestureRegistry (из любого потока)
+    gestures_changed = pyqtSignal(object)
+    # повторная загрузка моделей после ошибки (кнопка камеры в состоянии ошибки)
+    models_retry_requested = pyqtSignal()
+    
+    def __init__(self, registry=None):
         super().__init__()
         
+        # фоновая загрузка моделей завершилась ошибкой
+        self._models_failed = False
+        
+        # общий список жестов: файл меток читается один раз
+        self.registry = registry if registry is not None else GestureRegistry()
+        self.gestures_changed.connect(self.load_gesture_list)
+        # один и тот же объект для subscribe и unsubscribe: каждое обращение
+        # к self.gestures_changed.emit создает новый объект, не равный прежнему
+        self._on_gestures_changed = self.gestures_changed.emit
+        self.registry.subscribe(self._on_gestures_changed)
+        
         self.camera_id = 0
         self.camera_width = 640
         self.camera_height = 480
         
         self.recorded_frames = 0
         
+        # политика отрисовки, выбранная пользователем (при скрытом окне - выключена)
+        self.render_policy = RENDER_FULL
+        
         self.apply_styles()
         
         self.setWindowTitle("Hand Gesture Controller")
@@ -266,6 +535,15 @@ class MainWindow(QMainWindow):
         
         self.video_thread = VideoThread(self)
         self.video_thread.processed_ready.connect(self.update_processed_feed)
+        self.video_thread.events_ready.connect(self.handle_gesture_events)
+        self.video_thread.pipeline_failed.connect(self.on_pipeline_failed)
+        
+        # действия выполняются в фоновом потоке, чтобы pyautogui не тормозил распознавание
+        self.action_completed.connect(self.on_action_completed)
+        self.action_executor = ActionExecutor(self.gesture_actions,
+                                              on_complete=self.action_completed.emit,
+                                              latency=self.video_thread.latency)
+        self.action_executor.start()
         
         self.load_gesture_list()
         
@@ -318,23 +596,18 @@ class MainWindow(QMainWindow):
         camera_selector_layout = QHBoxLayout()
         camera_selector_layout.addWidget(QLabel("Камера:"))
         self.camera_selector = QComboBox()
+        # остальные камеры добавляются после фонового поиска (add_cameras)
         self.camera_selector.addItem("Камера по умолчанию", 0)
-        for i in range(1, 5):
-            try:
-                cap = cv2.VideoCapture(i)
-                if cap.isOpened():
-                    self.camera_selector.addItem(f"Камера {i}", i)
-                cap.release()
-            except:
-                pass
         camera_selector_layout.addWidget(self.camera_selector, 1) 
         camera_layout.addLayout(camera_selector_layout)
         
-        self.camera_button = QPushButton("ЗАПУСТИТЬ КАМЕРУ")
+        # кнопка станет доступна после загрузки обработчика жестов (set_processor)
+        self.camera_button = QPushButton("ЗАГРУЗКА МОДЕЛЕЙ...")
         self.camera_button.setIcon(self.style().standardIcon(QStyle.SP_MediaPlay))
         self.camera_button.setIconSize(QSize(24, 24))
         self.camera_button.setMinimumHeight(40) 
         self.camera_button.setStyleSheet("font-weight: bold;")
+        self.camera_button.setEnabled(False)
         self.camera_button.clicked.connect(self.toggle_camera)
         camera_layout.addWidget(self.camera_button)
         
@@ -400,6 +673,56 @@ class MainWindow(QMainWindow):
         
         recognition_layout.addLayout(cooldown_layout)
         
+        render_layout = QHBoxLayout()
+        render_label = QLabel("Отрисовка:")
+        render_label.setStyleSheet("font-weight: bold;")
+        render_layout.addWidget(render_label)
+        
+        self.render_policy_selector = QComboBox()
+        self.render_policy_selector.addItem("Полная", RENDER_FULL)
+        self.render_policy_selector.addItem("Минимальная", RENDER_MINIMAL)
+        self.render_policy_selector.addItem("Выключена", RENDER_OFF)
+        self.render_policy_selector.setToolTip("Что рисовать поверх кадра. Когда окно скрыто, отрисовка выключается автоматически")
+        self.render_policy_selector.currentIndexChanged.connect(self.on_render_policy_change)
+        render_layout.addWidget(self.render_policy_selector)
+        
+        recognition_layout.addLayout(render_layout)
+        
+        self.roi_checkbox = QCheckBox("Искать руку в области вокруг прошлого положения (ROI)")
+        self.roi_checkbox.setToolTip("Ускоряет обработку на камерах высокого разрешения. "
+                                     "Если рука потеряна, кадр обрабатывается целиком")
+        self.roi_checkbox.toggled.connect(self.toggle_roi_mode)
+        recognition_layout.addWidget(self.roi_checkbox)
+        
+        hands_layout = QHBoxLayout()
+        hands_label = QLabel("Количество рук:")
+        hands_label.setStyleSheet("font-weight: bold;")
+        hands_layout.addWidget(hands_label)
+        
+        self.max_hands_spinner = QSpinBox()
+        self.max_hands_spinner.setRange(1, 2)
+        self.max_hands_spinner.setToolTip("Сколько рук распознавать одновременно. "
+                                          "Действия выполняет первая рука с распознанным жестом")
+        self.max_hands_spinner.valueChanged.connect(self.update_max_hands)
+        hands_layout.addWidget(self.max_hands_spinner)
+        
+        recognition_layout.addLayout(hands_layout)
+        
+        target_fps_layout = QHBoxLayout()
+        target_fps_label = QLabel("Целевая частота (к/с):")
+        target_fps_label.setStyleSheet("font-weight: bold;")
+        target_fps_layout.addWidget(target_fps_label)
+        
+        self.target_fps_spinner = QSpinBox()
+        self.target_fps_spinner.setRange(0, 60)
+        self.target_fps_spinner.setSpecialValueText("Выкл")
+        self.target_fps_spinner.setToolTip("При нехватке времени распознавание идет на уменьшенном кадре "
+                                           "и реже, чтобы держать заданную частоту. 0 - выключено")
+        self.target_fps_spinner.valueChanged.connect(self.update_target_fps)
+        target_fps_layout.addWidget(self.target_fps_spinner)
+        
+        recognition_layout.addLayout(target_fps_layout)
+        
         self.apply_settings_button = QPushButton("ПРИМЕНИТЬ НАСТРОЙКИ")
         self.apply_settings_button.setIcon(self.style().standardIcon(QStyle.SP_DialogApplyButton))
         self.apply_settings_button.setIconSize(QSize(24, 24))
@@ -429,10 +752,21 @@ class MainWindow(QMainWindow):
         gesture_number_layout.addWidget(self.gesture_number_selector)
         recording_layout.addLayout(gesture_number_layout)
         
-        self.record_gesture_button = QPushButton("ЗАПИСАТЬ ЖЕСТ")
+        # при удержании кнопки записывается каждый N-й кадр с рукой
+        record_every_layout = QHBoxLayout()
+        record_every_layout.addWidget(QLabel("Каждый N-й кадр:"))
+        self.record_every_spinner = QSpinBox()
+        self.record_every_spinner.setRange(1, 30)
+        self.record_every_spinner.setValue(3)
+        self.record_every_spinner.valueChanged.connect(self.update_record_every)
+        record_every_layout.addWidget(self.record_every_spinner)
+        recording_layout.addLayout(record_every_layout)
+        
+        self.record_gesture_button = QPushButton("ЗАПИСАТЬ ЖЕСТ (УДЕРЖИВАТЬ)")
         self.record_gesture_button.setIcon(self.style().standardIcon(QStyle.SP_DialogSaveButton))
         self.record_gesture_button.setEnabled(False)
-        self.record_gesture_button.clicked.connect(self.record_gesture)
+        self.record_gesture_button.pressed.connect(self.start_gesture_recording)
+        self.record_gesture_button.released.connect(self.record_gesture)
         recording_layout.addWidget(self.record_gesture_button)
         
         self.recording_status = QLabel("Статус: Нормальный режим")
@@ -468,6 +802,35 @@ class MainWindow(QMainWindow):
         
         settings_layout.addWidget(action_group)
         
+        latency_group = QGroupBox("Задержки по стадиям (мс)")
+        latency_layout = QVBoxLayout(latency_group)
+        latency_layout.setSpacing(8)
+        
+        self.latency_checkbox = QCheckBox("Замерять задержки")
+        self.latency_checkbox.toggled.connect(self.toggle_latency_tracking)
+        latency_layout.addWidget(self.latency_checkbox)
+        
+        self.latency_label = QLabel("Замер выключен")
+        self.latency_label.setFont(QFont("Courier New", 8))
+        self.latency_label.setStyleSheet("color: #8F8F8F;")
+        latency_layout.addWidget(self.latency_label)
+        
+        latency_buttons = QHBoxLayout()
+        self.latency_json_button = QPushButton("JSON")
+        self.latency_json_button.clicked.connect(lambda: self.dump_latency("json"))
+        latency_buttons.addWidget(self.latency_json_button)
+        self.latency_csv_button = QPushButton("CSV")
+        self.latency_csv_button.clicked.connect(lambda: self.dump_latency("csv"))
+        latency_buttons.addWidget(self.latency_csv_button)
+        latency_layout.addLayout(latency_buttons)
+        
+        settings_layout.addWidget(latency_group)
+        
+        # обновление таблицы задержек раз в секунду
+        self.latency_timer = QTimer(self)
+        self.latency_timer.setInterval(1000)
+        self.latency_timer.timeout.connect(self.update_latency_view)
+        
         main_layout.addWidget(settings_panel)
         
         video_panel = QWidget()
@@ -517,6 +880,12 @@ class MainWindow(QMainWindow):
         
         main_layout.addWidget(video_panel, 3)
         
+        # ход фоновой загрузки при запуске (скрывается по завершении)
+        self.startup_progress = QProgressBar()
+        self.startup_progress.setMaximumWidth(200)
+        self.startup_progress.setTextVisible(False)
+        self.statusBar().addPermanentWidget(self.startup_progress)
+        
         self.action_gesture_selector.currentIndexChanged.connect(self.update_action_selector)
         self.recording_mode_selector.currentIndexChanged.connect(self.on_recording_mode_change)
         self.gesture_number_selector.currentIndexChanged.connect(self.on_gesture_number_change)
@@ -530,21 +899,27 @@ class MainWindow(QMainWindow):
         if level == "low":
             self.detection_conf = 0.9
             self.tracking_conf = 0.8
+            self.classifier_conf = 0.8
             self.sensitivity_low.setStyleSheet("background-color: #007ACC;")
             self.log_event("Установлена низкая чувствительность")
         elif level == "medium":
             self.detection_conf = 0.7
             self.tracking_conf = 0.5
+            self.classifier_conf = 0.6
             self.sensitivity_medium.setStyleSheet("background-color: #007ACC;")
             self.log_event("Установлена средняя чувствительность")
         elif level == "high":
             self.detection_conf = 0.5
             self.tracking_conf = 0.3
+            self.classifier_conf = 0.4
             self.sensitivity_high.setStyleSheet("background-color: #007ACC;")
             self.log_event("Установлена высокая чувствительность")
             
     def toggle_camera(self):
         """Переключение состояния камеры (включение/выключение)"""
+        if self._models_failed:
+            self.retry_model_loading()
+            return
         if not self.video_thread.is_running:
             camera_id = self.camera_selector.currentData()
             if self.video_thread.start_camera(camera_id, self.camera_width, self.camera_height):
@@ -558,30 +933,114 @@ class MainWindow(QMainWindow):
             self.camera_button.setText("ЗАПУСТИТЬ КАМЕРУ")
             self.camera_button.setIcon(self.style().standardIcon(QStyle.SP_MediaPlay))
             self.processed_feed.clear()
-            self.log_event("Камера остановлена")
+            grabber = self.video_thread.grabber
+            self.log_event(f"Камера остановлена (захвачено кадров: {grabber.grabbed_frames}, "
+                           f"пропущено устаревших: {grabber.dropped_frames})")
+            
+    def on_pipeline_failed(self, error):
+        """Остановка камеры после сбоя конвейера обработки"""
+        if self.video_thread.is_running:
+            self.toggle_camera()
+        self.log_event(f"❌ Ошибка обработки видео: {error}")
+        QMessageBox.critical(self, "Ошибка", f"Обработка видео остановлена из-за ошибки:\n{error}")
             
-    def update_processed_feed(self, frame, data):
+    def show_startup_progress(self, message, done, total):
+        """Отображение хода фоновой загрузки в строке состояния"""
+        self.startup_progress.setMaximum(total)
+        self.startup_progress.setValue(done)
+        self.statusBar().showMessage(message)
+        
+    def finish_startup(self, report=None):
+        """Завершение фоновой загрузки: скрытие индикатора и отчет о времени запуска"""
+        self.startup_progress.hide()
+        if not self._models_failed:
+            self.statusBar().showMessage("Готово", 3000)
+        if report:
+            for line in report.splitlines():
+                self.log_event(line.strip())
+                
+    def set_processor(self, processor):
+        """Установка загруженного обработчика жестов и разблокировка камеры"""
+        self._models_failed = False
+        self.video_thread.set_processor(processor)
+        self.apply_render_policy()
+        self.camera_button.setText("ЗАПУСТИТЬ КАМЕРУ")
+        self.camera_button.setIcon(self.style().standardIcon(QStyle.SP_MediaPlay))
+        self.camera_button.setEnabled(True)
+        self.log_event("Модели распознавания загружены")
+        
+    def startup_failed(self, error):
+        """Ошибка загрузки моделей: кнопка камеры предлагает повторить загрузку"""
+        self._models_failed = True
+        self.startup_progress.hide()
+        self.camera_button.setText("ОШИБКА ЗАГРУЗКИ: ПОВТОРИТЬ")
+        self.camera_button.setIcon(self.style().standardIcon(QStyle.SP_BrowserReload))
+        self.camera_button.setEnabled(True)
+        self.statusBar().showMessage("Модели распознавания не загружены")
+        self.log_event(f"❌ Ошибка загрузки моделей распознавания: {error}")
+        
+    def retry_model_loading(self):
+        """Повторный запуск фоновой загрузки моделей"""
+        self._models_failed = False
+        self.camera_button.setText("ЗАГРУЗКА МОДЕЛЕЙ...")
+        self.camera_button.setIcon(self.style().standardIcon(QStyle.SP_MediaPlay))
+        self.camera_button.setEnabled(False)
+        self.startup_progress.show()
+        self.log_event("Повторная загрузка моделей распознавания")
+        self.models_retry_requested.emit()
+        
+    def add_cameras(self, camera_ids):
+        """Добавление найденных камер в список и выбор камеры из настроек (camera_id)"""
+        for camera_id in camera_ids:
+            self.camera_selector.addItem(f"Камера {camera_id}", camera_id)
+        index = self.camera_selector.findData(self.camera_id)
+        if index > 0:
+            self.camera_selector.setCurrentIndex(index)
+        self.log_event(f"Найдено дополнительных камер: {len(camera_ids)}")
+        
+    def update_processed_feed(self, qt_image, data):
         """Обновление обработанного изображения и информации о распознавании"""
         self._last_frame_data = data
+        latency = self.video_thread.latency
         
-        h, w, ch = frame.shape
-        bytes_per_line = ch * w
-        qt_image = QImage(frame.data, w, h, bytes_per_line, QImage.Format_RGB888).rgbSwapped()
-        pixmap = QPixmap.fromImage(qt_image)
-        
-        self.processed_feed.setPixmap(pixmap.scaled(
-            self.processed_feed.width(), self.processed_feed.height(),
-            Qt.KeepAspectRatio, Qt.SmoothTransformation))
+        # пустой QImage приходит, когда окно скрыто и кадр не готовился
+        if not qt_image.isNull():
+            with latency.span("qt_paint"):
+                pixmap = QPixmap.fromImage(qt_image)
+                
+                self.processed_feed.setPixmap(pixmap.scaled(
+                    self.processed_feed.width(), self.processed_feed.height(),
+                    Qt.KeepAspectRatio, Qt.SmoothTransformation))
+            
+        # счетчик кадров сессии записи (запись идет в потоке распознавания)
+        if "recorded_frames" in data and data["recorded_frames"] != self.recorded_frames:
+            self.recorded_frames = data["recorded_frames"]
+            self.frames_counter.setText(f"Записано кадров: {self.recorded_frames}")
             
-        if "hand_sign" in data:
-            gesture_name = data["hand_sign"]
-            self.current_gesture_label.setText(gesture_name)
+        hands = data.get("hands", ())
+        if len(hands) > 1:
+            self.current_gesture_label.setText(", ".join(
+                f"{hand['handedness']}: {hand.get('hand_sign', '?')}" for hand in hands))
+        elif "hand_sign" in data:
+            self.current_gesture_label.setText(data["hand_sign"])
             
-            if gesture_name in self.gesture_actions.actions_mapping:
-                action_config = self.gesture_actions.actions_mapping[gesture_name]
-                action_type = action_config["action"]
+    def handle_gesture_events(self, data):
+        """Обработка событий распознавания (приходят без потерь, в отличие от кадров)"""
+        if data.get("model_reloaded"):
+            self.log_event("Модель распознавания обновлена")
+            
+        # действие запускается, когда жест стал устойчивым; повторяющиеся действия
+        # (прокрутка) - и пока жест удерживается, с ограничением частоты
+        for event, gesture_name in data.get("gesture_events", ()):
+            if event == GESTURE_HOLD:
+                if self.gesture_actions.is_repeating(gesture_name):
+                    self.action_executor.submit(gesture_name)
+                continue
+            if event != GESTURE_ONSET:
+                continue
                 
-                action_display = self.get_action_display_name(action_type, action_config["params"])
+            action_display = self.gesture_actions.get_action_description(gesture_name)
+            if action_display is not None:
                 self.current_action_label.setText(action_display)
                 
                 self.log_event(f"Жест распознан: {gesture_name} → {action_display}")
@@ -590,84 +1049,18 @@ class MainWindow(QMainWindow):
                 if "index_finger_tip" in data:
                     x_pos, y_pos = data["index_finger_tip"]
                     
-                self.gesture_actions.execute_action(gesture_name, x_pos, y_pos)
+                self.action_executor.submit(gesture_name, x_pos, y_pos)
             else:
                 self.current_action_label.setText("Нет")
                 
+    def on_action_completed(self, gesture_name, success, elapsed_ms):
+        """Обработка завершения действия в фоновом потоке"""
+        if success:
+            self.log_event(f"Действие выполнено: {gesture_name} ({elapsed_ms:.0f} мс)")
+                
     def get_action_display_name(self, action_type, params=None):
         """Возвращает понятное название действия для интерфейса"""
-        if action_type == "none":
-            return "Нет действия"
-        elif action_type == "custom_hotkey":
-            if params and "hotkey" in params:
-                hotkey = "+".join(params["hotkey"])
-                return f"Комбинация клавиш: {hotkey}"
-            return "Комбинация клавиш"
-            
-        # действия мыши
-        elif action_type == "click":
-            return "Мышь: левый клик"
-        elif action_type == "double_click":
-            return "Мышь: двойной клик"
-        elif action_type == "right_click":
-            return "Мышь: правый клик"
-        elif action_type == "scroll_up":
-            return "Мышь: прокрутка вверх"
-        elif action_type == "scroll_down":
-            return "Мышь: прокрутка вниз"
-            
-        # буфер обмена
-        elif action_type == "copy":
-            return "Комбинация клавиш: копировать (Ctrl+C)"
-        elif action_type == "paste":
-            return "Комбинация клавиш: вставить (Ctrl+V)"
-        elif action_type == "cut":
-            return "Комбинация клавиш: вырезать (Ctrl+X)"
-            
-        # общие команды редактирования
-        elif action_type == "select_all":
-            return "Комбинация клавиш: выделить всё (Ctrl+A)"
-        elif action_type == "undo":
-            return "Комбинация клавиш: отменить (Ctrl+Z)"
-        elif action_type == "redo":
-            return "Комбинация клавиш: повторить (Ctrl+Y)"
-        elif action_type == "save":
-            return "Комбинация клавиш: сохранить (Ctrl+S)"
-            
-        # запуска
-        elif action_type == "run_code":
-            return "Комбинация клавиш: запустить код (F5)"
-        elif action_type == "go_to_definition":
-            return "Комбинация клавиш: перейти к определению (F12)"
-        elif action_type == "find":
-            return "Комбинация клавиш: найти (Ctrl+F)"
-        elif action_type == "find_in_files":
-            return "Комбинация клавиш: найти в файлах (Ctrl+Shift+F)"
-        elif action_type == "quick_open":
-            return "Комбинация клавиш: быстрое открытие файла (Ctrl+P)"
-        elif action_type == "command_palette":
-            return "Комбинация клавиш: палитра команд (Ctrl+Shift+P)"
-            
-        # файлы
-        elif action_type == "new_file":
-            return "Комбинация клавиш: новый файл (Ctrl+N)"
-        elif action_type == "open_file":
-            return "Комбинация клавиш: открыть файл (Ctrl+O)"
-        elif action_type == "close_file":
-            return "Комбинация клавиш: закрыть файл (Ctrl+W)"
-        elif action_type == "close_window":
-            return "Комбинация клавиш: закрыть окно (Alt+F4)"
-        elif action_type == "switch_tab_next":
-            return "Комбинация клавиш: следующая вкладка (Ctrl+Tab)"
-        elif action_type == "switch_tab_prev":
-            return "Комбинация клавиш: предыдущая вкладка (Ctrl+Shift+Tab)"
-            
-        # доп фишки
-        elif action_type == "screenshot":
-            return "Системное: сделать скриншот"
-            
-        # возвращаем оригинальное название, если неизвестный тип
-        return f"Неизвестное действие: {action_type}"
+        return describe_action(action_type, params)
 
     def apply_mediapipe_settings(self):
         """Применение настроек MediaPipe"""
@@ -677,7 +1070,8 @@ class MainWindow(QMainWindow):
         self.video_thread.update_settings(
             static_mode=static_mode,
             min_detection_conf=self.detection_conf,
-            min_tracking_conf=self.tracking_conf
+            min_tracking_conf=self.tracking_conf,
+            min_classifier_conf=self.classifier_conf
         )
         
         # всплывающее уведомление
@@ -688,13 +1082,15 @@ class MainWindow(QMainWindow):
         msg.setStandardButtons(QMessageBox.Ok)
         msg.exec_()
         
-        self.log_event(f"Настройки применены: обнаружение={self.detection_conf}, трекинг={self.tracking_conf}")
+        self.log_event(f"Настройки применены: обнаружение={self.detection_conf}, трекинг={self.tracking_conf}, "
+                       f"уверенность жеста={self.classifier_conf}")
      
     def load_initial_settings(self):
         """Загрузка начальных значений настроек"""
         # инициализируем значения перед вызовом set_sensitivity
         self.detection_conf = 0.7
         self.tracking_conf = 0.5
+        self.classifier_conf = 0.6
         
         # устанавливаем средний уровень чувствительности по умолчанию 
         self.set_sensitivity("medium")
@@ -706,35 +1102,25 @@ class MainWindow(QMainWindow):
         # логирование загрузки настроек
         self.log_event("Загружены начальные настройки")
 
-    def load_gesture_list(self):
-        """Загрузка списка жестов из CSV-файла"""
-        try:
-            label_path = os.path.join(
-                os.path.dirname(os.path.abspath(__file__)),
-                'model', 'keypoint_classifier', 'keypoint_classifier_label.csv'
-            )
+    def load_gesture_list(self, gestures=None):
+        """Заполнение списков жестов из GestureRegistry (без чтения файла)"""
+        if gestures is None:
+            gestures = self.registry.labels
             
-            with open(label_path, 'r', encoding='utf-8-sig') as f:
-                gestures = []
-                for line in f:
-                    line = line.strip()
-                    if line:  # добавляем только непустые строки
-                        gestures.append(line)
-                
-            # очистка комбобокса
-            self.action_gesture_selector.clear()
+        # очистка комбобокса
+        current = self.action_gesture_selector.currentText()
+        self.action_gesture_selector.clear()
+        
+        # заполнение комбобокса актуальными жестами
+        for gesture in gestures:
+            self.action_gesture_selector.addItem(gesture)
+        if current in gestures:
+            self.action_gesture_selector.setCurrentText(current)
             
-            # заполнение комбобокса актуальными жестами
-            for gesture in gestures:
-                self.action_gesture_selector.addItem(gesture)
-                
-            # обновляем список номеров жестов
-            self.update_gesture_numbers()
-                
-            self.log_event(f"Загружено {len(gestures)} жестов")
-                
-        except Exception as e:
-            QMessageBox.warning(self, "Ошибка загрузки жестов", f"Не удалось загрузить список жестов: {str(e)}")
+        # обновляем список номеров жестов
+        self.update_gesture_numbers(gestures)
+        
+        self.log_event(f"Загружено {len(gestures)} жестов")
             
     def load_action_mappings(self):
         """Загрузка настроек действий для жестов"""
@@ -800,6 +1186,45 @@ class MainWindow(QMainWindow):
         self.event_log.addItem(item)
         self.event_log.scrollToBottom()
 
+    def toggle_latency_tracking(self, enabled):
+        """Включение/выключение замеров задержек"""
+        latency = self.video_thread.latency
+        latency.reset()
+        latency.set_enabled(enabled)
+        if enabled:
+            self.latency_timer.start()
+            self.latency_label.setText("Сбор данных...")
+        else:
+            self.latency_timer.stop()
+            self.latency_label.setText("Замер выключен")
+        self.log_event(f"Замер задержек {'включен' if enabled else 'выключен'}")
+        
+    def update_latency_view(self):
+        """Обновление таблицы перцентилей задержек"""
+        summary = self.video_thread.latency.summary()
+        if not summary:
+            return
+        lines = [f"{'стадия':<15}{'p50':>6}{'p95':>6}{'p99':>6}"]
+        for stage, stats in summary.items():
+            lines.append(f"{stage[:15]:<15}{stats['p50']:>6.1f}{stats['p95']:>6.1f}{stats['p99']:>6.1f}")
+        self.latency_label.setText("\n".join(lines))
+        
+    def dump_latency(self, file_format):
+        """Сохранение сводки задержек в JSON или CSV"""
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Сохранить задержки", f"latency.{file_format}",
+            "JSON (*.json)" if file_format == "json" else "CSV (*.csv)")
+        if not path:
+            return
+        try:
+            if file_format == "json":
+                self.video_thread.latency.dump_json(path)
+            else:
+                self.video_thread.latency.dump_csv(path)
+            self.log_event(f"Задержки сохранены в {path}")
+        except Exception as e:
+            self.log_event(f"Ошибка сохранения задержек: {e}")
+        
     def update_action_cooldown(self):
         """Обновление задержки между действиями"""
         cooldown = self.action_cooldown_spinner.value()
@@ -926,7 +1351,8 @@ class MainWindow(QMainWindow):
                 background-color: #1C97EA;
             }
         """)
-        refresh_button.clicked.connect(lambda: self.load_gesture_list())
+        # перечитывание файла меток (списки обновятся по уведомлению GestureRegistry)
+        refresh_button.clicked.connect(self.registry.reload)
         buttons_layout.addWidget(refresh_button)
         
         # Кнопка закрытия
@@ -977,6 +1403,8 @@ class MainWindow(QMainWindow):
             self.gesture_number_selector.setEnabled(True)
             self.recorded_frames = 0
             self.frames_counter.setText("Записано кадров: 0")
+            if self.video_thread.processor:
+                self.video_thread.processor.start_recording(every_nth=self.record_every_spinner.value())
             
             # инструкция
             msg = QMessageBox(self)
@@ -985,11 +1413,13 @@ class MainWindow(QMainWindow):
             msg.setText("Инструкция по записи данных:\n\n"
                        "1. Выберите номер жеста (0-9)\n"
                        "2. Покажите жест перед камерой\n"
-                       "3. Нажмите кнопку 'ЗАПИСАТЬ ЖЕСТ' для записи кадра\n"
-                       "4. Повторяйте шаг 3 столько раз, сколько нужно кадров")
+                       "3. Удерживайте кнопку 'ЗАПИСАТЬ ЖЕСТ': записывается каждый N-й кадр,\n"
+                       "   короткое нажатие записывает один кадр\n"
+                       "4. Меняйте положение руки, пока не наберется нужное число кадров")
             msg.setStandardButtons(QMessageBox.Ok)
             msg.exec_()
         else:  # Нормальный режим
+            self.stop_gesture_recording()
             if self.recorded_frames > 0:
                 self.show_recording_notification(success=True)
                 
@@ -1023,8 +1453,14 @@ class MainWindow(QMainWindow):
         gesture_selected = self.gesture_number_selector.currentIndex() != -1
         self.record_gesture_button.setEnabled(mode == 1 and gesture_selected)
 
-    def record_gesture(self):
-        """Запись жеста при нажатии на кнопку"""
+    def update_record_every(self, every_nth):
+        """Изменение шага непрерывной записи"""
+        processor = self.video_thread.processor
+        if processor and processor.recording is not None:
+            processor.recording.every_nth = every_nth
+            
+    def start_gesture_recording(self):
+        """Начало непрерывной записи при нажатии на кнопку"""
         if not self.video_thread.is_running:
             self.log_event("Ошибка: Камера не запущена!")
             return
@@ -1034,25 +1470,49 @@ class MainWindow(QMainWindow):
             self.log_event("Ошибка: Выберите номер жеста (0-9) перед записью!")
             return
             
-        if self.video_thread.processor:
-            # последние данные о руке
-            last_frame_data = getattr(self, '_last_frame_data', None)
-            if last_frame_data and 'landmark_list' in last_frame_data:
-                self.log_event("Найдены данные о руке, записываю кадр...")
-                # кадр записанныйкадр
-                if self.video_thread.processor.record_frame(last_frame_data['landmark_list']):
-                    self.recorded_frames += 1
-                    self.frames_counter.setText(f"Записано кадров: {self.recorded_frames}")
-                    self.log_event(f"✓ Успешно записан кадр {self.recorded_frames} для жеста {current_number}")
-                else:
-                    self.log_event("❌ Ошибка: Не удалось записать кадр")
+        processor = self.video_thread.processor
+        if processor and processor.hold_recording():
+            processor.recording.every_nth = self.record_every_spinner.value()
+            
+    def stop_gesture_recording(self):
+        """Закрытие сессии записи (оставшиеся кадры дописываются в файл)"""
+        processor = self.video_thread.processor
+        if processor and processor.recording is not None:
+            session = processor.recording
+            self.recorded_frames = processor.stop_recording()
+            # ошибка читается после закрытия: последний сброс буфера тоже может не удаться
+            if session.error is not None:
+                self.show_recording_notification(success=False, error_message=str(session.error))
+                
+    def record_gesture(self):
+        """Окончание записи при отпускании кнопки; короткое нажатие записывает один кадр"""
+        processor = self.video_thread.processor
+        if not self.video_thread.is_running or not processor or processor.recording is None:
+            return
+            
+        current_number = self.gesture_number_selector.currentData()
+        recorded = processor.release_recording()
+        if recorded:
+            self.log_event(f"✓ Записано кадров для жеста {current_number}: {recorded}")
+            return
+            
+        # за время нажатия кадров с рукой не было: записываем последний кадр
+        last_frame_data = getattr(self, '_last_frame_data', None)
+        if last_frame_data and 'landmark_list' in last_frame_data:
+            if processor.record_frame(last_frame_data['landmark_list']):
+                self.recorded_frames = processor.recording.recorded
+                self.frames_counter.setText(f"Записано кадров: {self.recorded_frames}")
+                self.log_event(f"✓ Успешно записан кадр {self.recorded_frames} для жеста {current_number}")
             else:
-                self.log_event("❌ Ошибка: Рука не обнаружена в кадре")
+                self.log_event("❌ Ошибка: Не удалось записать кадр")
+        else:
+            self.log_event("❌ Ошибка: Рука не обнаружена в кадре")
 
     def keyPressEvent(self, event):
         """Обработка нажатий клавиш"""
         if event.key() == Qt.Key_Escape:  # Escape - выход из режима записи
             if self.video_thread.processor:
+                self.stop_gesture_recording()
                 self.video_thread.processor.set_mode(0)  # нормалньый режим
                 self.recording_mode_selector.setCurrentIndex(0)  # селектор режима на 0
                 self.log_event("Режим записи выключен")
@@ -1063,34 +1523,18 @@ class MainWindow(QMainWindow):
         
         super().keyPressEvent(event)
 
-    def update_gesture_numbers(self):
-        """Обновление списка номеров жестов на основе файла меток"""
+    def update_gesture_numbers(self, gestures=None):
+        """Обновление списка номеров жестов из GestureRegistry"""
+        if gestures is None:
+            gestures = self.registry.labels
+        current = self.gesture_number_selector.currentData()
         self.gesture_number_selector.clear()
-        try:
-            label_path = os.path.join(
-                os.path.dirname(os.path.abspath(__file__)),
-                'model', 'keypoint_classifier', 'keypoint_classifier_label.csv'
-            )
-            
-            with open(label_path, 'r', encoding='utf-8-sig') as f:
-                gestures = []
-                for line in f:
-                    line = line.strip()
-                    if line:  # только непустые
-                        gestures.append(line)
-                
-            with open(label_path, 'w', encoding='utf-8-sig') as f:
-                for gesture in gestures:
-                    f.write(gesture + '\n')
-                
-            # Обновляем ComboBox только актуальными жестами
-            for i, gesture in enumerate(gestures):
-                self.gesture_number_selector.addItem(f"Жест {i}: {gesture}", i)
-                
-            self.log_event(f"Обновлен список жестов: {len(gestures)} жестов")
-                
-        except Exception as e:
-            QMessageBox.warning(self, "Ошибка загрузки жестов", f"Не удалось загрузить список жестов: {str(e)}")
+        
+        for i, gesture in enumerate(gestures):
+            self.gesture_number_selector.addItem(f"Жест {i}: {gesture}", i)
+        # выбранный для записи жест сохраняется (в нормальном режиме выбора нет)
+        self.gesture_number_selector.setCurrentIndex(
+            self.gesture_number_selector.findData(current) if current is not None else -1)
 
     def show_add_gesture_dialog(self):
         """Показать диалог добавления нового жеста"""
@@ -1099,25 +1543,8 @@ class MainWindow(QMainWindow):
             gesture_name = dialog.get_gesture_name()
             if gesture_name:
                 try:
-                    label_path = os.path.join(
-                        os.path.dirname(os.path.abspath(__file__)),
-                        'model', 'keypoint_classifier', 'keypoint_classifier_label.csv'
-                    )
-                    
-                    existing_gestures = []
-                    if os.path.exists(label_path):
-                        with open(label_path, 'r', encoding='utf-8-sig') as f:
-                            existing_gestures = [line.strip() for line in f.readlines()]
-                    
-                    if gesture_name in existing_gestures:
-                        QMessageBox.warning(self, "Ошибка", 
-                                         f"Жест с названием '{gesture_name}' уже существует!")
-                        return
-                    
-                    with open(label_path, 'a', encoding='utf-8-sig') as f:
-                        f.write(f"{gesture_name}\n")
-                    
-                    self.load_gesture_list()
+                    # запись файла меток и обновление списков - через GestureRegistry
+                    self.registry.add(gesture_name)
                     
                     QMessageBox.information(
                         self,
@@ -1125,33 +1552,72 @@ class MainWindow(QMainWindow):
                         f"Жест '{gesture_name}' успешно добавлен!\n\n"
                         "Теперь необходимо:\n"
                         "1. Записать данные для жеста в режиме записи\n"
-                        "2. Запустить ноутбук keypoint_classification_EN.ipynb\n"
-                        "3. Выполнить Restart & Run All для обучения модели"
+                        "2. Дообучить модель с текущих весов (несколько секунд):\n"
+                        "   python -m model.keypoint_classifier.train --warm-start"
                     )
                     
+                except ValueError as e:
+                    QMessageBox.warning(self, "Ошибка", str(e))
                 except Exception as e:
                     QMessageBox.critical(self, "Ошибка", f"Не удалось добавить жест: {str(e)}")
 
+    def update_max_hands(self, max_num_hands):
+        """Установка максимального количества рук"""
+        self.video_thread.update_settings(max_num_hands=max_num_hands)
+        self.log_event(f"Количество рук: {max_num_hands}")
+        
+    def update_target_fps(self, target_fps):
+        """Установка целевой частоты адаптивного режима"""
+        self.video_thread.set_target_fps(target_fps)
+        if target_fps:
+            self.log_event(f"Адаптивный режим: целевая частота {target_fps} к/с")
+        else:
+            self.log_event("Адаптивный режим выключен")
+        
+    def toggle_roi_mode(self, enabled):
+        """Включение/выключение режима ROI"""
+        self.video_thread.set_roi_mode(enabled)
+        self.log_event(f"Режим ROI {'включен' if enabled else 'выключен'}")
+        
+    def on_render_policy_change(self, index):
+        """Обработчик изменения политики отрисовки"""
+        self.render_policy = self.render_policy_selector.currentData()
+        self.apply_render_policy()
+        self.log_event(f"Отрисовка: {self.render_policy_selector.currentText()}")
+        
+    def apply_render_policy(self):
+        """Применение политики отрисовки с учетом видимости окна"""
+        if not hasattr(self, 'video_thread'):
+            return
+        visible = self.isVisible() and not self.isMinimized()
+        self.video_thread.display_enabled = visible
+        if self.video_thread.processor:
+            self.video_thread.processor.set_render_policy(self.render_policy if visible else RENDER_OFF)
+            
     def showEvent(self, event):
         """Обработчик события показа окна"""
         super().showEvent(event)
-        if hasattr(self, 'cap') and self.cap is not None:
-            self.cap.release()
-            self.cap = cv2.VideoCapture(0)
-            if not self.cap.isOpened():
-                QMessageBox.critical(self, "Ошибка", "Не удалось подключиться к камере")
-                return
-            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.camera_width)
-            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.camera_height)
+        self.apply_render_policy()
             
     def hideEvent(self, event):
         """Обработчик события скрытия окна"""
         super().hideEvent(event)
-        if hasattr(self, 'cap') and self.cap is not None:
-            self.cap.release()
+        self.apply_render_policy()
+        
+    def changeEvent(self, event):
+        """Обработчик изменения состояния окна (сворачивание)"""
+        super().changeEvent(event)
+        if event.type() == QEvent.WindowStateChange:
+            self.apply_render_policy()
             
     def closeEvent(self, event):
         """Обработчик события закрытия окна"""
+        self.video_thread.stop_camera()
+        self.stop_gesture_recording()
+        if self.video_thread.processor:
+            self.video_thread.processor.close()
+        self.registry.unsubscribe(self._on_gestures_changed)
+        self.action_executor.stop()
         if hasattr(self, 'cap') and self.cap is not None:
             self.cap.release()
         super().closeEvent(event)
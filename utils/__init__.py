@@ -1 +1,9 @@
-from utils.cvfpscalc import CvFpsCalc
\ No newline at end of file
+from utils.adaptive import AdaptiveController
+from utils.cvfpscalc import CvFpsCalc
+from utils.frame_grabber import FrameGrabber, VideoFileReader
+from utils.gesture_filter import GestureFilter, GESTURE_ONSET, GESTURE_HOLD, GESTURE_RELEASE
+from utils.latency import LatencyTracker
+from utils.pipeline import DropQueue, PipelineStage
+from utils.rate_limit import TokenBucket
+from utils.shared_frames import SharedFrameRing
+from utils.startup import StartupTimer
@@ -0,0 +1,83 @@
+class AdaptiveController(object):
+    """
+    Подбор масштаба кадра для инференса и пропуска кадров под целевую частоту.
+
+    По скользящему среднему (EMA) времени обработки кадра контроллер при перегрузке
+    сначала уменьшает масштаб входа MediaPipe, затем начинает пропускать кадры;
+    при запасе по времени действует в обратном порядке. Между переключениями
+    выдерживается пауза, чтобы уровни не "дребезжали".
+    """
+
+    SCALES = (1.0, 0.75, 0.5, 0.375)
+
+    def __init__(self, target_fps, scales=SCALES, max_skip=2,
+                 ema_alpha=0.2, high_water=1.0, low_water=0.6, settle_frames=15):
+        """
+        Args:
+            target_fps: целевая частота обработки кадров
+            scales: допустимые масштабы входа по убыванию
+            max_skip: максимум пропускаемых кадров между обрабатываемыми
+            high_water: доля бюджета кадра, выше которой качество снижается
+            low_water: доля бюджета кадра, ниже которой качество повышается
+            settle_frames: обработанных кадров между переключениями
+        """
+        self.scales = tuple(scales)
+        self.max_skip = max_skip
+        self.ema_alpha = ema_alpha
+        self.high_water = high_water
+        self.low_water = low_water
+        self.settle_frames = settle_frames
+        self.set_target_fps(target_fps)
+
+    def set_target_fps(self, target_fps):
+        self.target_fps = target_fps
+        self.budget_ms = 1000.0 / target_fps
+        self.reset()
+
+    def reset(self):
+        # уровень 0 - полный масштаб без пропусков; далее масштабы, затем пропуски
+        self.level = 0
+        self.average_ms = None
+        self._since_change = 0
+        self._frame_counter = 0
+
+    @property
+    def scale(self):
+        return self.scales[min(self.level, len(self.scales) - 1)]
+
+    @property
+    def skip(self):
+        return self._skip_of(self.level)
+
+    def _skip_of(self, level):
+        return max(0, level - (len(self.scales) - 1))
+
+    def should_process(self):
+        """Обрабатывать ли очередной кадр (вызывается на каждый кадр)."""
+        self._frame_counter = (self._frame_counter + 1) % (self.skip + 1)
+        return self._frame_counter == 0
+
+    def update(self, frame_ms):
+        """Учет времени обработки кадра (мс) и, при необходимости, смена уровня."""
+        if self.average_ms is None:
+            self.average_ms = frame_ms
+        else:
+            self.average_ms += self.ema_alpha * (frame_ms - self.average_ms)
+
+        self._since_change += 1
+        if self._since_change < self.settle_frames:
+            return
+
+        # при пропуске кадров бюджет на один обработанный кадр больше;
+        # повышение качества сравнивается с бюджетом более высокого уровня
+        max_level = len(self.scales) - 1 + self.max_skip
+        if self.average_ms > self.budget_ms * (self.skip + 1) * self.high_water and self.level < max_level:
+            self._set_level(self.level + 1)
+        elif self.level > 0 and \
+                self.average_ms < self.budget_ms * (self._skip_of(self.level - 1) + 1) * self.low_water:
+            self._set_level(self.level - 1)
+
+    def _set_level(self, level):
+        self.level = level
+        self._since_change = 0
+        self._frame_counter = 0
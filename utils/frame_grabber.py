@@ -0,0 +1,168 @@
+import threading
+import time
+
+import cv2 as cv
+import numpy as np
+
+from utils.latency import LatencyTracker
+
+
+class FrameGrabber(object):
+    """
+    Захват кадров в отдельном потоке по принципу "побеждает последний кадр".
+
+    Кадры читаются в заранее выделенные буферы (тройная буферизация):
+    один слот заполняется камерой, один хранит самый свежий готовый кадр,
+    один удерживается потребителем. Если потребитель не успел забрать
+    готовый кадр, он перезаписывается новым и учитывается в dropped_frames.
+    """
+
+    SLOTS = 3
+
+    def __init__(self, cap, latency=None):
+        self.cap = cap
+        # замеры времени чтения кадра (стадия "capture")
+        self.latency = latency if latency is not None else LatencyTracker()
+        # уменьшаем внутренний буфер OpenCV, чтобы не копить старые кадры
+        self.cap.set(cv.CAP_PROP_BUFFERSIZE, 1)
+
+        self._slots = None
+        self._write_index = 0
+        self._ready_index = None  # слот с самым свежим непрочитанным кадром
+        self._read_index = None  # слот, удерживаемый потребителем
+        self._condition = threading.Condition()
+
+        self._thread = None
+        self._stop_event = threading.Event()
+
+        self.grabbed_frames = 0  # всего прочитано кадров с камеры
+        self.dropped_frames = 0  # кадров перезаписано до того, как их забрали
+
+    def start(self):
+        """Запуск потока захвата"""
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="frame-grabber", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=1.0):
+        """Остановка потока захвата"""
+        self._stop_event.set()
+        with self._condition:
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def read(self, timeout=None):
+        """
+        Получение самого свежего кадра.
+
+        Возвращенный массив остается валидным до следующего вызова read().
+        Если за timeout новый кадр не появился, возвращается None.
+        """
+        with self._condition:
+            if self._ready_index is None:
+                self._condition.wait_for(
+                    lambda: self._ready_index is not None or self._stop_event.is_set(),
+                    timeout=timeout)
+            if self._ready_index is None:
+                return None
+
+            self._read_index = self._ready_index
+            self._ready_index = None
+            return self._slots[self._read_index]
+
+    def _allocate_slots(self, frame):
+        """Выделение буферов под размер кадра"""
+        self._slots = [np.empty_like(frame) for _ in range(self.SLOTS)]
+        self._write_index = 0
+        self._ready_index = None
+        self._read_index = None
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            slot = self._slots[self._write_index] if self._slots is not None else None
+            with self.latency.span("capture"):
+                ret, frame = self.cap.read(slot)
+            if not ret:
+                time.sleep(0.01)
+                continue
+
+            with self._condition:
+                if slot is None or frame is not slot:
+                    # первый кадр или смена разрешения: перевыделяем буферы
+                    if self._slots is None or frame.shape != self._slots[0].shape:
+                        self._allocate_slots(frame)
+                    np.copyto(self._slots[self._write_index], frame)
+
+                self.grabbed_frames += 1
+                if self._ready_index is not None:
+                    self.dropped_frames += 1
+
+                # свежий кадр становится готовым, запись идет в свободный слот
+                self._ready_index = self._write_index
+                busy = (self._ready_index, self._read_index)
+                self._write_index = next(i for i in range(self.SLOTS) if i not in busy)
+                self._condition.notify()
+
+
+class VideoFileReader(object):
+    """
+    Последовательное чтение видеофайла с темпом его частоты кадров.
+
+    Интерфейс совпадает с FrameGrabber, но кадры не отбрасываются: следующий
+    кадр читается только по запросу потребителя и не раньше, чем через период
+    кадра файла после предыдущего. Если потребитель медленнее, видео
+    проигрывается медленнее реального времени, а не прореживается.
+    """
+
+    def __init__(self, cap, latency=None, realtime=True):
+        self.cap = cap
+        self.latency = latency if latency is not None else LatencyTracker()
+        fps = cap.get(cv.CAP_PROP_FPS)
+        # realtime=False или неизвестная частота: кадры без ожидания
+        self.frame_interval = 1.0 / fps if realtime and fps > 0 else 0.0
+
+        self._buffer = None
+        self._next_at = None
+        self._stop_event = threading.Event()
+
+        self.grabbed_frames = 0
+        self.dropped_frames = 0  # всегда 0: кадры не отбрасываются
+        self.finished = False  # файл прочитан до конца
+
+    def start(self):
+        self._stop_event.clear()
+        self._next_at = None
+
+    def stop(self, timeout=1.0):
+        self._stop_event.set()
+
+    def read(self, timeout=None):
+        """
+        Следующий кадр файла.
+
+        Возвращенный массив остается валидным до следующего вызова read().
+        None - время кадра не наступило за timeout, файл закончился или чтение остановлено.
+        """
+        if self.finished or self._stop_event.is_set():
+            self._stop_event.wait(timeout)
+            return None
+
+        if self._next_at is not None:
+            wait = self._next_at - time.monotonic()
+            if timeout is not None and wait > timeout:
+                self._stop_event.wait(timeout)
+                return None
+            if wait > 0 and self._stop_event.wait(wait):
+                return None
+
+        with self.latency.span("capture"):
+            ret, frame = self.cap.read(self._buffer)
+        if not ret:
+            self.finished = True
+            return None
+        self._buffer = frame
+        self._next_at = time.monotonic() + self.frame_interval
+        self.grabbed_frames += 1
+        return frame
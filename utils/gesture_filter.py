@@ -0,0 +1,111 @@
+from collections import Counter, deque
+
+import numpy as np
+
+# события фильтра жестов
+GESTURE_ONSET = 'onset'      # жест стал устойчивым
+GESTURE_HOLD = 'hold'        # устойчивый жест удерживается (каждый кадр)
+GESTURE_RELEASE = 'release'  # жест отпущен
+
+_NO_EVENTS = ()
+
+
+class GestureFilter(object):
+    """
+    Потоковый временной фильтр результатов классификации по кадрам.
+
+    Жест становится активным (событие onset), когда он набрал не меньше
+    min_votes голосов среди последних window кадров и его сглаженная (EMA)
+    вероятность не ниже enter_threshold. Активный жест отпускается (release),
+    когда сглаженная вероятность падает ниже exit_threshold; разница порогов
+    дает гистерезис, и одиночный ошибочный кадр не переключает жест.
+
+    Кадр без руки передается как class_id=None: вероятности затухают к нулю.
+    """
+
+    def __init__(self, window=5, min_votes=3, ema_alpha=0.5,
+                 enter_threshold=0.6, exit_threshold=0.4):
+        if exit_threshold > enter_threshold:
+            raise ValueError("exit_threshold не может быть больше enter_threshold")
+        self.window = window
+        self.min_votes = min_votes
+        self.ema_alpha = ema_alpha
+        self.enter_threshold = enter_threshold
+        self.exit_threshold = exit_threshold
+        self.reset()
+
+    def reset(self):
+        self.active = None        # индекс активного жеста
+        self.active_frames = 0    # сколько кадров жест активен
+        self._votes = deque(maxlen=self.window)
+        self._counts = Counter()
+        self._ema = None
+
+    def update(self, class_id, probabilities=None):
+        """
+        Добавление результата очередного кадра.
+
+        Args:
+            class_id: индекс класса или None, если рука не найдена
+            probabilities: вероятности классов (если None - используется one-hot по class_id)
+
+        Returns:
+            tuple: события кадра - пары (событие, индекс жеста); пустой кортеж, если событий нет
+        """
+        self._vote(class_id)
+        self._smooth(class_id, probabilities)
+
+        events = _NO_EVENTS
+        if self.active is not None:
+            if self._ema[self.active] < self.exit_threshold:
+                events = ((GESTURE_RELEASE, self.active),)
+                self.active = None
+                self.active_frames = 0
+            else:
+                self.active_frames += 1
+                return ((GESTURE_HOLD, self.active),)
+
+        candidate = self._leader()
+        if candidate is not None and self._ema[candidate] >= self.enter_threshold:
+            self.active = candidate
+            self.active_frames = 1
+            events += ((GESTURE_ONSET, candidate),)
+        return events
+
+    def probabilities(self):
+        """Сглаженные вероятности классов (None до первого кадра с рукой)."""
+        return self._ema
+
+    def _vote(self, class_id):
+        if len(self._votes) == self._votes.maxlen:
+            self._counts[self._votes[0]] -= 1
+        self._votes.append(class_id)
+        self._counts[class_id] += 1
+
+    def _smooth(self, class_id, probabilities):
+        if probabilities is None and class_id is not None:
+            size = class_id + 1 if self._ema is None else max(len(self._ema), class_id + 1)
+            probabilities = np.zeros(size, dtype=np.float32)
+            probabilities[class_id] = 1.0
+
+        if self._ema is None:
+            if probabilities is None:
+                return
+            self._ema = np.zeros(len(probabilities), dtype=np.float32)
+        elif probabilities is not None and len(probabilities) > len(self._ema):
+            self._ema = np.pad(self._ema, (0, len(probabilities) - len(self._ema)))
+
+        # затухание всех классов и добавление вероятностей текущего кадра
+        self._ema *= 1.0 - self.ema_alpha
+        if probabilities is not None:
+            self._ema[:len(probabilities)] += self.ema_alpha * np.asarray(probabilities, dtype=np.float32)
+
+    def _leader(self):
+        """Жест с наибольшим числом голосов в окне, если их не меньше min_votes."""
+        if self._ema is None:
+            return None
+        best, votes = None, 0
+        for class_id, count in self._counts.items():
+            if class_id is not None and count > votes:
+                best, votes = class_id, count
+        return best if votes >= self.min_votes else None
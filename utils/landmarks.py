@@ -0,0 +1,75 @@
+import numpy as np
+
+NUM_LANDMARKS = 21
+
+
+def landmarks_to_array(hand_landmarks):
+    """
+    Преобразование hand_landmarks MediaPipe в массив (21, 2) float32
+    с нормализованными координатами (0.0-1.0).
+    """
+    landmarks = hand_landmarks.landmark
+    coords = np.fromiter(
+        (value for landmark in landmarks for value in (landmark.x, landmark.y)),
+        dtype=np.float32, count=2 * len(landmarks))
+    return coords.reshape(-1, 2)
+
+
+def calc_landmark_points(landmark_array, image_width, image_height):
+    """Пиксельные координаты ключевых точек, массив (21, 2) int32 (или (N, 21, 2) для N рук)."""
+    # умножение в float64, как int(landmark.x * image_width) в исходной реализации
+    points = (landmark_array * np.array((image_width, image_height), dtype=np.float64)).astype(np.int32)
+    np.minimum(points, (image_width - 1, image_height - 1), out=points)
+    return points
+
+
+def calc_bounding_rect(landmark_points):
+    """Ограничивающий прямоугольник [x1, y1, x2, y2] (как cv2.boundingRect)."""
+    x1, y1 = landmark_points.min(axis=0)
+    x2, y2 = landmark_points.max(axis=0)
+    return [int(x1), int(y1), int(x2) + 1, int(y2) + 1]
+
+
+def pre_process_landmark(landmark_points):
+    """
+    Вектор признаков для классификатора: координаты относительно запястья,
+    развернутые в (42,) float32 и нормализованные на максимальный модуль.
+    """
+    relative = (landmark_points - landmark_points[0]).astype(np.float32).ravel()
+    max_value = np.abs(relative).max()
+    if max_value > 0:
+        relative /= max_value
+    return relative
+
+
+def pre_process_landmarks(landmark_points):
+    """
+    Векторы признаков для нескольких рук сразу: массив точек (N, 21, 2) -> (N, 42) float32.
+    Каждая рука нормализуется так же, как в pre_process_landmark.
+    """
+    relative = (landmark_points - landmark_points[:, :1]).astype(np.float32).reshape(len(landmark_points), -1)
+    max_values = np.abs(relative).max(axis=1, keepdims=True)
+    max_values[max_values == 0] = 1.0
+    relative /= max_values
+    return relative
+
+
+def calc_roi(brect, image_width, image_height, margin=0.3):
+    """
+    Квадратная область интереса [x1, y1, x2, y2] вокруг прямоугольника руки
+    с запасом margin (доля большей стороны) с каждой стороны, обрезанная по кадру.
+    """
+    x1, y1, x2, y2 = brect
+    side = max(x2 - x1, y2 - y1) * (1.0 + 2.0 * margin)
+    center_x, center_y = (x1 + x2) / 2.0, (y1 + y2) / 2.0
+    half = side / 2.0
+    return [max(0, int(center_x - half)), max(0, int(center_y - half)),
+            min(image_width, int(center_x + half) + 1), min(image_height, int(center_y + half) + 1)]
+
+
+def roi_to_image(landmark_array, roi, image_width, image_height):
+    """Перевод нормализованных координат из области интереса в координаты всего кадра."""
+    x1, y1, x2, y2 = roi
+    scale = np.array(((x2 - x1) / image_width, (y2 - y1) / image_height), dtype=np.float32)
+    offset = np.array((x1 / image_width, y1 / image_height), dtype=np.float32)
+    return landmark_array * scale + offset
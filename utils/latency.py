@@ -0,0 +1,115 @@
+import csv
+import json
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+
+class _NullSpan(object):
+    """Пустой замер: используется, когда профилирование выключено."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span(object):
+    def __init__(self, tracker, stage):
+        self._tracker = tracker
+        self._stage = stage
+        self._start = 0.0
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._tracker.record(self._stage, (time.perf_counter() - self._start) * 1000.0)
+        return False
+
+
+class LatencyTracker(object):
+    """
+    Замеры задержек по стадиям конвейера с перцентилями по скользящему окну.
+
+    Использование:
+        with tracker.span("hands.process"):
+            ...
+
+    Когда трекер выключен, span() возвращает общий пустой объект,
+    и замеры практически ничего не стоят.
+    """
+
+    PERCENTILES = (50, 95, 99)
+
+    def __init__(self, window=300, enabled=False):
+        self.window = window
+        self.enabled = enabled
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+
+    def span(self, stage):
+        """Контекстный менеджер замера стадии."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, stage)
+
+    def record(self, stage, milliseconds):
+        """Добавление замера (в миллисекундах)."""
+        if not self.enabled:
+            return
+        with self._lock:
+            samples = self._samples.get(stage)
+            if samples is None:
+                samples = self._samples[stage] = deque(maxlen=self.window)
+            samples.append(milliseconds)
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+
+    def summary(self):
+        """
+        Сводка по стадиям в порядке первого появления.
+
+        Returns:
+            dict: {стадия: {"count", "mean", "p50", "p95", "p99"}} (мс)
+        """
+        with self._lock:
+            snapshot = {stage: np.fromiter(samples, dtype=np.float64, count=len(samples))
+                        for stage, samples in self._samples.items()}
+
+        result = {}
+        for stage, values in snapshot.items():
+            if values.size == 0:
+                continue
+            percentiles = np.percentile(values, self.PERCENTILES)
+            stats = {"count": int(values.size), "mean": float(values.mean())}
+            for percentile, value in zip(self.PERCENTILES, percentiles):
+                stats[f"p{percentile}"] = float(value)
+            result[stage] = stats
+        return result
+
+    def dump_json(self, path):
+        """Сохранение сводки в JSON."""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.summary(), f, indent=4, ensure_ascii=False)
+
+    def dump_csv(self, path):
+        """Сохранение сводки в CSV."""
+        fields = ["stage", "count", "mean"] + [f"p{p}" for p in self.PERCENTILES]
+        with open(path, 'w', newline="", encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(fields)
+            for stage, stats in self.summary().items():
+                writer.writerow([stage] + [stats[field] for field in fields[1:]])
@@ -0,0 +1,98 @@
+import logging
+import queue
+import threading
+
+logger = logging.getLogger('Pipeline')
+
+
+class DropQueue(object):
+    """Ограниченная очередь, в которой при переполнении вытесняется самый старый элемент."""
+
+    def __init__(self, maxsize=1):
+        self._queue = queue.Queue(maxsize=maxsize)
+        self.dropped = 0  # количество вытесненных (устаревших) элементов
+
+    def put(self, item):
+        """Добавление элемента без блокировки (устаревшие элементы отбрасываются)."""
+        while True:
+            try:
+                self._queue.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    self._queue.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def get(self, timeout=None):
+        """Получение элемента. При истечении таймаута выбрасывает queue.Empty."""
+        return self._queue.get(timeout=timeout)
+
+    def clear(self):
+        """Очистка очереди."""
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                return
+
+
+class PipelineStage(threading.Thread):
+    """
+    Стадия конвейера в отдельном потоке.
+
+    Берет элемент из input_queue (или вызывает func() без аргументов, если
+    входной очереди нет), обрабатывает его и кладет результат в output_queue.
+    Результат None означает, что элемент отброшен.
+
+    Исключение в func записывается в журнал, а элемент отбрасывается; после
+    max_errors ошибок подряд стадия останавливается и вызывает on_error(name, exc).
+    """
+
+    def __init__(self, name, func, input_queue=None, output_queue=None, poll_timeout=0.1,
+                 on_error=None, max_errors=10):
+        super().__init__(name=name, daemon=True)
+        self.func = func
+        self.input_queue = input_queue
+        self.output_queue = output_queue
+        self.poll_timeout = poll_timeout
+        self.on_error = on_error
+        self.max_errors = max_errors
+        self.errors = 0  # всего ошибок в func
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        """Запрос остановки стадии."""
+        self._stop_event.set()
+
+    def stopped(self):
+        return self._stop_event.is_set()
+
+    def run(self):
+        consecutive_errors = 0
+        while not self._stop_event.is_set():
+            try:
+                if self.input_queue is not None:
+                    try:
+                        item = self.input_queue.get(timeout=self.poll_timeout)
+                    except queue.Empty:
+                        continue
+                    result = self.func(item)
+                else:
+                    result = self.func()
+            except Exception as e:
+                self.errors += 1
+                consecutive_errors += 1
+                logger.exception(f"Ошибка в стадии {self.name}: {e}")
+                if consecutive_errors >= self.max_errors:
+                    logger.error(f"Стадия {self.name} остановлена после {consecutive_errors} ошибок подряд")
+                    self._stop_event.set()
+                    if self.on_error is not None:
+                        self.on_error(self.name, e)
+                    return
+                continue
+            consecutive_errors = 0
+
+            if result is not None and self.output_queue is not None:
+                self.output_queue.put(result)
@@ -0,0 +1,36 @@
+import time
+
+
+class TokenBucket(object):
+    """
+    Ограничитель частоты "ведро токенов".
+
+    Ведро вмещает burst токенов и пополняется со скоростью rate токенов в секунду;
+    каждое разрешенное событие забирает один токен. burst=1 и rate=1/T дают
+    обычную задержку T секунд между событиями.
+    """
+
+    def __init__(self, rate, burst=1):
+        if rate <= 0 or burst < 1:
+            raise ValueError(f"Некорректные параметры ограничения: rate={rate}, burst={burst}")
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self._tokens = self.burst
+        self._last = time.monotonic()
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def available(self, now=None):
+        """Есть ли токен (без расходования)."""
+        self._refill(time.monotonic() if now is None else now)
+        return self._tokens >= 1.0
+
+    def consume(self, now=None):
+        """Забрать токен. Returns: bool - было ли событие разрешено."""
+        self._refill(time.monotonic() if now is None else now)
+        if self._tokens < 1.0:
+            return False
+        self._tokens -= 1.0
+        return True
@@ -0,0 +1,149 @@
+import csv
+import logging
+import threading
+
+import numpy as np
+
+logger = logging.getLogger('RecordingSession')
+
+
+class RecordingSession(object):
+    """
+    Сессия записи обучающих примеров (номер жеста + признаки ключевых точек).
+
+    Строки копятся в памяти и дописываются пакетами фоновым потоком в CSV-файл
+    (открывается один раз на всю сессию) или в набор данных с методом
+    append(labels, features) (например, KeypointDataset), поэтому запись из
+    потока распознавания не ждет диска. Кроме одиночных кадров (write)
+    поддерживается непрерывная запись: пока запись "удерживается"
+    (hold/release), сохраняется каждый N-й кадр, переданный в offer.
+    """
+
+    def __init__(self, target, every_nth=1, batch_size=256, flush_interval=1.0):
+        """
+        Args:
+            target: путь к CSV-файлу или набор данных с методом append(labels, features)
+            every_nth: при непрерывной записи сохраняется каждый N-й кадр
+            batch_size: число строк, при котором буфер сбрасывается, не дожидаясь таймера
+            flush_interval: максимальное время (с) нахождения строк в буфере
+        """
+        self.target = target
+        self.every_nth = max(1, int(every_nth))
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self.recorded = 0  # строк принято в сессии
+        self.written = 0   # строк записано в файл
+        self.error = None  # последняя ошибка записи
+
+        self._rows = []
+        self._condition = threading.Condition()
+        self._file = None
+        self._writer = None
+        self._thread = None
+        self._closing = False
+        self._write_lock = threading.Lock()
+
+        self._hold_label = None
+        self._offered = 0
+
+    def start(self):
+        """Открытие файла и запуск фоновой записи."""
+        if isinstance(self.target, str):
+            self._file = open(self.target, 'a', newline="")
+            self._writer = csv.writer(self._file)
+        self._closing = False
+        self._thread = threading.Thread(target=self._run, name="recording-writer", daemon=True)
+        self._thread.start()
+        return self
+
+    def write(self, label, features):
+        """Постановка одного примера в буфер записи (без обращения к диску)."""
+        row = (int(label), np.array(features, dtype=np.float32))
+        with self._condition:
+            self._rows.append(row)
+            self.recorded += 1
+            if len(self._rows) >= self.batch_size:
+                self._condition.notify()
+
+    @property
+    def holding(self):
+        return self._hold_label is not None
+
+    def hold(self, label):
+        """Начало непрерывной записи жеста label."""
+        # hold/release вызываются из GUI, offer - из потока распознавания
+        with self._condition:
+            self._offered = 0
+            self._hold_label = label
+
+    def release(self):
+        """Окончание непрерывной записи. Returns: int - кадров записано за удержание."""
+        with self._condition:
+            self._hold_label = None
+            recorded, self._offered = self._offered, 0
+        return (recorded + self.every_nth - 1) // self.every_nth
+
+    def offer(self, features):
+        """
+        Кадр при непрерывной записи: сохраняется каждый every_nth-й.
+
+        Returns: bool - был ли кадр записан.
+        """
+        with self._condition:
+            label = self._hold_label
+            if label is None:
+                return False
+            index = self._offered
+            self._offered += 1
+        if index % self.every_nth:
+            return False
+        self.write(label, features)
+        return True
+
+    def flush(self):
+        """Синхронная запись всех накопленных строк в файл."""
+        with self._condition:
+            rows, self._rows = self._rows, []
+        self._write_rows(rows)
+
+    def _write_rows(self, rows):
+        if not rows:
+            return
+        with self._write_lock:
+            try:
+                if self._writer is not None:
+                    self._writer.writerows([label, *features.tolist()] for label, features in rows)
+                    self._file.flush()
+                else:
+                    self.target.append([label for label, _ in rows], np.stack([features for _, features in rows]))
+                self.written += len(rows)
+            except Exception as e:
+                self.error = e
+                logger.error(f"Ошибка при записи в {self.target}: {e}")
+
+    def _run(self):
+        while True:
+            with self._condition:
+                if not self._closing and len(self._rows) < self.batch_size:
+                    self._condition.wait(self.flush_interval)
+                rows, self._rows = self._rows, []
+                closing = self._closing
+            self._write_rows(rows)
+            if closing:
+                return
+
+    def close(self):
+        """Запись оставшихся строк и закрытие файла."""
+        if self._thread is None:
+            return
+        with self._condition:
+            self._closing = True
+            self._condition.notify()
+        self._thread.join()
+        self._thread = None
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._writer = None
@@ -0,0 +1,41 @@
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+class SharedFrameRing(object):
+    """
+    Кольцо кадров одинакового размера в разделяемой памяти (multiprocessing.shared_memory).
+
+    Создающий процесс выделяет память (create=True) и отвечает за unlink();
+    другие процессы подключаются по имени и получают те же слоты без копирования.
+    Какой процесс владеет слотом в данный момент, решает вызывающий код
+    (например, передавая индексы свободных слотов через очереди).
+    """
+
+    def __init__(self, shape, dtype=np.uint8, slots=2, name=None, create=False):
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.slots = slots
+        frame_bytes = int(np.prod(self.shape)) * self.dtype.itemsize
+        self._shm = shared_memory.SharedMemory(name=name, create=create, size=frame_bytes * slots)
+        self._owner = create
+        self._frames = np.ndarray((slots,) + self.shape, dtype=self.dtype, buffer=self._shm.buf)
+
+    @property
+    def name(self):
+        return self._shm.name
+
+    def spec(self):
+        """Параметры для подключения из другого процесса: SharedFrameRing(**spec)."""
+        return {"shape": self.shape, "dtype": self.dtype.str, "slots": self.slots, "name": self.name}
+
+    def __getitem__(self, slot):
+        return self._frames[slot]
+
+    def close(self):
+        """Отключение от памяти; создатель также освобождает ее."""
+        self._frames = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
@@ -0,0 +1,39 @@
+import threading
+import time
+
+
+class StartupTimer(object):
+    """
+    Отметки этапов запуска приложения (мс от начала) для отчета о времени старта.
+
+    Отметки можно ставить из любых потоков, в том числе из фоновой загрузки.
+    """
+
+    def __init__(self, start=None):
+        """
+        Args:
+            start: момент начала отсчета по time.perf_counter() (по умолчанию - сейчас)
+        """
+        self.start = time.perf_counter() if start is None else start
+        self.marks = []
+        self._lock = threading.Lock()
+
+    def mark(self, stage):
+        """Отметка завершения этапа. Returns: float - мс от начала."""
+        elapsed_ms = (time.perf_counter() - self.start) * 1000.0
+        with self._lock:
+            self.marks.append((stage, elapsed_ms))
+        return elapsed_ms
+
+    def summary(self):
+        """Словарь {этап: мс от начала} в порядке отметок."""
+        with self._lock:
+            return dict(self.marks)
+
+    def report(self):
+        """Текстовый отчет: этапы по времени завершения."""
+        with self._lock:
+            marks = sorted(self.marks, key=lambda mark: mark[1])
+        lines = ["Время запуска (мс от старта):"]
+        lines.extend(f"  {stage:<24} {elapsed_ms:8.1f}" for stage, elapsed_ms in marks)
+        return "\n".join(lines)